@@ -1,7 +1,10 @@
 import tkinter as tk
 from tkinter import scrolledtext, ttk, messagebox
-from llama_cpp import Llama
-import pyttsx3
+from astroedge.autotune import tuned_llama
+from astroedge.voice import VoiceSystem
+from astroedge.prompt_cache import PromptStateCache, build_system_prompt
+from astroedge.intent_router import IntentRouter, default_handlers
+from astroedge.extras import StressRelief
 import threading
 import time
 import datetime
@@ -13,7 +16,7 @@ import os
 class CoreAI:
     def __init__(self, model_path):
         print("🚀 Loading TinyLlama model...")
-        self.llm = Llama(model_path=model_path, n_ctx=2048, n_threads=6)
+        self.llm = tuned_llama(model_path, n_ctx=2048)
         print("✅ TinyLlama loaded successfully.")
         self.base_prompt = (
             "You are AstroEdge AI, an expert astronaut assistant. "
@@ -23,26 +26,50 @@ class CoreAI:
         self.chat_history = []  
         self.mission_mode = "General Assistance"
         self.personality = "Neutral"
+        self.llm_lock = threading.Lock()
+        self.prompt_cache = PromptStateCache(self.llm, self.base_prompt)
+        self.router = IntentRouter(default_handlers(relief=StressRelief()))
+        self._restore_prompt_state()
 
     def set_mode(self, mode):
         self.mission_mode = mode
+        self._restore_prompt_state()
 
     def set_personality(self, personality):
         self.personality = personality
+        self._restore_prompt_state()
+
+    def _restore_prompt_state(self):
+        """Swap in the precomputed KV snapshot for the new system prompt (off the GUI thread)"""
+        mode, personality = self.mission_mode, self.personality
+
+        def restore():
+            with self.llm_lock:
+                if (mode, personality) == (self.mission_mode, self.personality):
+                    ms = self.prompt_cache.restore(mode, personality)
+                    print(f"🧊 Prompt state for {mode} / {personality} ready in {ms} ms")
+
+        threading.Thread(target=restore, daemon=True).start()
 
     def ask(self, user_query: str) -> str:
         """Send astronaut query to TinyLlama with context + mode"""
-        system_prompt = f"{self.base_prompt} Current mission mode: {self.mission_mode}. Personality: {self.personality}."
+        routed = self.router.route(user_query)
+        if routed:
+            return routed[1]  # canned answer, no inference needed
+        start = time.perf_counter()
+        system_prompt = build_system_prompt(self.base_prompt, self.mission_mode, self.personality)
         messages = [{"role": "system", "content": system_prompt}] + self.chat_history
         messages.append({"role": "user", "content": user_query})
 
-        response = self.llm.create_chat_completion(
-            messages=messages,
-            max_tokens=350,
-            temperature=0.45
-        )
+        with self.llm_lock:
+            response = self.llm.create_chat_completion(
+                messages=messages,
+                max_tokens=350,
+                temperature=0.45
+            )
 
         answer = response["choices"][0]["message"]["content"].strip()
+        self.router.record_llm(user_query, time.perf_counter() - start)
         self.chat_history.append({"role": "user", "content": user_query})
         self.chat_history.append({"role": "assistant", "content": answer})
         return answer
@@ -51,24 +78,6 @@ class CoreAI:
         """Clear chat history for a fresh start"""
         self.chat_history.clear()
 
-#######################################################
-# 🔹 VOICE SYSTEM
-#######################################################
-class VoiceSystem:
-    def __init__(self):
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 160)
-        self.voice_enabled = True
-
-    def speak(self, text):
-        if self.voice_enabled:
-            self.engine.say(text)
-            self.engine.runAndWait()
-
-    def toggle(self):
-        self.voice_enabled = not self.voice_enabled
-        return self.voice_enabled
-
 #######################################################
 # 🔹 GUI APP – FUTURISTIC EDITION
 #######################################################
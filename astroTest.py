@@ -1,29 +1,20 @@
 import tkinter as tk
 from tkinter import scrolledtext, ttk, messagebox
-from llama_cpp import Llama
-import pyttsx3, threading, time, datetime, json, csv, os, random, psutil
+from astroedge.autotune import tuned_llama
+from astroedge.vision import VisionModule
+from astroedge.voice import VoiceSystem
+import threading, time, datetime, json, csv, os, psutil
 import sounddevice as sd
 import numpy as np
 import whisper
 
-#######################################################
-# 🔹 YOLOv8 Vision Stub (Offline Simulation)
-#######################################################
-class VisionModule:
-    """Simulated YOLOv8 object detection for demo purposes."""
-    def detect(self):
-        objects = ["toolbox", "loose wire", "oxygen valve", "control panel"]
-        detection = random.choice(objects)
-        confidence = round(random.uniform(0.75, 0.99), 2)
-        return {"object": detection, "confidence": confidence}
-
 #######################################################
 # 🔹 Core AI Engine – TinyLlama w/ Metrics
 #######################################################
 class CoreAI:
     def __init__(self, model_path):
         print("🚀 Loading TinyLlama model...")
-        self.llm = Llama(model_path=model_path, n_ctx=2048, n_threads=6)  # FULLY OFFLINE
+        self.llm = tuned_llama(model_path, n_ctx=2048)  # FULLY OFFLINE
         print("✅ TinyLlama loaded successfully.")
         self.base_prompt = "You are AstroEdge AI, a futuristic astronaut mission assistant."
         self.chat_history = []
@@ -75,24 +66,6 @@ class CoreAI:
             json.dump(self.metrics_log, f, indent=4)
         print(f"✅ JSON log saved to {filename}")
 
-#######################################################
-# 🔹 Voice Output System
-#######################################################
-class VoiceSystem:
-    def __init__(self):
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 160)
-        self.voice_enabled = True
-
-    def speak(self, text):
-        if self.voice_enabled:
-            self.engine.say(text)
-            self.engine.runAndWait()
-
-    def toggle(self):
-        self.voice_enabled = not self.voice_enabled
-        return self.voice_enabled
-
 #######################################################
 # 🔹 Whisper Voice Input (Offline)
 #######################################################
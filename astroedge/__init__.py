@@ -0,0 +1,65 @@
+"""
+ASTROEDGE AI
+------------
+Offline astronaut assistant: TinyLlama core, voice, vision, telemetry, reports and tooling.
+
+Submodules load on first attribute access, so `import astroedge` stays cheap (< 50 ms):
+
+    import astroedge
+    ai = astroedge.CoreAI("models/tinyllama.Q4_K_M.gguf")   # imports astroedge.core now
+"""
+
+import importlib
+
+__version__ = "0.1.0"
+
+# public name -> submodule that defines it
+_EXPORTS = {
+    "CoreAI": "core",
+    "VoiceSystem": "voice",
+    "VoiceInput": "voice",
+    "VisionModule": "vision",
+    "AstroEdgeApp": "app",
+    "AssistantRuntime": "runtime",
+    "SystemHealth": "extras",
+    "MissionReport": "extras",
+    "StressRelief": "extras",
+    "IntentRouter": "intent_router",
+    "FakeLlama": "fake_llama",
+    "MetricsStore": "metrics_query",
+    "ChartService": "chart_service",
+    "TierManager": "model_ladder",
+    "tuned_llama": "autotune",
+    "run_batch": "batch_cli",
+    "SensorHub": "sensors",
+    "ContextInjector": "context_injector",
+    "Tracer": "tracing",
+    "tracer": "tracing",
+    "SamplingProfiler": "profiler",
+    "MemorySentinel": "memory_sentinel",
+    "LengthModel": "generation_control",
+    "EndDetector": "generation_control",
+}
+_SUBMODULES = {
+    "app", "autotune", "batch_cli", "bench_suite", "chart_service", "chat_view", "context_injector", "core", "extras",
+    "fake_llama", "generation_control", "hotword_listener", "import_budget", "intent_router", "live_charts", "llm_state",
+    "memory_sentinel", "metrics_query", "mission_report", "model_ladder", "profiler", "prompt_cache", "runtime", "sensors", "session_store",
+    "speculative", "sweep_runner", "tracing", "tts_cache", "ui_bus", "vision", "voice",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # cache: later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
@@ -0,0 +1,387 @@
+"""
+ASTROEDGE NEXTGEN MISSION CONSOLE
+---------------------------------
+✅ Tkinter GUI client of the AssistantRuntime (LLM, voice, vision, telemetry)
+✅ Chat view, live telemetry charts, mission reports, stress relief, hotword + voice input
+✅ Each interaction is traced end to end (hotword → STT → LLM → TTS → render); "Latency Traces" opens the waterfall
+✅ Sampling profiler toggled from the GUI or SIGUSR1 / Ctrl+Break – collapsed stacks in logs/profiles/
+✅ Memory sentinel: container sizes, tracemalloc growth sites and RSS slope alerts in logs/memory/
+
+    python -m astroedge.app path/to/tinyllama.gguf --models-dir path/to/models
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+import datetime, os, random, argparse, webbrowser
+from functools import partial
+from concurrent.futures import CancelledError
+from .core import CoreAI
+from .voice import VoiceSystem, VoiceInput, GREETING
+from .vision import VisionModule
+from .extras import SystemHealth, MissionReport, StressRelief
+from .hotword_listener import HotwordListener
+from .live_charts import LiveTelemetryPanel
+from .intent_router import IntentRouter, default_handlers
+from .chat_view import ChatView, MessageHandle
+from .ui_bus import UIBus
+from .runtime import AssistantRuntime
+from .sensors import SensorHub
+from .tracing import tracer
+from .profiler import SamplingProfiler
+from .memory_sentinel import MemorySentinel
+
+HOTWORD_MODEL_PATH = r"D:\astro_edge_ai\astro_edge_ai\models\vosk-model-small-en-us-0.15"
+
+
+#######################################################
+# 🔹 GUI APP – NextGen
+#######################################################
+class AstroEdgeApp:
+    def __init__(self, model_path, models_dir=None, hotword_model_path=HOTWORD_MODEL_PATH):
+        self.ai = CoreAI(model_path, models_dir)
+        self.voice = VoiceSystem(idle=lambda: not self.ai.llm_lock.locked())
+        self.vision = VisionModule()
+        self.voice_input = VoiceInput()
+        self.log_count = 0
+        self.health = SystemHealth()
+        self.reporter = MissionReport()
+        self.relief = StressRelief()
+        self.ai.router = IntentRouter(default_handlers(self.relief, self.health, self.vision))
+        # 1 kHz IMU + biometric streams; CoreAI only hears about them when something changed
+        self.sensors = SensorHub.simulated().start()
+        self.ai.context.add_source(self.sensors.snapshot)
+        # Phrases that repeat verbatim are spoken from the TTS audio cache
+        self.fixed_phrases = {GREETING, *self.relief.jokes, *self.relief.quotes, *self.relief.exercises}
+        self.voice.prewarm(sorted(self.fixed_phrases))
+        # Async core: LLM, STT, vision and telemetry run as services – this GUI is one client of it
+        self.runtime = AssistantRuntime(self.ai, voice=self.voice, stt=self.voice_input,
+                                        vision=self.vision, health=self.health).start()
+        # 🔹 Offline hotword listener – started once the bus and the chat view exist (end of __init__)
+        self.hotword_listener = HotwordListener(
+            hotword="hello",
+            callback=self.hotword_callback,
+            model_path=hotword_model_path
+        )
+
+        os.makedirs("logs", exist_ok=True)
+
+        # 🖥 Window
+        self.root = tk.Tk()
+        # Worker threads (LLM, voice input, hotword) post UI changes here; only the Tk thread applies them
+        self.bus = UIBus(self.root)
+        self.root.title("🚀 AstroEdge AI – NextGen Mission Console")
+        self.root.geometry("1150x720")
+        self.root.configure(bg="#0A0A14")
+
+        # 🚀 HEADER
+        header = tk.Label(self.root, text="🚀 ASTROEDGE NEXTGEN MISSION CONTROL",
+                          font=("Orbitron", 24, "bold"), fg="cyan", bg="#111122", pady=15)
+        header.grid(row=0, column=0, columnspan=3, sticky="ew")
+
+        # 📊 TELEMETRY PANEL
+        self.telemetry = tk.Label(self.root, text="🛰 Mode: General | Logs: 0 | CPU: 0% | RAM: 0 MB",
+                                  font=("Consolas", 10), fg="white", bg="#111122")
+        self.telemetry.grid(row=1, column=0, columnspan=3, sticky="ew")
+
+        # 📂 LEFT MISSION BAR
+        side_panel = tk.Frame(self.root, bg="#161622", width=220)
+        side_panel.grid(row=2, column=0, rowspan=4, sticky="ns")
+        tk.Label(side_panel, text="MISSION BAR", font=("Consolas", 12, "bold"), fg="white", bg="#161622").pack(pady=5)
+        tk.Button(side_panel, text="🎙 Voice Input", command=self.voice_input_command,
+          bg="purple", fg="white", font=("Consolas", 10, "bold")).pack(pady=5, fill="x")
+
+
+        tk.Button(side_panel, text="🛠 Detect Objects", command=self.run_vision,
+                  bg="orange", fg="black", font=("Consolas", 10, "bold")).pack(pady=5, fill="x")
+        tk.Button(side_panel, text="🎙 Voice Input", command=self.voice_input_command,
+          bg="purple", fg="white", font=("Consolas", 10, "bold")).pack(pady=5, fill="x")
+        tk.Button(side_panel, text="🔄 Reset AI", command=self.reset_ai,
+                  bg="darkred", fg="white", font=("Consolas", 10, "bold")).pack(pady=5, fill="x")
+        tk.Button(side_panel, text="💾 Save All Logs", command=self.save_all_logs,
+                  bg="gray", fg="white", font=("Consolas", 10, "bold")).pack(pady=5, fill="x")
+        tk.Button(side_panel, text="📊 System Health", command=self.show_health,
+          bg="teal", fg="white", font=("Consolas", 10, "bold")).pack(pady=5, fill="x")
+
+        tk.Button(side_panel, text="📄 Mission Report", command=self.save_report,
+                bg="navy", fg="white", font=("Consolas", 10, "bold")).pack(pady=5, fill="x")
+
+        tk.Button(side_panel, text="😂 Stress Relief", command=self.stress_relief,
+                bg="darkgreen", fg="white", font=("Consolas", 10, "bold")).pack(pady=5, fill="x")
+        tk.Button(side_panel, text="⏱ Latency Traces", command=self.show_traces,
+                  bg="#333344", fg="white", font=("Consolas", 10, "bold")).pack(pady=5, fill="x")
+
+
+        # 💬 CHAT DISPLAY
+        self.chat_display = ChatView(self.root, bg="#1C1C28", fg="white", font=("Consolas", 12), wrap="word")
+        self.chat_display.grid(row=2, column=1, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.bus.on("chat", lambda msg: self.chat_display.append(*msg))
+        self.bus.on("chat_replace", lambda msg: self.chat_display.replace(*msg))
+        self._append_chat(f"🤖 AstroEdge: {GREETING}\n\n", "lightgreen")
+        self.voice.speak(GREETING, cached=True)
+        if self.ai.chat_history:
+            self._append_chat(f"🧠 Previous session resumed ({len(self.ai.chat_history) // 2} turns in context).\n\n", "lightgreen")
+
+        # MODE SELECTOR
+        selectors_frame = tk.Frame(self.root, bg="#0A0A14")
+        selectors_frame.grid(row=3, column=1, columnspan=2, sticky="ew")
+        tk.Label(selectors_frame, text="Mode:", fg="white", bg="#0A0A14", font=("Consolas", 11)).pack(side=tk.LEFT, padx=5)
+        self.mode_var = tk.StringVar(value="General Assistance")
+        mode_dropdown = ttk.Combobox(selectors_frame, textvariable=self.mode_var,
+                                     values=["General Assistance", "Repairs", "Navigation", "Stress Management", "Mission Commander", "Mentor Mode"],
+                                     font=("Consolas", 11), width=20)
+        mode_dropdown.pack(side=tk.LEFT)
+        mode_dropdown.bind("<<ComboboxSelected>>", self.change_mode)
+
+        # 📈 LIVE TELEMETRY CHARTS
+        self.live_charts = LiveTelemetryPanel(self.root, self.ai)
+        self.live_charts.widget.grid(row=4, column=1, columnspan=2, padx=10, sticky="ew")
+
+        # INPUT FIELD
+        input_frame = tk.Frame(self.root, bg="#0A0A14")
+        input_frame.grid(row=5, column=1, columnspan=2, pady=10, sticky="ew")
+
+        self.entry = tk.Entry(input_frame, font=("Consolas", 12))
+        self.entry.pack(side=tk.LEFT, padx=10, pady=10, fill=tk.X, expand=True)
+        self.entry.bind("<Return>", self.send_query)
+        self.root.bind("<Escape>", lambda e: self.runtime.barge_in())  # stop answer + speech
+
+        # BUTTONS
+        tk.Button(input_frame, text="Send", command=self.send_query, bg="green", fg="white",
+                  font=("Consolas", 12, "bold")).pack(side=tk.LEFT, padx=5)
+        tk.Button(input_frame, text="🗑 Clear", command=self.clear_chat, bg="red", fg="white",
+                  font=("Consolas", 10, "bold")).pack(side=tk.LEFT, padx=5)
+
+        self.voice_btn = tk.Button(input_frame, text="🔊 Voice: ON", command=self.toggle_voice, bg="blue", fg="white",
+                                   font=("Consolas", 10, "bold"))
+        self.voice_btn.pack(side=tk.LEFT, padx=5)
+
+        # Sampling profiler: off until needed; the signal works even when the GUI is too sluggish to click
+        self.profiler = SamplingProfiler(labels={"MainThread": "tk", "astroedge-runtime": "runtime"})
+        signame = self.profiler.install_signal(lambda: self.bus.call(self.toggle_profiler))
+        self.profiler_btn = tk.Button(input_frame, text="🔥 Profiler: OFF", command=self.toggle_profiler,
+                                      bg="#333344", fg="white", font=("Consolas", 10, "bold"))
+        self.profiler_btn.pack(side=tk.LEFT, padx=5)
+        if signame:
+            print(f"🔥 Profiler toggle: {signame}")
+
+        # LAYOUT
+        self.root.grid_rowconfigure(2, weight=1)
+        self.root.grid_columnconfigure(1, weight=1)
+
+        # Telemetry comes from the runtime; the bus keeps only the newest sample per tick
+        self.bus.on("telemetry", self.update_telemetry)
+        self.runtime.on("telemetry", lambda stats: self.bus.post("telemetry", stats, key="telemetry"))
+        self.runtime.on("telemetry", lambda stats: self.ai.context.observe(cpu=stats["cpu"], ram=stats["rss_MB"]))
+        self.runtime.on("detection", lambda d: self.ai.context.observe(obj=d["object"]))
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Long-lived containers that grow with the session; the sentinel alerts on sustained RSS growth
+        self.memory = MemorySentinel(on_alert=lambda a: self._append_chat(
+            f"🚨 Memory growing {a['slope_MB_per_min']} MB/min (RSS {a['rss_MB']} MB) – see logs/memory/\n\n", "red"))
+        self.memory.track("metrics_log", lambda: self.ai.metrics_log)
+        self.memory.track("chat_history", lambda: self.ai.chat_history)
+        self.memory.track("health.history", lambda: self.health.history)
+        self.memory.track("chat_view.index", lambda: self.chat_display.store.offsets)
+        self.memory.track("trace_ring", tracer.spans)
+        self.memory.start()
+
+        # Last: hotword_callback needs the runtime, the bus and the widgets above
+        self.hotword_listener.start()
+
+    #######################################################
+    # 🌟 FUNCTIONS
+    #######################################################
+    def change_mode(self, event=None):
+        new_mode = self.mode_var.get()
+        self.ai.mission_mode = new_mode
+        self._append_chat(f"🛰 Mission mode changed to: {new_mode}\n\n", "yellow")
+
+    def send_query(self, event=None, trace=None):
+        query = self.entry.get().strip()
+        if not query:
+            return
+
+        self._append_chat(f"👨‍🚀 Astronaut: {query}\n", "cyan")
+        self.entry.delete(0, tk.END)
+
+        self._get_ai_response(query, trace or tracer.begin("interaction", trigger="text"))
+
+    def _get_ai_response(self, query, trace):
+        # Show Thinking... – the answer replaces this message, whatever gets appended in between
+        placeholder = self._append_chat("🤖 Thinking...\n", "gray")
+        # Generation runs on the runtime's LLM executor; the answer arrives on the runtime thread
+        self.runtime.ask(query, trace).add_done_callback(partial(self._show_answer, trace, placeholder))
+
+    def _show_answer(self, trace, placeholder, future):
+        try:
+            answer, elapsed, mem = future.result()
+        except CancelledError:
+            self.bus.post("chat_replace", (placeholder, "🤖 AstroEdge: ⏹ Answer cancelled.\n\n", "gray"))
+            tracer.finish(trace)
+            return
+        except Exception as e:
+            answer = f"❌ Error: {e}"
+            elapsed = mem = 0
+
+        # Replace "Thinking..." with the final answer; the span ends once the chat view has drawn it
+        render = tracer.start_span("ui.render", parent=trace)
+        self.bus.post("chat_replace", (placeholder, f"🤖 AstroEdge: {answer}\n⏱ {elapsed}s | 🧠 {mem} MB\n\n",
+                                       "lightgreen"))
+        self.bus.call(self.chat_display.after_flush, render.end)
+
+        # Play voice after displaying text
+        self.voice.speak(answer, cached=answer in self.fixed_phrases, trace=trace)
+        tracer.finish(trace)  # the trace closes when render and speech have ended
+
+        # Update log count
+        self.log_count += 1
+
+
+    def _append_chat(self, text, color):
+        """Safe from any thread; applied on the Tk tick. Returns the message handle for chat_replace."""
+        handle = MessageHandle()
+        self.bus.post("chat", (text, color, handle))
+        return handle
+
+    def clear_chat(self):
+        self.chat_display.clear()
+
+    def toggle_profiler(self):
+        path = self.profiler.toggle()
+        self.profiler_btn.config(text="🔥 Profiler: ON" if self.profiler.running else "🔥 Profiler: OFF")
+        if self.profiler.running:
+            self._append_chat("🔥 Sampling profiler on.\n\n", "yellow")
+        elif path:
+            top = ", ".join(f"{t} {share:.0%}" for t, share in list(self.profiler.thread_share().items())[:4])
+            self._append_chat(f"🔥 Profile saved to {path} (overhead {self.profiler.overhead_pct:.2f}%; {top})\n\n",
+                              "yellow")
+
+    def toggle_voice(self):
+        enabled = self.voice.toggle()
+        self.voice_btn.config(text="🔊 Voice: ON" if enabled else "🔇 Voice: OFF")
+
+    def run_vision(self):
+        def _done(future):
+            try:
+                detection = future.result()
+            except Exception as e:
+                self._append_chat(f"⚠️ Vision error: {e}\n\n", "red")
+                return
+            self._append_chat(f"👁 YOLOv8 detected: {detection['object']} (conf {detection['confidence']})\n\n", "orange")
+
+        self.runtime.detect().add_done_callback(_done)
+
+    def voice_input_command(self, trace=None):
+        trace = trace or tracer.begin("interaction", trigger="voice")
+
+        def _heard(future):
+            try:
+                query = future.result()
+            except Exception as e:
+                query = f"⚠️ Voice input stopped: {str(e) or 'timeout'}"
+
+            # Remove the "listening..." text and show result
+            if query.startswith("❌") or query.startswith("⚠️"):
+                self._append_chat(query + "\n\n", "red")
+                tracer.finish(trace)
+            else:
+                self._append_chat(f"👨‍🚀 Astronaut (via voice): {query}\n", "cyan")
+                self.bus.call(self._submit_voice_query, query, trace)  # entry widget belongs to the Tk thread
+
+        # Show "listening..." in chat
+        self._append_chat("🎙 Listening... please speak\n\n", "magenta")
+        self.runtime.listen(trace).add_done_callback(_heard)
+
+    def _submit_voice_query(self, query, trace=None):
+        self.entry.delete(0, tk.END)
+        self.entry.insert(0, query)
+        self.send_query(trace=trace)  # send to AI, same interaction trace
+
+
+    def reset_ai(self):
+        self.ai.reset_memory()
+        self._append_chat("🧠 AI memory reset.\n\n", "red")
+
+    def save_all_logs(self):
+        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.ai.save_metrics(f"logs/astroedge_metrics_{timestamp}.csv")
+        if self.ai.router:
+            s = self.ai.router.stats()
+            self._append_chat(f"🔀 Router: {s['fast_path']}/{s['total']} answered on the fast path, "
+                              f"~{s['saved_s']}s of LLM time saved\n\n", "yellow")
+        self._append_chat(f"🧠 Memory: {self.memory.summary()}\n\n", "yellow")
+        c = self.ai.context.stats()
+        self._append_chat(f"🛰 Context: {c['tokens']} prompt tokens over {c['turns']} turns "
+                          f"({c['tokens_per_turn']}/turn, {c['saved_tokens']} saved vs. every turn)\n\n", "yellow")
+        messagebox.showinfo("Logs Saved", "✅ Metrics and logs saved.")
+
+    def update_telemetry(self, stats):
+        self.live_charts.on_telemetry(stats)  # the runtime is the only SystemHealth poller
+        cpu, mem = stats["cpu"], stats["rss_MB"]
+        self.telemetry.config(text=f"🛰 Mode: {self.mode_var.get()} | Logs: {self.log_count} | CPU: {cpu}% | RAM: {mem} MB")
+
+    def run(self):
+        self.root.mainloop()
+
+    def close(self):
+        """Graceful shutdown: cancel generation/speech, stop services, then the window."""
+        self.hotword_listener.stop()
+        self.profiler.stop()  # writes the profile if one was running
+        self.memory.stop()
+        self.runtime.shutdown()
+        self.sensors.stop()
+        self.root.destroy()
+
+    def show_traces(self):
+        path = tracer.write_report()
+        self._append_chat(f"⏱ Latency waterfall written to {path}\n\n", "yellow")
+        webbrowser.open("file://" + os.path.abspath(path))
+
+    def show_health(self):
+        stats = self.health.get_stats()
+        self._append_chat(f"📊 Health → CPU: {stats['cpu']}% | RAM: {stats['memory']}% | Disk: {stats['disk']}%\n\n", "yellow")
+
+    def save_report(self):
+        def _done(path, error):  # report worker thread: hand the dialog to the Tk thread
+            if error:
+                self.bus.call(messagebox.showerror, "Mission Report", f"❌ Report failed: {error}")
+            else:
+                self.bus.call(messagebox.showinfo, "Mission Report", f"✅ Report saved: {path}")
+
+        if self.reporter.generate_async(self.ai.metrics_log, incremental=True, on_done=_done):
+            self._append_chat("📄 Generating mission report in background...\n\n", "yellow")
+        else:
+            self._append_chat("📄 Mission report already in progress.\n\n", "yellow")
+
+    def stress_relief(self):
+        # Pick random joke or quote
+        msg = random.choice([self.relief.random_joke(), self.relief.random_quote()])
+        
+        # 🔹 Show text immediately
+        self._append_chat(f"🧘 {msg}\n\n", "magenta")
+        
+        # 🔹 Speak AFTER text is shown (pre-rendered audio, no synthesis)
+        self.voice.speak(msg, cached=True)
+
+
+    def hotword_callback(self):
+        """Triggered when hotword is detected."""
+        self.runtime.barge_in()  # the astronaut is talking: stop the current answer and speech
+        self._append_chat("🎙 Hotword detected! Listening...\n\n", "blue")
+        self.voice_input_command(tracer.active)   # start voice input automatically, in the hotword's trace
+
+
+#######################################################
+# 🚀 RUN APP
+#######################################################
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AstroEdge NextGen mission console")
+    parser.add_argument("model", help="TinyLlama GGUF path")
+    parser.add_argument("--models-dir", help="optional GGUF quantization ladder (Q2_K … Q8_0)")
+    parser.add_argument("--hotword-model", default=HOTWORD_MODEL_PATH, help="Vosk model directory")
+    args = parser.parse_args(argv)
+    AstroEdgeApp(args.model, args.models_dir, args.hotword_model).run()
+
+
+if __name__ == "__main__":
+    main()
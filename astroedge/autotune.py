@@ -0,0 +1,208 @@
+"""
+ASTROEDGE LLAMA.CPP AUTO-TUNER
+------------------------------
+✅ Benchmarks prompt-eval and decode throughput on THIS machine
+✅ Searches n_threads, n_batch and mmap/mlock (coordinate descent, ~10 model loads)
+✅ Persists the best config per machine fingerprint (CPU, cores, RAM, model file)
+✅ tuned_llama() uses the stored config automatically on later starts
+✅ tune=False (model hot swaps): stored config or defaults, never tunes next to a live model under load –
+   untuned tiers are tuned offline / while idle with the command below
+
+    python -m astroedge.autotune path/to/tinyllama.gguf          # tune now (or reuse stored result)
+    python -m astroedge.autotune path/to/tinyllama.gguf --force  # re-tune
+    python -m astroedge.autotune models/                         # every GGUF in the ladder without a config
+Set ASTROEDGE_AUTOTUNE=0 to skip tuning on first start (falls back to defaults).
+"""
+
+import os, sys, json, time, glob, hashlib, platform, argparse
+import psutil
+
+TUNING_FILE = os.path.join(os.path.expanduser("~"), ".astroedge", "llama_tuning.json")
+DEFAULT_CONFIG = {"n_threads": 6, "n_batch": 512, "use_mmap": True, "use_mlock": False}
+BATCH_SIZES = (128, 256, 512)
+MEMORY_OPTIONS = (
+    {"use_mmap": True, "use_mlock": False},
+    {"use_mmap": True, "use_mlock": True},
+    {"use_mmap": False, "use_mlock": False},
+)
+# A typical turn: ~200 prompt tokens (system + history + query) and ~300 generated
+TURN_PROMPT_TOKENS = 200
+TURN_DECODE_TOKENS = 300
+BENCH_TEXT = ("You are AstroEdge AI, an astronaut assistant. Provide step-by-step guidance for repairs, "
+              "navigation, and stress management. How do I repair an oxygen leak in the airlock? ") * 12
+
+#######################################################
+# 🔹 Machine fingerprint
+#######################################################
+def _cpu_model():
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def machine_fingerprint(model_path):
+    info = {
+        "cpu": _cpu_model(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "physical_cores": psutil.cpu_count(logical=False) or os.cpu_count(),
+        "logical_cores": psutil.cpu_count(logical=True) or os.cpu_count(),
+        "ram_gb": round(psutil.virtual_memory().total / 2 ** 30),
+        "model": os.path.basename(model_path),
+        "model_size": os.path.getsize(model_path) if os.path.exists(model_path) else None,
+    }
+    key = hashlib.sha1(json.dumps(info, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return key, info
+
+#######################################################
+# 🔹 Persistence
+#######################################################
+def _load_all(path=TUNING_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def load_tuning(model_path, path=TUNING_FILE):
+    key, _ = machine_fingerprint(model_path)
+    entry = _load_all(path).get(key)
+    return entry["config"] if entry else None
+
+
+def save_tuning(model_path, config, results, path=TUNING_FILE):
+    key, info = machine_fingerprint(model_path)
+    data = _load_all(path)
+    data[key] = {"machine": info, "config": config, "results": results,
+                 "tuned_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+#######################################################
+# 🔹 Throughput measurement
+#######################################################
+def _llama_cls():
+    from llama_cpp import Llama
+    return Llama
+
+
+def bench_config(model_path, config, llama_cls=None, prompt_tokens=128, decode_tokens=32, n_ctx=2048):
+    """Load with `config`, time prompt eval and single-token decode. Returns tokens/sec figures."""
+    llama_cls = llama_cls or _llama_cls()
+    start = time.perf_counter()
+    llm = llama_cls(model_path=model_path, n_ctx=n_ctx, verbose=False, **config)
+    load_s = time.perf_counter() - start
+
+    tokens = llm.tokenize(BENCH_TEXT.encode("utf-8"))[:prompt_tokens]
+    llm.reset()
+    start = time.perf_counter()
+    llm.eval(tokens)
+    pp_s = time.perf_counter() - start
+
+    # Decode: one token per eval, as during generation (the token value does not matter)
+    start = time.perf_counter()
+    for tok in tokens[1:decode_tokens + 1]:
+        llm.eval([tok])
+    tg_s = time.perf_counter() - start
+    del llm
+
+    pp_tps = len(tokens) / pp_s if pp_s else float("inf")
+    tg_tps = decode_tokens / tg_s if tg_s else float("inf")
+    return {
+        **config,
+        "load_s": round(load_s, 3),
+        "prompt_tps": round(pp_tps, 2),
+        "decode_tps": round(tg_tps, 2),
+        "turn_s": round(TURN_PROMPT_TOKENS / pp_tps + TURN_DECODE_TOKENS / tg_tps, 3),
+    }
+
+
+def thread_candidates():
+    physical = psutil.cpu_count(logical=False) or os.cpu_count() or 1
+    logical = psutil.cpu_count(logical=True) or physical
+    return sorted({max(1, physical // 2), max(1, physical - 1), physical, logical})
+
+
+def autotune(model_path, llama_cls=None, save=True, **bench_kwargs):
+    """Coordinate descent: threads -> batch size -> mmap/mlock, scoring by estimated turn time."""
+    print(f"🔧 Auto-tuning llama.cpp for {os.path.basename(model_path)} on this machine...")
+    results, seen = [], {}
+
+    def run(config):
+        key = tuple(sorted(config.items()))
+        if key in seen:  # each stage re-includes the current best – measure it once
+            return seen[key]
+        try:
+            r = bench_config(model_path, config, llama_cls, **bench_kwargs)
+        except Exception as e:  # e.g. mlock not permitted
+            print(f"⚠️ {config}: {e}")
+            return None
+        results.append(r)
+        seen[key] = r
+        print(f"   threads={r['n_threads']:<3} batch={r['n_batch']:<4} mmap={r['use_mmap']!s:<5} "
+              f"mlock={r['use_mlock']!s:<5} | pp {r['prompt_tps']:>8} t/s | tg {r['decode_tps']:>7} t/s "
+              f"| turn ≈ {r['turn_s']}s")
+        return r
+
+    best = dict(DEFAULT_CONFIG)
+    for stage in (
+        [{"n_threads": t} for t in thread_candidates()],
+        [{"n_batch": b} for b in BATCH_SIZES],
+        list(MEMORY_OPTIONS),
+    ):
+        scored = [r for r in (run({**best, **change}) for change in stage) if r]
+        if scored:
+            winner = min(scored, key=lambda r: r["turn_s"])
+            best = {k: winner[k] for k in DEFAULT_CONFIG}
+
+    print(f"✅ Best llama.cpp config: {best}")
+    if save:
+        save_tuning(model_path, best, results)
+    return best
+
+
+def tuned_llama(model_path, n_ctx=2048, llama_cls=None, tune=True, **overrides):
+    """Construct Llama with the stored per-machine config, tuning first if there is none yet.
+
+    tune=False: never tune – use the defaults until the model is tuned offline (hot swaps: ~10 benchmark
+    loads beside a live model under memory pressure would slow the chat and store skewed results)."""
+    config = load_tuning(model_path)
+    if config is None:
+        config = dict(DEFAULT_CONFIG)
+        if not tune:
+            print(f"ℹ️ {os.path.basename(model_path)} is untuned – using defaults; "
+                  f"tune it while idle: python -m astroedge.autotune {model_path}")
+        elif os.environ.get("ASTROEDGE_AUTOTUNE", "1") != "0":
+            config = autotune(model_path, llama_cls)
+    llama_cls = llama_cls or _llama_cls()
+    return llama_cls(model_path=model_path, n_ctx=n_ctx, **{**config, **overrides})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune llama.cpp threads/batch for this machine")
+    parser.add_argument("model", help="GGUF file, or a directory to tune every GGUF in it")
+    parser.add_argument("--force", action="store_true", help="re-tune even if a config is stored")
+    parser.add_argument("--fake", action="store_true", help="dry run on the FakeLlama backend")
+    args = parser.parse_args()
+
+    cls = None
+    if args.fake:
+        from .fake_llama import FakeLlama
+        cls = FakeLlama
+    paths = sorted(glob.glob(os.path.join(args.model, "*.gguf"))) if os.path.isdir(args.model) else [args.model]
+    for model_path in paths:
+        stored = None if args.force else load_tuning(model_path)
+        if stored:
+            print(f"✅ Stored config for {os.path.basename(model_path)} on this machine: {stored}")
+        else:
+            autotune(model_path, cls, save=not args.fake)
+    sys.exit(0)
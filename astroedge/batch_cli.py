@@ -0,0 +1,250 @@
+"""
+ASTROEDGE HEADLESS BATCH QUERIES
+--------------------------------
+✅ Streams queries from a JSONL file (or stdin) – never loads the whole input into memory
+✅ Bounded concurrency: N worker processes, each with its own model and its share of the cores
+✅ Each result is appended to the output JSONL the moment it finishes
+✅ Resumable: a sidecar offset file + the output's line numbers let a rerun skip finished work
+✅ Same prompt, stop sequences, early stop and learned length budget as CoreAI.ask (fresh history per query)
+✅ A model that cannot load fails the run up front (non-zero exit) instead of crashing every worker
+✅ Output columns match metrics_query (query, latency_s, tokens, temperature, timestamp)
+
+    python -m astroedge.batch_cli prompts.jsonl results.jsonl --model models/tinyllama.Q4_K_M.gguf --workers 2
+    cat prompts.jsonl | python -m astroedge.batch_cli - results.jsonl --backend fake
+"""
+
+import os, sys, json, time, argparse, threading
+import multiprocessing as mp
+from datetime import datetime
+
+QUERY_FIELDS = ("query", "prompt", "question", "text", "body")
+ID_FIELDS = ("id", "request_id")
+
+#######################################################
+# 🔹 Input
+#######################################################
+def iter_queries(source, start_line=0, start_offset=0, field=None):
+    """Yield (line_no, byte_offset_after_line, record) from a JSONL path or '-' for stdin."""
+    stream = sys.stdin.buffer if source == "-" else open(source, "rb")
+    try:
+        line_no, offset = 0, 0
+        if start_offset and source != "-":
+            stream.seek(start_offset)  # jump straight past the committed prefix
+            line_no, offset = start_line, start_offset
+        for raw in stream:
+            offset += len(raw)
+            line_no += 1
+            if line_no <= start_line or not raw.strip():
+                continue
+            record = json.loads(raw)
+            if isinstance(record, str):
+                record = {"query": record}
+            keys = (field,) if field else QUERY_FIELDS
+            query = next((record[k] for k in keys if record.get(k)), None)
+            if query is None:
+                raise ValueError(f"line {line_no}: no query field (tried {', '.join(keys)})")
+            yield line_no, offset, {"id": next((record[k] for k in ID_FIELDS if k in record), None),
+                                    "query": query,
+                                    "temperature": record.get("temperature"),
+                                    "max_tokens": record.get("max_tokens")}
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+#######################################################
+# 🔹 Worker process
+#######################################################
+_worker = {}
+
+
+def probe_model(backend, model_path):
+    """Fail fast in the parent: reads the GGUF header + vocab only, so a bad path or file costs no weights."""
+    if backend == "fake":
+        return
+    try:
+        if not os.path.isfile(model_path):
+            raise FileNotFoundError(f"no such file: {model_path}")
+        from llama_cpp import Llama
+        Llama(model_path=model_path, vocab_only=True, verbose=False)
+    except Exception as e:
+        raise RuntimeError(f"cannot load model {model_path}: {type(e).__name__}: {e}") from e
+
+
+def _init_worker(backend, model_path, n_threads, token_latency):
+    # Never raise here: a failing Pool initializer is respawned forever and the run never finishes
+    from .generation_control import LengthModel
+    _worker.update(name=mp.current_process().name, llm=None, load_error=None,
+                   lengths=LengthModel())  # read-only here – workers never write the shared history
+    try:
+        if backend == "fake":
+            from .fake_llama import FakeLlama
+            _worker["llm"] = FakeLlama(n_threads=n_threads, token_latency_s=token_latency)
+        else:
+            from .autotune import tuned_llama
+            _worker["llm"] = tuned_llama(model_path, n_ctx=2048, n_threads=n_threads)
+    except Exception as e:
+        _worker["load_error"] = f"model load failed – {type(e).__name__}: {e}"
+
+
+def _answer(job):
+    """CoreAI.ask's prompt and generation path, with a fresh history per query."""
+    from .core import chat_messages, generate_answer
+    from .generation_control import classify_query
+    line_no, item, defaults = job
+    temperature = item["temperature"] if item["temperature"] is not None else defaults["temperature"]
+    kind = classify_query(item["query"])
+    max_tokens = item["max_tokens"] or defaults["max_tokens"] or _worker["lengths"].budget(defaults["mode"], kind)
+    row = {"line": line_no, "id": item["id"], "query": item["query"], "temperature": temperature,
+           "worker": _worker["name"], "kind": kind, "max_tokens": max_tokens}
+    start = time.perf_counter()
+    try:
+        if _worker["llm"] is None:
+            raise RuntimeError(_worker["load_error"])
+        result = generate_answer(_worker["llm"], chat_messages(item["query"]), defaults["mode"], kind, max_tokens,
+                                 temperature)
+        row.update(response=result["text"], tokens=result["tokens"], stop_reason=result["reason"], error=None)
+    except Exception as e:
+        row.update(response=None, tokens=0, stop_reason="error", error=f"{type(e).__name__}: {e}")
+    row["latency_s"] = round(time.perf_counter() - start, 4)
+    row["timestamp"] = datetime.now().isoformat()
+    return row
+
+#######################################################
+# 🔹 Resume bookkeeping
+#######################################################
+def _state_path(out_path):
+    return f"{out_path}.offset"
+
+
+def load_progress(out_path, source):
+    """(committed_line, committed_offset, finished line numbers past the commit)."""
+    state = {"line": 0, "offset": 0}
+    if os.path.exists(_state_path(out_path)):
+        with open(_state_path(out_path), encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("source") == os.path.abspath(source):
+            state = saved
+    done = set()
+    if os.path.exists(out_path):
+        with open(out_path, encoding="utf-8") as f:
+            for raw in f:
+                try:
+                    line_no = json.loads(raw)["line"]
+                except (ValueError, KeyError):
+                    continue  # torn last line from a crash
+                if line_no > state["line"]:
+                    done.add(line_no)
+    return state["line"], state["offset"], done
+
+
+class _Committer:
+    """Tracks out-of-order completions and advances the contiguous committed prefix."""
+
+    def __init__(self, out_path, source, line, offset):
+        self.path, self.source = _state_path(out_path), os.path.abspath(source)
+        self.line, self.offset = line, offset
+        self.pending = {}
+
+    def finished(self, line_no, offset):
+        self.pending[line_no] = offset
+        advanced = False
+        while self.line + 1 in self.pending:
+            self.line += 1
+            self.offset = self.pending.pop(self.line)
+            advanced = True
+        if advanced:
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"source": self.source, "line": self.line, "offset": self.offset}, f)
+            os.replace(tmp, self.path)
+
+#######################################################
+# 🔹 Batch run
+#######################################################
+def run_batch(source, out_path, backend="llama", model_path=None, workers=1, temperature=0.4,
+              max_tokens=None, field=None, token_latency=0.02, resume=True, mode="General Assistance"):
+    """Stream source through the model and append results to out_path. Returns a summary dict.
+
+    max_tokens=None uses CoreAI's learned per mode + query kind budget. Raises RuntimeError if the model
+    cannot be loaded, before any worker starts."""
+    probe_model(backend, model_path)
+    if not resume:
+        for path in (out_path, _state_path(out_path)):
+            if os.path.exists(path):
+                os.remove(path)
+    line, offset, done = load_progress(out_path, source)  # stdin cannot seek, so it skips by line number
+    committer = _Committer(out_path, source, line, offset)
+    n_threads = max(1, (os.cpu_count() or 1) // workers)
+    defaults = {"temperature": temperature, "max_tokens": max_tokens, "mode": mode}
+
+    in_flight = threading.BoundedSemaphore(workers * 2)  # bounded read-ahead keeps memory flat
+    lock = threading.Lock()
+    stats = {"done": 0, "errors": 0, "skipped": 0, "tokens": 0}
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+
+    with open(out_path, "a", encoding="utf-8") as out, \
+            mp.get_context("spawn").Pool(workers, _init_worker, (backend, model_path, n_threads, token_latency)) as pool:
+        offsets = {}
+
+        def on_result(row):
+            with lock:
+                out.write(json.dumps(row, ensure_ascii=False) + "\n")
+                out.flush()
+                committer.finished(row["line"], offsets.pop(row["line"]))
+                stats["done"] += 1
+                stats["errors"] += row["error"] is not None
+                stats["tokens"] += row["tokens"] or 0
+            in_flight.release()
+
+        def on_error(exc):
+            print(f"❌ Worker failed: {exc}")
+            in_flight.release()
+
+        for line_no, end_offset, item in iter_queries(source, line, offset, field):
+            if line_no in done:
+                with lock:
+                    committer.finished(line_no, end_offset)
+                stats["skipped"] += 1
+                continue
+            in_flight.acquire()
+            with lock:
+                offsets[line_no] = end_offset
+            pool.apply_async(_answer, ((line_no, item, defaults),), callback=on_result, error_callback=on_error)
+        pool.close()
+        pool.join()
+
+    wall = time.perf_counter() - start
+    stats.update(wall_s=round(wall, 2), queries_per_s=round(stats["done"] / wall, 2) if wall else 0.0,
+                 tokens_per_s=round(stats["tokens"] / wall, 2) if wall else 0.0)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch queries over JSONL")
+    parser.add_argument("input", help="JSONL file, or - for stdin")
+    parser.add_argument("output", help="results JSONL (appended, resumable)")
+    parser.add_argument("--backend", choices=["llama", "fake"], default="llama")
+    parser.add_argument("--model", help="GGUF path for --backend llama")
+    parser.add_argument("--workers", type=int, default=1, help="model instances running in parallel")
+    parser.add_argument("--temperature", type=float, default=0.4)
+    parser.add_argument("--max-tokens", type=int, help="default: the learned budget for the mode + query kind")
+    parser.add_argument("--mode", default="General Assistance", help="mission mode (stop sequences, budget)")
+    parser.add_argument("--field", help="JSON key holding the query (default: query/prompt/question/text/body)")
+    parser.add_argument("--fresh", action="store_true", help="ignore previous progress and start over")
+    parser.add_argument("--token-latency", type=float, default=0.02, help="seconds per token for --backend fake")
+    args = parser.parse_args(argv)
+    if args.backend == "llama" and not args.model:
+        parser.error("--model is required with --backend llama")
+
+    try:
+        stats = run_batch(args.input, args.output, args.backend, args.model, args.workers, args.temperature,
+                          args.max_tokens, args.field, args.token_latency, resume=not args.fresh, mode=args.mode)
+    except RuntimeError as e:
+        raise SystemExit(f"❌ {e}")
+    print(f"✅ {stats['done']} answered ({stats['errors']} errors, {stats['skipped']} already done) in "
+          f"{stats['wall_s']}s – {stats['queries_per_s']} queries/s, {stats['tokens_per_s']} tokens/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+ASTROEDGE BENCHMARK SUITE
+-------------------------
+✅ Warmup runs + repeated trials per query, timed with perf_counter_ns
+✅ Fixed seeds (sampling + query order) for reproducible numbers
+✅ Mean / median / p95 + 95% confidence interval per case
+✅ Machine-readable JSON output and regression check against a saved baseline
+✅ Runs on the real GGUF or on the deterministic FakeLlama backend (no model needed)
+
+    python -m astroedge.bench_suite --backend fake --out logs/bench.json
+    python -m astroedge.bench_suite --backend fake --baseline logs/bench_baseline.json
+    python -m astroedge.bench_suite --backend llama --model path/to/tinyllama.gguf --save-baseline logs/bench_baseline.json
+"""
+
+import os, sys, json, math, time, random, platform, argparse, statistics
+from datetime import datetime
+
+BENCHMARK_QUERIES = [
+    "How do I repair an oxygen leak?",
+    "Give me a checklist for spacecraft re-entry.",
+    "How to stabilize rotation in zero gravity?",
+    "What is the emergency protocol for fire onboard?",
+    "Explain how to realign the satellite dish.",
+    "How do I manage fuel efficiency in orbit?",
+    "Provide step-by-step instructions for EVA suit check.",
+    "What to do if the navigation system fails?",
+    "How to run diagnostics on a solar panel array?",
+    "What are the communication protocols during blackout?"
+]
+BASE_PROMPT = "You are AstroEdge AI, an astronaut assistant providing clear, accurate, step-by-step guidance for space missions."
+
+# Two-sided 95% Student-t critical values, df = 1..30
+_T95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+#######################################################
+# 🔹 Backends
+#######################################################
+def load_backend(name, model_path=None, seed=42, token_latency_s=0.02, **llama_kwargs):
+    if name == "fake":
+        from .fake_llama import FakeLlama
+        return FakeLlama(seed=seed, token_latency_s=token_latency_s, **llama_kwargs)
+    from llama_cpp import Llama
+    return Llama(model_path=model_path, seed=seed, verbose=False, **llama_kwargs)
+
+
+def chat_pipeline(llm, query, max_tokens=350, temperature=0.4, seed=42):
+    """Same message build + completion call as CoreAI.ask (fresh history per call)."""
+    messages = [{"role": "system", "content": BASE_PROMPT}, {"role": "user", "content": query}]
+    response = llm.create_chat_completion(messages=messages, max_tokens=max_tokens,
+                                          temperature=temperature, seed=seed)
+    return response["usage"]["completion_tokens"]
+
+#######################################################
+# 🔹 Statistics
+#######################################################
+def summarize(samples_ns, tokens=None):
+    ms = [s / 1e6 for s in samples_ns]
+    n = len(ms)
+    mean = statistics.fmean(ms)
+    stdev = statistics.stdev(ms) if n > 1 else 0.0
+    t = _T95[min(n - 1, len(_T95)) - 1] if 1 < n <= len(_T95) + 1 else 1.96
+    half = t * stdev / math.sqrt(n) if n > 1 else 0.0
+    ordered = sorted(ms)
+    summary = {
+        "n": n,
+        "mean_ms": round(mean, 3),
+        "median_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(ordered[min(n - 1, math.ceil(0.95 * n) - 1)], 3),
+        "min_ms": round(ordered[0], 3),
+        "stdev_ms": round(stdev, 3),
+        "ci95_ms": [round(mean - half, 3), round(mean + half, 3)],
+    }
+    if tokens:
+        summary["tokens"] = tokens
+        summary["tokens_per_sec"] = round(tokens / (mean / 1000), 2) if mean else None
+    return summary
+
+
+def measure(fn, warmup=2, trials=5):
+    """Run fn() warmup times untimed, then `trials` timed runs; returns (ns samples, last result)."""
+    result = None
+    for _ in range(warmup):
+        result = fn()
+    samples = []
+    for _ in range(trials):
+        start = time.perf_counter_ns()
+        result = fn()
+        samples.append(time.perf_counter_ns() - start)
+    return samples, result
+
+#######################################################
+# 🔹 Suite + regression check
+#######################################################
+def run_suite(llm, queries=BENCHMARK_QUERIES, warmup=2, trials=5, seed=42, max_tokens=350,
+              temperature=0.4, meta=None):
+    rng = random.Random(seed)
+    order = list(enumerate(queries))
+    rng.shuffle(order)  # fixed-seed order so position effects are the same every run
+    cases = {}
+    for idx, query in order:
+        samples, tokens = measure(lambda: chat_pipeline(llm, query, max_tokens, temperature, seed), warmup, trials)
+        cases[f"q{idx:02d}"] = {"query": query, **summarize(samples, tokens)}
+        print(f"🛰 q{idx:02d} {query[:40]:<40} | {cases[f'q{idx:02d}']['mean_ms']:>10.1f} ms "
+              f"± {(cases[f'q{idx:02d}']['ci95_ms'][1] - cases[f'q{idx:02d}']['mean_ms']):.1f}")
+
+    all_means = [c["mean_ms"] for c in cases.values()]
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "warmup": warmup, "trials": trials, "seed": seed,
+            "max_tokens": max_tokens, "temperature": temperature,
+            **(meta or {}),
+        },
+        "cases": cases,
+        "total_mean_ms": round(sum(all_means), 3),
+    }
+
+
+def compare(results, baseline, threshold=0.05):
+    """A case regresses when its mean is `threshold` slower AND the 95% CIs do not overlap."""
+    regressions, improvements = [], []
+    for name, case in results["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if not base:
+            continue
+        change = (case["mean_ms"] - base["mean_ms"]) / base["mean_ms"] if base["mean_ms"] else 0.0
+        row = {"case": name, "baseline_ms": base["mean_ms"], "current_ms": case["mean_ms"],
+               "change_pct": round(change * 100, 2)}
+        if change > threshold and case["ci95_ms"][0] > base["ci95_ms"][1]:
+            regressions.append(row)
+        elif change < -threshold and case["ci95_ms"][1] < base["ci95_ms"][0]:
+            improvements.append(row)
+    return {"threshold_pct": threshold * 100, "regressions": regressions, "improvements": improvements}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AstroEdge reproducible LLM benchmark")
+    parser.add_argument("--backend", choices=["fake", "llama"], default="fake")
+    parser.add_argument("--model", help="GGUF path for --backend llama")
+    parser.add_argument("--token-latency", type=float, default=0.02, help="fake backend seconds per token")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-tokens", type=int, default=350)
+    parser.add_argument("--out", default=f"logs/bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    parser.add_argument("--baseline", help="compare against this saved result JSON")
+    parser.add_argument("--save-baseline", help="also write the results here as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.05, help="relative slowdown that counts as regression")
+    args = parser.parse_args(argv)
+
+    if args.backend == "llama" and not args.model:
+        parser.error("--backend llama needs --model")
+    llm = load_backend(args.backend, args.model, args.seed, args.token_latency, n_ctx=2048)
+    results = run_suite(llm, warmup=args.warmup, trials=args.trials, seed=args.seed, max_tokens=args.max_tokens,
+                        meta={"backend": args.backend, "model": args.model or "fake",
+                              "token_latency_s": args.token_latency if args.backend == "fake" else None})
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            results["comparison"] = compare(results, json.load(f), args.threshold)
+        for row in results["comparison"]["regressions"]:
+            print(f"❌ Regression {row['case']}: {row['baseline_ms']} → {row['current_ms']} ms ({row['change_pct']:+}%)")
+        for row in results["comparison"]["improvements"]:
+            print(f"✅ Improvement {row['case']}: {row['baseline_ms']} → {row['current_ms']} ms ({row['change_pct']:+}%)")
+        exit_code = 1 if results["comparison"]["regressions"] else 0
+
+    for path in filter(None, [args.out, args.save_baseline]):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+        print(f"✅ Benchmark results saved to {path}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+ASTROEDGE CHART SERVICE
+-----------------------
+✅ Headless rendering only (Agg canvas, never plt.show)
+✅ Cache keyed by a hash of the chart spec + data slice: unchanged charts come straight from disk
+✅ Cache misses rendered in parallel worker processes
+"""
+
+import os, json, shutil, hashlib
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Bump when the look of the charts changes so stale cache files are not reused
+CHART_STYLE_VERSION = 1
+
+#######################################################
+# 🔹 Chart kinds
+#######################################################
+def _draw_panels(fig, spec):
+    """One subplot per series, stacked vertically (research graphs)."""
+    panels = spec["panels"]
+    for i, panel in enumerate(panels, start=1):
+        ax = fig.add_subplot(len(panels), 1, i)
+        ax.plot(panel["values"], label=panel["label"], color=panel.get("color"))
+        ax.legend()
+        ax.grid(True)
+
+
+def _draw_lines(fig, spec):
+    ax = fig.add_subplot(1, 1, 1)
+    for series in spec["series"]:
+        ax.plot(spec["x"], series["values"], label=series["label"],
+                color=series.get("color"), marker=series.get("marker"))
+    ax.legend()
+
+
+def _draw_barh(fig, spec):
+    ax = fig.add_subplot(1, 1, 1)
+    ax.barh(spec["labels"], spec["values"], color=spec.get("color"))
+
+
+def _draw_bar(fig, spec):
+    ax = fig.add_subplot(1, 1, 1)
+    ax.bar(spec["labels"], spec["values"], color=spec.get("color"))
+
+
+def _draw_scatter(fig, spec):
+    ax = fig.add_subplot(1, 1, 1)
+    ax.scatter(spec["labels"], spec["values"], color=spec.get("color"))
+
+
+CHART_KINDS = {
+    "panels": _draw_panels,
+    "lines": _draw_lines,
+    "barh": _draw_barh,
+    "bar": _draw_bar,
+    "scatter": _draw_scatter,
+}
+
+
+def render_chart(spec, path):
+    """Render one chart spec to `path` (PNG/SVG by extension). Runs in worker processes."""
+    fig = Figure(figsize=tuple(spec.get("figsize", (10, 5))))
+    FigureCanvasAgg(fig)
+    CHART_KINDS[spec["kind"]](fig, spec)
+    for ax in fig.axes:
+        if spec.get("title"):
+            ax.set_title(spec["title"])
+        if spec.get("xlabel"):
+            ax.set_xlabel(spec["xlabel"])
+        if spec.get("ylim"):
+            ax.set_ylim(*spec["ylim"])
+        if spec.get("rotate_xticks"):
+            for label in ax.get_xticklabels():
+                label.set_rotation(spec["rotate_xticks"])
+                label.set_horizontalalignment("right")
+    fig.tight_layout()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    fig.savefig(tmp, format=os.path.splitext(path)[1].lstrip(".") or "png")
+    os.replace(tmp, path)
+    return path
+
+#######################################################
+# 🔹 Chart service with content-addressed cache
+#######################################################
+def _plain(value):
+    """Make numpy arrays / scalars JSON-serializable for hashing."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+class ChartService:
+    def __init__(self, cache_dir="logs/chart_cache", max_workers=None, max_cached=500):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_cached = max_cached
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def cache_path(self, spec, fmt):
+        spec = _plain(spec)
+        if spec["kind"] not in CHART_KINDS:
+            raise ValueError(f"Unknown chart kind: {spec['kind']}")
+        payload = json.dumps({"v": CHART_STYLE_VERSION, "fmt": fmt, "spec": spec}, sort_keys=True)
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(payload.encode('utf-8')).hexdigest()}.{fmt}")
+
+    def render(self, spec, out_path):
+        return self.render_many([(spec, out_path)])[0]
+
+    def render_many(self, jobs):
+        """jobs: [(spec, out_path)]. Returns out paths; only cache misses are rendered."""
+        planned, misses = [], {}
+        for spec, out_path in jobs:
+            fmt = os.path.splitext(out_path)[1].lstrip(".") or "png"
+            cached = self.cache_path(spec, fmt)
+            planned.append((cached, out_path))
+            if os.path.exists(cached):
+                os.utime(cached)  # keep recently used charts out of the prune
+                self.hits += 1
+            elif cached not in misses:
+                misses[cached] = _plain(spec)
+                self.misses += 1
+
+        workers = min(len(misses), self.max_workers)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for future in [pool.submit(render_chart, spec, cached) for cached, spec in misses.items()]:
+                    future.result()
+        else:
+            for cached, spec in misses.items():
+                render_chart(spec, cached)
+
+        for cached, out_path in planned:
+            os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+            shutil.copyfile(cached, out_path)
+        if misses:
+            self._prune()
+        return [out_path for _, out_path in planned]
+
+    def _prune(self):
+        files = [os.path.join(self.cache_dir, f) for f in os.listdir(self.cache_dir) if not f.endswith(".tmp")]
+        if len(files) <= self.max_cached:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_cached]:
+            os.remove(path)
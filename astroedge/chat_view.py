@@ -0,0 +1,238 @@
+"""
+ASTROEDGE VIRTUALIZED CHAT VIEW
+-------------------------------
+✅ Every message is appended to a JSONL transcript (logs/chat/) – the persistent store
+✅ The Tk widget only ever holds a bounded window of recent messages
+✅ Scrolling to the top / bottom pages older / newer messages in from the transcript
+✅ append() only queues; the Tk thread flushes all queued messages once per frame,
+   with one see(END) and one trim – UI time per message stays flat over a long mission
+✅ Color tags are configured once per color instead of on every message
+✅ append() returns a handle; replace(handle, …) rewrites exactly that message (e.g. a "Thinking…"
+   placeholder), whatever was appended after it
+"""
+
+import os, json, datetime, threading
+from collections import deque
+import tkinter as tk
+from tkinter import scrolledtext
+
+
+class ChatStore:
+    """Append-only JSONL transcript with an in-memory offset index for random access."""
+
+    def __init__(self, path=None):
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.path = path or os.path.join("logs", "chat", f"chat_{stamp}.jsonl")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.offsets = []
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a+b")
+        self._file.seek(0)
+        for line in iter(self._file.readline, b""):  # reopening an existing transcript
+            self.offsets.append(self._file.tell() - len(line))
+
+    def __len__(self):
+        return len(self.offsets)
+
+    @staticmethod
+    def _record(text, color):
+        return json.dumps({"t": datetime.datetime.now().isoformat(), "text": text,
+                           "color": color}).encode("utf-8") + b"\n"
+
+    def append(self, text, color):
+        """Returns the message index."""
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            self.offsets.append(self._file.tell())
+            self._file.write(self._record(text, color))
+            self._file.flush()
+            return len(self.offsets) - 1
+
+    def replace(self, index, text, color):
+        """Rewrite message `index`; the (few) messages after it are written back behind it."""
+        with self._lock:
+            start = self.offsets[index]
+            self._file.seek(start)
+            self._file.readline()
+            tail = self._file.read()
+            self._file.truncate(start)
+            self._file.seek(start)
+            record = self._record(text, color)
+            self._file.write(record + tail)
+            self._file.flush()
+            if index + 1 < len(self.offsets):
+                shift = start + len(record) - self.offsets[index + 1]
+                for i in range(index + 1, len(self.offsets)):
+                    self.offsets[i] += shift
+
+    def read(self, start, stop):
+        """Messages [start, stop) as (text, color) tuples."""
+        with self._lock:
+            if start >= stop:
+                return []
+            self._file.seek(self.offsets[start])
+            rows = [json.loads(self._file.readline()) for _ in range(stop - start)]
+        return [(r["text"], r["color"]) for r in rows]
+
+    def close(self):
+        self._file.close()
+
+
+class MessageHandle:
+    """Returned by ChatView.append(); its index is filled in when the message reaches the store."""
+    __slots__ = ("index",)
+
+    def __init__(self):
+        self.index = None
+
+
+class ChatView:
+    def __init__(self, parent, store=None, max_messages=200, page_size=50, frame_ms=16, **widget_opts):
+        self.widget = scrolledtext.ScrolledText(parent, state=tk.DISABLED, **widget_opts)
+        self.widget.configure(yscrollcommand=self._on_yscroll)
+        self.store = store or ChatStore()
+        self.max_messages = max_messages
+        self.page_size = page_size
+        self.frame_ms = frame_ms
+        self.start = self.end = len(self.store)  # message window [start, end) shown in the widget
+        self.floor = self.start  # nothing before this is paged back in (session start / last clear)
+        self._ops = deque()  # thread-safe queue of pending edits
+        self._tags = set()
+        self._paging = False
+        self._flush()
+
+    def grid(self, **kwargs):
+        self.widget.grid(**kwargs)
+
+    # -- thread-safe API: only queues work for the next frame --------------------
+    def append(self, text, color, handle=None):
+        """Returns a MessageHandle for replace(); pass one in to hand it out before the message is queued."""
+        handle = handle or MessageHandle()
+        self._ops.append(("append", (text, handle), color))
+        return handle
+
+    def replace(self, handle, text, color):
+        self._ops.append(("replace", (text, handle), color))
+
+    def clear(self):
+        self._ops.append(("clear", None, None))
+
+    def after_flush(self, fn):
+        """Call fn() on the Tk thread once every edit queued before it is on screen."""
+        self._ops.append(("call", fn, None))
+
+    # -- Tk thread ---------------------------------------------------------------
+    def _flush(self):
+        if self._ops:
+            following = self.end == len(self.store) and self.widget.yview()[1] >= 0.999
+            self.widget.configure(state=tk.NORMAL)
+            callbacks = []
+            while self._ops:
+                op, arg, color = self._ops.popleft()
+                if op == "call":
+                    callbacks.append(arg)
+                elif op == "clear":
+                    self.widget.delete("1.0", tk.END)
+                    for i in range(self.start, self.end):
+                        self.widget.mark_unset(f"m{i}")
+                    self.start = self.end = self.floor = len(self.store)
+                elif op == "replace":
+                    text, handle = arg
+                    if handle.index is not None:
+                        self.store.replace(handle.index, text, color)
+                        if self.start <= handle.index < self.end:
+                            self._replace_shown(handle.index, text, color)
+                else:
+                    text, handle = arg
+                    at_tail = self.end == len(self.store)
+                    handle.index = self.store.append(text, color)
+                    if at_tail:
+                        self._insert_tail(text, color)
+            self._trim_top()
+            self.widget.configure(state=tk.DISABLED)
+            if following:
+                self.widget.see(tk.END)
+            if callbacks:
+                self.widget.update_idletasks()  # draw before reporting "shown"
+                for fn in callbacks:
+                    fn()
+        self.widget.after(self.frame_ms, self._flush)
+
+    def _tag(self, color):
+        if color not in self._tags:
+            self.widget.tag_config(color, foreground=color)
+            self._tags.add(color)
+        return color
+
+    def _insert_tail(self, text, color):
+        mark = f"m{self.end}"
+        self.widget.mark_set(mark, "end-1c")
+        self.widget.mark_gravity(mark, tk.LEFT)
+        self.widget.insert(tk.END, text, self._tag(color))
+        self.end += 1
+
+    def _replace_shown(self, index, text, color):
+        following = f"m{index + 1}" if index + 1 < self.end else None
+        self.widget.delete(f"m{index}", following or tk.END)
+        if following:
+            self.widget.mark_gravity(following, tk.RIGHT)  # keep it after the new text
+        self.widget.insert(f"m{index}", text, self._tag(color))
+        if following:
+            self.widget.mark_gravity(following, tk.LEFT)
+
+    def _insert_head(self, messages):
+        for text, color in reversed(messages):
+            if self.end > self.start:
+                self.widget.mark_gravity(f"m{self.start}", tk.RIGHT)  # keep it after the new text
+            self.widget.insert("1.0", text, self._tag(color))
+            if self.end > self.start:
+                self.widget.mark_gravity(f"m{self.start}", tk.LEFT)
+            self.start -= 1
+            self.widget.mark_set(f"m{self.start}", "1.0")
+            self.widget.mark_gravity(f"m{self.start}", tk.LEFT)
+
+    def _trim_top(self):
+        drop = self.end - self.start - self.max_messages
+        if drop > 0:
+            self.widget.delete("1.0", f"m{self.start + drop}")
+            for i in range(self.start, self.start + drop):
+                self.widget.mark_unset(f"m{i}")
+            self.start += drop
+
+    def _trim_bottom(self):
+        drop = self.end - self.start - self.max_messages
+        if drop > 0:
+            self.widget.delete(f"m{self.end - drop}", tk.END)
+            for i in range(self.end - drop, self.end):
+                self.widget.mark_unset(f"m{i}")
+            self.end -= drop
+
+    def _on_yscroll(self, first, last):
+        self.widget.vbar.set(first, last)
+        if self._paging:
+            return
+        if float(first) <= 0.0 and self.start > self.floor:
+            self._paging = True
+            self.widget.after_idle(self._page_older)
+        elif float(last) >= 1.0 and self.end < len(self.store):
+            self._paging = True
+            self.widget.after_idle(self._page_newer)
+
+    def _page_older(self):
+        older = self.store.read(max(self.floor, self.start - self.page_size), self.start)
+        anchor = self.widget.index("@0,0")
+        lines = sum(text.count("\n") for text, _ in older)
+        self.widget.configure(state=tk.NORMAL)
+        self._insert_head(older)
+        self._trim_bottom()
+        self.widget.configure(state=tk.DISABLED)
+        self.widget.yview(f"{anchor} + {lines} lines")  # keep the reading position
+        self._paging = False
+
+    def _page_newer(self):
+        self.widget.configure(state=tk.NORMAL)
+        for text, color in self.store.read(self.end, min(len(self.store), self.end + self.page_size)):
+            self._insert_tail(text, color)
+        self._trim_top()
+        self.widget.configure(state=tk.DISABLED)
+        self._paging = False
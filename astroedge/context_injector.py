@@ -0,0 +1,191 @@
+"""
+ASTROEDGE CONTEXT INJECTOR
+--------------------------
+✅ Sensor / vision / telemetry context reaches the LLM only when it changed meaningfully
+✅ Hysteresis per field: a dead-band (numeric delta) plus a hold time before a new value counts
+✅ Compact fixed-format line, e.g. "[ctx hr=104 emo=stressed]" – short ASCII keys, fixed order, no prose
+✅ Only changed fields are sent; the system prompt stays static so prompt/KV reuse keeps working
+✅ Added prompt tokens are counted per turn and logged
+✅ Demo: python -m astroedge.context_injector --turns 20   (delta injection vs. every-turn summary)
+"""
+
+import os, json, time, datetime, threading, argparse
+from collections import namedtuple
+
+# delta=None → categorical (any change counts); step rounds numeric values so the encoding stays stable
+Field = namedtuple("Field", "key delta step hold_s", defaults=(None, None, 0.0))
+
+DEFAULT_FIELDS = (
+    Field("imu", hold_s=2.0),                       # stable / moving / tumbling
+    Field("hr", delta=8, step=1, hold_s=5.0),       # bpm
+    Field("br", delta=4, step=1, hold_s=5.0),       # breaths/min
+    Field("eda", delta=1.0, step=0.5, hold_s=5.0),  # µS
+    Field("emo", hold_s=5.0),                       # calm / neutral / stressed
+    Field("obj"),                                   # last vision detection
+    Field("cpu", delta=25, step=5, hold_s=3.0),     # %
+    Field("ram", delta=250, step=50, hold_s=3.0),   # MB
+)
+
+
+def approx_tokens(text):
+    """Rough count for when no tokenizer is attached (~4 chars per token)."""
+    return (len(text) + 3) // 4
+
+
+class _State:
+    __slots__ = ("stable", "sent", "pending", "since")
+
+    def __init__(self):
+        self.stable = self.sent = self.pending = self.since = None
+
+
+class ContextInjector:
+    def __init__(self, fields=DEFAULT_FIELDS, tokenize=None,
+                 log_path=os.path.join("logs", "context_injection.jsonl"), count_tokens=None):
+        """tokenize: callable(text) -> token list (e.g. llm.tokenize on bytes); falls back to approx_tokens.
+        count_tokens: callable(text) -> int, used instead of tokenize when given."""
+        self.fields = {f.key: f for f in fields}
+        self.state = {f.key: _State() for f in fields}
+        self.count_tokens = count_tokens or ((lambda text: len(tokenize(text))) if tokenize else approx_tokens)
+        self.log_path = log_path
+        self.sources = []  # callables returning {key: value}, polled on every observe()/render()
+        self.turns = self.injected = self.tokens = self.always_tokens = 0
+        self.last_tokens = 0
+        self._rollback = None
+        self._lock = threading.Lock()
+
+    def add_source(self, fn):
+        self.sources.append(fn)
+
+    @staticmethod
+    def _significant(field, a, b):
+        if field.delta is None:
+            return a != b
+        return abs(a - b) >= field.delta
+
+    def observe(self, now=None, **values):
+        """Feed new readings (any subset of keys). Call often – hold times are measured between calls."""
+        now = time.monotonic() if now is None else now
+        for source in self.sources:
+            try:
+                values = {**source(), **values}
+            except Exception as e:
+                print(f"⚠️ Context source failed: {e}")
+        with self._lock:
+            for key, value in values.items():
+                field = self.fields.get(key)
+                if field is None or value is None:
+                    continue
+                if field.step:
+                    value = round(round(value / field.step) * field.step, 3)
+                st = self.state[key]
+                if st.stable is None:
+                    st.stable = value
+                elif not self._significant(field, value, st.stable):
+                    st.pending = st.since = None  # back inside the dead-band: cancel the candidate
+                else:
+                    if st.pending is None or (field.delta is None and value != st.pending):
+                        st.since = now
+                    st.pending = value
+                    if now - st.since >= field.hold_s:
+                        st.stable, st.pending, st.since = value, None, None
+
+    def _encode(self, items):
+        def fmt(v):
+            if isinstance(v, float):
+                return f"{v:g}"
+            return str(v).replace(" ", "_")
+        return "[ctx " + " ".join(f"{k}={fmt(v)}" for k, v in items) + "]" if items else ""
+
+    def render(self, now=None):
+        """Context line for this turn – only fields whose stable value differs from what the model last saw."""
+        self.observe(now)
+        with self._lock:
+            current = [(k, st.stable) for k, st in self.state.items() if st.stable is not None]
+            changed = [(k, v) for k, v in current if self.state[k].sent != v]
+            self._rollback = {k: self.state[k].sent for k, _ in changed}
+            for k, v in changed:
+                self.state[k].sent = v
+        text = self._encode(changed)
+        self.last_tokens = self.count_tokens(text) if text else 0
+        self.turns += 1
+        self.injected += bool(text)
+        self.tokens += self.last_tokens
+        self.always_tokens += self.count_tokens(self._encode(current)) if current else 0
+        self._log(changed)
+        return text
+
+    def rollback(self):
+        """The last rendered context never reached the model (cancelled turn) – send it again next time."""
+        with self._lock:
+            for k, v in (self._rollback or {}).items():
+                self.state[k].sent = v
+            self._rollback = None
+
+    def reset(self):
+        """Conversation memory was cleared – the next turn restates the full context."""
+        with self._lock:
+            for st in self.state.values():
+                st.sent = None
+
+    def stats(self):
+        return {"turns": self.turns, "injected": self.injected, "tokens": self.tokens,
+                "tokens_per_turn": round(self.tokens / self.turns, 2) if self.turns else 0.0,
+                "always_tokens": self.always_tokens, "saved_tokens": self.always_tokens - self.tokens}
+
+    def _log(self, changed):
+        if not self.log_path:
+            return
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "timestamp": datetime.datetime.now().isoformat(), "fields": dict(changed),
+                "tokens": self.last_tokens
+            }) + "\n")
+
+
+#######################################################
+# 🔹 Demo: delta injection vs. appending a summary every turn
+#######################################################
+def main(argv=None):
+    from .sensors import SensorHub
+
+    ap = argparse.ArgumentParser(description="Compare delta context injection with an every-turn summary.")
+    ap.add_argument("--turns", type=int, default=20)
+    ap.add_argument("--turn-s", type=float, default=1.0, help="seconds between turns")
+    ap.add_argument("--stress-at", type=float, default=0.5, help="fraction of turns after which biometrics spike")
+    ap.add_argument("--model", help="GGUF path: count real tokens with its vocabulary (else ~4 chars/token)")
+    args = ap.parse_args(argv)
+
+    tokenize = None
+    if args.model:
+        from llama_cpp import Llama
+        vocab = Llama(model_path=args.model, vocab_only=True, verbose=False)
+        tokenize = lambda text: vocab.tokenize(text.encode("utf-8"), add_bos=False)
+    count = (lambda text: len(tokenize(text))) if tokenize else approx_tokens
+
+    hub = SensorHub.simulated().start()
+    injector = ContextInjector(tokenize=tokenize, log_path=None)
+    injector.add_source(hub.snapshot)
+    time.sleep(4.0)  # vitals need a few seconds of signal
+    naive = 0
+    print(f"{'turn':>4}  {'naive':>5}  {'delta':>5}  context")
+    for turn in range(args.turns):
+        if turn == int(args.turns * args.stress_at):
+            hub.sources["bio"].stress = 1.0
+        for _ in range(4):
+            time.sleep(args.turn_s / 4)
+            injector.observe()
+        summary_tokens = count(f"(Sensors: {hub.summary()})")
+        naive += summary_tokens
+        line = injector.render()
+        print(f"{turn:>4}  {summary_tokens:>5}  {injector.last_tokens:>5}  {line}")
+    hub.stop()
+    s = injector.stats()
+    print(f"\nEvery-turn summary: {naive} tokens ({naive / s['turns']:.1f}/turn)")
+    print(f"Delta injection:    {s['tokens']} tokens ({s['tokens_per_turn']}/turn), "
+          f"context sent on {s['injected']}/{s['turns']} turns")
+
+
+if __name__ == "__main__":
+    main()
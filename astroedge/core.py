@@ -0,0 +1,185 @@
+"""
+ASTROEDGE CORE AI ENGINE
+------------------------
+✅ TinyLlama chat with history, per-turn metrics (latency, tokens, RSS, draft acceptance, route)
+✅ Quantization ladder, speculative decoding, session checkpoints, intent fast path
+✅ Cancellable generation (barge-in) via a threading.Event
+✅ Sensor/vision/telemetry context injected only when it changed (ContextInjector)
+✅ Oldest turns dropped so system prompt + history + the next turn always fit n_ctx (also on resume)
+"""
+
+import threading, time, datetime, csv, os
+import psutil
+from .autotune import tuned_llama
+from .model_ladder import TierManager, discover_tiers
+from .speculative import make_draft
+from .session_store import SessionCheckpointer
+from .context_injector import ContextInjector, approx_tokens
+from .generation_control import LengthModel, EndDetector, classify_query, stop_sequences, generate, DEFAULT_MAX_TOKENS
+from .tracing import tracer
+
+BASE_PROMPT = "You are AstroEdge AI, an astronaut assistant."
+MESSAGE_OVERHEAD = 8  # chat template tokens around each message ("<|user|>\n" … "</s>\n")
+
+
+def chat_messages(content, history=(), base_prompt=BASE_PROMPT):
+    """System prompt + earlier turns + this user turn – the layout every answer path sends."""
+    return [{"role": "system", "content": base_prompt}, *history, {"role": "user", "content": content}]
+
+
+def generate_answer(llm, messages, mode, kind, max_tokens, temperature, stopping=None):
+    """One answer with the mode's stop sequences and structural early stop (see generation_control)."""
+    return generate(llm, messages, max_tokens, EndDetector(mode, kind), temperature, stop_sequences(mode), stopping)
+
+
+#######################################################
+# 🔹 Core AI Engine – TinyLlama w/ metrics
+#######################################################
+class CoreAI:
+    def __init__(self, model_path, models_dir=None, latency_slo_s=10.0, speculative=None, draft_model_path=None):
+        print("🚀 Loading TinyLlama model...")
+        self.llm_lock = threading.Lock()
+        self.tiers = None
+        # Optional speculative decoding: "prompt_lookup" (chat history as draft) or "draft" (tiny GGUF)
+        self.draft = make_draft(speculative, draft_model_path)
+        load = lambda path, tune=True: tuned_llama(path, n_ctx=2048, tune=tune, draft_model=self.draft)
+        if models_dir and os.path.isdir(models_dir):
+            # Quantization ladder: pick the GGUF variant that fits RAM + latency SLO
+            self.tiers = TierManager(discover_tiers(models_dir), load, slo_s=latency_slo_s,
+                                     swap_loader=lambda path: load(path, tune=False))
+            self.llm = self.tiers.initial()
+        else:
+            self.llm = load(model_path)
+        print("✅ TinyLlama loaded successfully.")
+        self.base_prompt = BASE_PROMPT
+        self.chat_history = []
+        self.metrics_log = []
+        self.mission_mode = "General Assistance"
+        self.temperature = 0.45
+        self.router = None  # IntentRouter for canned answers, attached by the app
+        # Sources (sensors, telemetry, vision) are attached by the app; only changes reach the prompt
+        self.context = ContextInjector(count_tokens=self._count_tokens)
+        self.lengths = LengthModel()  # max_tokens per mode + query kind, learned from past answers
+        self.session = SessionCheckpointer()
+        self.resume_session()
+
+    def resume_session(self):
+        """Restore the KV cache + chat history written after the last turn of the previous run"""
+        start = time.perf_counter()
+        with self.llm_lock:
+            saved = self.session.resume(self.llm)
+        if saved:
+            self.chat_history = saved.get("chat_history", [])
+            self.mission_mode = saved.get("mission_mode", self.mission_mode)
+            with self.llm_lock:
+                self.fit_history(DEFAULT_MAX_TOKENS)  # a conversation that overflowed must not overflow again
+            print(f"🧠 Resumed {len(self.chat_history) // 2} turns in {time.perf_counter() - start:.3f}s")
+
+    def _count_tokens(self, text):
+        # ContextInjector.render runs outside llm_lock: during a downgrade self.llm is briefly None
+        llm = self.llm
+        return len(llm.tokenize(text.encode("utf-8"), add_bos=False)) if llm is not None else approx_tokens(text)
+
+    def fit_history(self, reserve):
+        """Drop the oldest turns until system prompt + history + `reserve` tokens (next user turn + answer)
+        fit n_ctx. Caller holds llm_lock. Returns the number of messages dropped."""
+        limit = self.llm.n_ctx() - reserve - self._count_tokens(self.base_prompt) - 2 * MESSAGE_OVERHEAD
+        sizes = [self._count_tokens(m["content"]) + MESSAGE_OVERHEAD for m in self.chat_history]
+        total, dropped = sum(sizes), 0
+        while dropped < len(sizes) and (total > limit or self.chat_history[dropped]["role"] != "user"):
+            total -= sizes[dropped]
+            dropped += 1
+        del self.chat_history[:dropped]
+        return dropped
+
+    def reset_memory(self):
+        self.chat_history.clear()
+        self.session.clear()
+        self.context.reset()
+
+    def ask(self, user_query: str, cancel=None) -> str:
+        """cancel: optional threading.Event – setting it stops generation at the next token (barge-in)"""
+        with tracer.span("llm.ask", chars=len(user_query)) as span:
+            return self._ask(user_query, cancel, span)
+
+    def _ask(self, user_query, cancel, span):
+        start = time.time()
+        with tracer.span("router"):
+            routed = self.router.route(user_query) if self.router else None
+        if routed:
+            intent, answer = routed
+            span.set(route=intent)
+            elapsed = round(time.time() - start, 4)
+            mem = round(psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024), 2)
+            self.metrics_log.append({
+                "timestamp": datetime.datetime.now().isoformat(), "query": user_query, "response": answer,
+                "mode": self.mission_mode, "temperature": self.temperature, "tokens_generated": 0,
+                "inference_time": elapsed, "memory_MB": mem, "draft_acceptance": None, "route": intent,
+                "ctx_tokens": 0, "max_tokens": 0, "stop_reason": "routed"
+            })
+            return answer, elapsed, mem
+
+        # Context goes in the user turn (and stays in history) so the system prompt + earlier turns remain a reusable prefix
+        ctx = self.context.render()
+        content = f"{ctx}\n{user_query}" if ctx else user_query
+        if self.draft:
+            self.draft.reset_stats()
+        from llama_cpp import StoppingCriteriaList
+        stopping = StoppingCriteriaList([lambda ids, logits: cancel.is_set()]) if cancel else None
+        kind = classify_query(user_query)
+        budget = self.lengths.budget(self.mission_mode, kind)
+        with self.llm_lock, tracer.span("llm.generate", max_tokens=budget, kind=kind) as gen:
+            self.fit_history(budget + self._count_tokens(content))
+            messages = chat_messages(content, self.chat_history, self.base_prompt)
+            result = generate_answer(self.llm, messages, self.mission_mode, kind, budget, self.temperature, stopping)
+            gen.set(stop_reason=result["reason"])
+        cancelled = bool(cancel and cancel.is_set())
+        answer, tokens = result["text"], result["tokens"]
+        span.set(route="cancelled" if cancelled else "llm", tokens=tokens, ctx_tokens=self.context.last_tokens)
+
+        elapsed = round(time.time() - start, 2)
+        mem = round(psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024), 2)
+
+        self.metrics_log.append({
+            "timestamp": datetime.datetime.now().isoformat(),
+            "query": user_query,
+            "response": answer,
+            "mode": self.mission_mode,
+            "temperature": self.temperature,
+            "tokens_generated": tokens,
+            "inference_time": elapsed,
+            "memory_MB": mem,
+            "draft_acceptance": round(self.draft.acceptance_rate(tokens), 3) if self.draft else None,
+            "route": "cancelled" if cancelled else "llm",
+            "ctx_tokens": self.context.last_tokens,
+            "max_tokens": budget,
+            "stop_reason": "cancelled" if cancelled else result["reason"]
+        })
+        if cancelled:
+            self.context.rollback()
+            return answer, elapsed, mem  # interrupted turns stay out of the conversation context
+        if self.router:
+            self.router.record_llm(user_query, elapsed)
+        self.lengths.observe(self.mission_mode, kind, tokens, result["reason"])
+
+        self.chat_history.append({"role": "user", "content": content})
+        self.chat_history.append({"role": "assistant", "content": answer})
+        with self.llm_lock, tracer.span("llm.checkpoint"):
+            self.fit_history(DEFAULT_MAX_TOKENS)
+            self.session.checkpoint(self.llm, {"chat_history": list(self.chat_history),
+                                               "mission_mode": self.mission_mode})
+
+        if self.tiers:
+            self.tiers.observe(elapsed)
+            self.tiers.maybe_switch(self)
+        return answer, elapsed, mem
+
+    def save_metrics(self, filename="astroedge_metrics.csv"):
+        with open(filename, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["timestamp", "query", "response", "mode", "temperature",
+                                                   "tokens_generated", "inference_time", "memory_MB",
+                                                   "draft_acceptance", "route", "ctx_tokens",
+                                                   "max_tokens", "stop_reason"])
+            writer.writeheader()
+            writer.writerows(self.metrics_log)
+        print(f"✅ Metrics saved to {filename}")
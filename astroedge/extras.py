@@ -0,0 +1,244 @@
+import datetime
+import os
+import json
+import threading
+from collections import deque
+from xml.sax.saxutils import escape
+import psutil
+from .chart_service import ChartService
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Frame, Paragraph, Spacer
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.lib.styles import getSampleStyleSheet
+import random
+
+#######################################################
+# 🔹 System Health Monitor
+#######################################################
+class SystemHealth:
+    def __init__(self, history_size=3600):
+        # Runtime telemetry samples every second: keep the last hour, not the whole mission
+        self.history = deque(maxlen=history_size)
+
+    def get_stats(self):
+        cpu = psutil.cpu_percent()
+        vm = psutil.virtual_memory()
+        disk = psutil.disk_usage("/").percent
+        stats = {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "cpu": cpu,
+            "memory": vm.percent,
+            "available_MB": round(vm.available / (1024 * 1024), 2),
+            "disk": disk,
+            "temp_C": self._max_temperature()
+        }
+        self.history.append(stats)
+        return stats
+
+    @staticmethod
+    def _max_temperature():
+        """Hottest sensor reading in °C, or None where psutil cannot read sensors (e.g. Windows)."""
+        read = getattr(psutil, "sensors_temperatures", None)
+        try:
+            temps = read() if read else {}
+        except OSError:
+            return None
+        readings = [t.current for entries in temps.values() for t in entries if t.current]
+        return max(readings) if readings else None
+
+    def plot_history(self, out_path="logs/system_health.png"):
+        """Render the health history headlessly; returns the chart path."""
+        if not self.history:
+            print("⚠️ No history to plot yet.")
+            return None
+        times = [h["timestamp"][-8:] for h in self.history]
+        spec = {
+            "kind": "lines", "x": times, "rotate_xticks": 45,
+            "series": [
+                {"label": "CPU %", "values": [h["cpu"] for h in self.history]},
+                {"label": "Memory %", "values": [h["memory"] for h in self.history]},
+                {"label": "Disk %", "values": [h["disk"] for h in self.history]},
+            ],
+        }
+        return ChartService().render(spec, out_path)
+
+#######################################################
+# 🔹 Mission Report Generator
+#######################################################
+class MissionReport:
+    """Streams metrics entries onto PDF pages a page-sized chunk at a time.
+
+    Only `page_size` entries are turned into flowables at once, so memory
+    follows the page size, not the mission length. With incremental=True
+    the entries added since the last report go into a new volume file
+    instead of re-rendering the whole mission.
+    """
+    def __init__(self, log_file=r"D:\astro_edge_ai\astro_edge_ai\logs\report\mission_report.pdf", page_size=25):
+        self.log_file = log_file
+        self.page_size = page_size
+        self.state_file = os.path.splitext(log_file)[0] + "_state.json"
+        self.styles = getSampleStyleSheet()
+        self._worker = None
+
+    def generate(self, metrics, incremental=False):
+        state = self._load_state() if incremental else {"entries": 0, "log_id": None, "volumes": []}
+        end = len(metrics)  # snapshot: entries appended while we render go in the next report
+        log_id = self._log_id(metrics)
+        # metrics_log is append-only, so an entry count marks what was reported – unless this is another run's log
+        start = state["entries"] if state["log_id"] == log_id and state["entries"] <= end else 0
+        if start == end and state["volumes"]:
+            print("ℹ️ Mission report already up to date.")
+            return state["volumes"][-1]
+
+        if state["volumes"]:
+            root, ext = os.path.splitext(self.log_file)
+            path = f"{root}_vol{len(state['volumes']) + 1:03d}{ext}"
+            title = f"🚀 AstroEdge Mission Report – Update ({end - start} new entries)"
+        else:
+            path = self.log_file
+            title = "🚀 AstroEdge Mission Report"
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._render(path, title, (metrics[i] for i in range(start, end)))
+
+        state["entries"], state["log_id"] = end, log_id
+        state["volumes"].append(path)
+        self._save_state(state)
+        print(f"✅ Mission report saved as {path}")
+        return path
+
+    def generate_async(self, metrics, incremental=True, on_done=None):
+        """Render in a background thread; on_done(path, error) runs on that thread."""
+        if self._worker and self._worker.is_alive():
+            return False
+
+        def _run():
+            try:
+                path, error = self.generate(metrics, incremental), None
+            except Exception as e:
+                path, error = None, e
+                print(f"❌ Mission report failed: {e}")
+            if on_done:
+                on_done(path, error)
+
+        self._worker = threading.Thread(target=_run, daemon=True)
+        self._worker.start()
+        return True
+
+    @staticmethod
+    def _log_id(metrics):
+        """The log's first entry identifies it – a new app run starts a new metrics_log."""
+        if not metrics:
+            return None
+        first = metrics[0]
+        return f"{first.get('timestamp', '')}|{first.get('query', '')}"
+
+    def _entry_flowables(self, entry):
+        text = f"<b>Time:</b> {escape(str(entry.get('timestamp', '')))}<br/>" \
+               f"<b>Query:</b> {escape(str(entry.get('query', '')))}<br/>" \
+               f"<b>Response:</b> {escape(str(entry.get('response', '')))}<br/>" \
+               f"<b>Inference Time:</b> {entry.get('inference_time', '?')}s<br/>" \
+               f"<b>Memory:</b> {entry.get('memory_MB', '?')} MB"
+        return [Paragraph(text, self.styles["Normal"]), Spacer(1, 15)]
+
+    def _render(self, path, title, entries):
+        width, height = A4
+        c = canvas.Canvas(path, pagesize=A4)
+        page = 1
+
+        def new_frame():
+            return Frame(2 * cm, 2 * cm, width - 4 * cm, height - 4 * cm)
+
+        def finish_page():
+            c.setFont("Helvetica", 8)
+            c.drawRightString(width - 2 * cm, 1.2 * cm, f"AstroEdge Mission Report – page {page}")
+            c.showPage()
+
+        frame = new_frame()
+        pending = deque([Paragraph(title, self.styles["Title"]), Spacer(1, 20)])
+        chunk = []
+        for entry in entries:
+            chunk.append(entry)
+            if len(chunk) < self.page_size:
+                continue
+            for e in chunk:
+                pending.extend(self._entry_flowables(e))
+            chunk = []
+            frame, page = self._drain(c, frame, pending, new_frame, finish_page, page)
+        for e in chunk:
+            pending.extend(self._entry_flowables(e))
+        frame, page = self._drain(c, frame, pending, new_frame, finish_page, page)
+
+        finish_page()
+        c.save()
+
+    @staticmethod
+    def _drain(c, frame, pending, new_frame, finish_page, page):
+        """Lay out pending flowables, starting new pages whenever the frame fills up."""
+        while pending:
+            head = pending[0]
+            if frame.add(head, c):
+                pending.popleft()
+                continue
+            parts = frame.split(head, c)
+            if parts:
+                pending.popleft()
+                pending.extendleft(reversed(parts))
+                if frame.add(pending[0], c):
+                    pending.popleft()
+                    continue
+            if frame._atTop:
+                print("⚠️ Skipping report entry too large for a page.")
+                pending.popleft()
+                continue
+            finish_page()
+            page += 1
+            frame = new_frame()
+        return frame, page
+
+    def _load_state(self):
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            # Volumes deleted from disk mean the report must start over
+            if all(os.path.exists(v) for v in state.get("volumes", [])):
+                return {"entries": state.get("entries", 0), "log_id": state.get("log_id"),
+                        "volumes": state.get("volumes", [])}
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        return {"entries": 0, "log_id": None, "volumes": []}
+
+    def _save_state(self, state):
+        with open(self.state_file, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+
+#######################################################
+# 🔹 Stress Relief (Fun Mode)
+#######################################################
+class StressRelief:
+    def __init__(self):
+        self.jokes = [
+            "Why don’t astronauts get hungry after being blasted into space? Because they’ve just had a big launch!",
+            "I asked the space engineer how they organize a party. They said: You planet!",
+            "In space, you can’t cry... because there’s zero gravity for your tears!"
+        ]
+        self.quotes = [
+            "Keep looking up! – Neil deGrasse Tyson",
+            "That’s one small step for man, one giant leap for mankind. – Neil Armstrong",
+            "The Earth is the cradle of humanity, but mankind cannot stay in the cradle forever. – Konstantin Tsiolkovsky"
+        ]
+        self.exercises = [
+            "Box breathing: inhale for 4 seconds, hold for 4, exhale for 4, hold for 4. Repeat four times.",
+            "Tense your hands and shoulders for 5 seconds, then release slowly. Repeat, working down to your feet.",
+            "Name 5 things you can see, 4 you can touch, 3 you can hear, 2 you can smell and 1 you can taste."
+        ]
+
+    def random_joke(self):
+        return random.choice(self.jokes)
+
+    def random_quote(self):
+        return random.choice(self.quotes)
+
+    def random_exercise(self):
+        return random.choice(self.exercises)
@@ -0,0 +1,147 @@
+"""
+ASTROEDGE FAKE LLAMA BACKEND
+----------------------------
+Deterministic stand-in for llama_cpp.Llama, so pipelines, scheduling and
+benchmarks can run without the GGUF model.
+
+✅ Same call surface: create_chat_completion / create_completion / __call__ (+ stream=True)
+✅ tokenize / detokenize / eval / reset / n_tokens like the real object
+✅ Output depends only on (model file, prompt, seed, temperature) – identical across runs
+✅ Configurable per-token decode latency and per-token prompt-eval latency
+✅ Prefix reuse like llama.cpp: only the part of a prompt not already evaluated is paid for
+"""
+
+import os, time, random, hashlib, itertools
+
+VOCAB = ["check", "the", "oxygen", "valve", "pressure", "seal", "panel", "tether", "suit", "glove",
+         "verify", "secure", "report", "to", "mission", "control", "then", "inspect", "hatch",
+         "airlock", "sensor", "reading", "before", "proceeding", "carefully", "step", "and", "power",
+         "module", "isolate", "leak", "confirm", "status", "crew", "safety", "backup", "system"]
+
+
+class FakeLlama:
+    def __init__(self, model_path="fake-tinyllama.gguf", n_ctx=2048, n_threads=6, n_batch=512,
+                 seed=1234, token_latency_s=0.02, prompt_token_latency_s=0.0005, verbose=False, **kwargs):
+        self.model_path = model_path
+        self._n_ctx = n_ctx
+        self.n_threads = n_threads
+        self.n_batch = n_batch
+        self.seed = seed
+        self.token_latency_s = token_latency_s
+        self.prompt_token_latency_s = prompt_token_latency_s
+        self.params = kwargs
+        self.input_ids = []
+
+    #######################################################
+    # 🔹 Token level API
+    #######################################################
+    def n_ctx(self):
+        return self._n_ctx
+
+    @property
+    def n_tokens(self):
+        return len(self.input_ids)
+
+    def tokenize(self, text, add_bos=True, special=False):
+        if isinstance(text, bytes):
+            text = text.decode("utf-8", errors="ignore")
+        ids = [1] if add_bos else []
+        ids += [int.from_bytes(hashlib.blake2s(w.encode(), digest_size=2).digest(), "little") % 32000 + 2
+                for w in text.split()]
+        return ids
+
+    def detokenize(self, tokens):
+        return " ".join(VOCAB[t % len(VOCAB)] for t in tokens if t > 1).encode("utf-8")
+
+    def reset(self):
+        self.input_ids = []
+
+    def eval(self, tokens):
+        self._sleep(len(tokens) * self.prompt_token_latency_s)
+        self.input_ids.extend(tokens)
+
+    def _prefill(self, tokens):
+        """Evaluate only the suffix not already in the (simulated) KV cache."""
+        reuse = 0
+        for a, b in zip(self.input_ids, tokens):
+            if a != b:
+                break
+            reuse += 1
+        self.input_ids = self.input_ids[:reuse]
+        self.eval(tokens[reuse:])
+
+    @staticmethod
+    def _sleep(seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    #######################################################
+    # 🔹 Completion API
+    #######################################################
+    def _words(self, prompt, temperature, seed):
+        digest = hashlib.sha256(f"{os.path.basename(self.model_path)}|{seed}|{temperature:.3f}|{prompt}"
+                                .encode("utf-8")).digest()
+        rng = random.Random(digest)
+        step = 1
+        while True:
+            yield f"\n{step}."
+            for _ in range(rng.randint(6, 14)):
+                yield rng.choice(VOCAB)
+            step += 1
+
+    def _generate(self, prompt, max_tokens, temperature, stop, seed, stopping_criteria=None):
+        prompt_tokens = self.tokenize(prompt)
+        if len(prompt_tokens) > self._n_ctx:
+            raise ValueError(f"Requested tokens ({len(prompt_tokens)}) exceed context window of {self._n_ctx}")
+        self._prefill(prompt_tokens)
+        max_tokens = max_tokens if max_tokens and max_tokens > 0 else self._n_ctx - len(prompt_tokens)
+        stop = [stop] if isinstance(stop, str) else list(stop or [])
+        text = ""
+        for word in itertools.islice(self._words(prompt, temperature or 0.0, self.seed if seed is None else seed),
+                                     max_tokens):
+            self._sleep(self.token_latency_s)
+            piece = word if word.startswith("\n") or not text else " " + word
+            self.input_ids.append(self.tokenize(word, add_bos=False)[0])
+            if stop and any(s in text + piece for s in stop):
+                return
+            if stopping_criteria is not None and stopping_criteria(self.input_ids, None):
+                return
+            text += piece
+            yield piece
+
+    def _usage(self, prompt, n):
+        p = len(self.tokenize(prompt))
+        return {"prompt_tokens": p, "completion_tokens": n, "total_tokens": p + n}
+
+    def create_completion(self, prompt, max_tokens=16, temperature=0.8, stop=None, stream=False, seed=None,
+                          stopping_criteria=None, **kwargs):
+        pieces = self._generate(prompt, max_tokens, temperature, stop, seed, stopping_criteria)
+        if stream:
+            return ({"object": "text_completion", "model": self.model_path,
+                     "choices": [{"index": 0, "text": p, "finish_reason": None}]} for p in pieces)
+        pieces = list(pieces)
+        return {"object": "text_completion", "model": self.model_path,
+                "choices": [{"index": 0, "text": "".join(pieces),
+                             "finish_reason": "length" if len(pieces) == max_tokens else "stop"}],
+                "usage": self._usage(prompt, len(pieces))}
+
+    __call__ = create_completion
+
+    @staticmethod
+    def format_chat(messages):
+        """Zephyr-style chat template (what TinyLlama chat uses)."""
+        prompt = "".join(f"<|{m['role']}|>\n{m['content']}</s>\n" for m in messages)
+        return prompt + "<|assistant|>\n"
+
+    def create_chat_completion(self, messages, max_tokens=None, temperature=0.2, stop=None,
+                               stream=False, seed=None, stopping_criteria=None, **kwargs):
+        prompt = self.format_chat(messages)
+        pieces = self._generate(prompt, max_tokens, temperature, stop, seed, stopping_criteria)
+        if stream:
+            return ({"object": "chat.completion.chunk", "model": self.model_path,
+                     "choices": [{"index": 0, "delta": {"content": p}, "finish_reason": None}]} for p in pieces)
+        pieces = list(pieces)
+        return {"object": "chat.completion", "model": self.model_path,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(pieces).strip()},
+                             "finish_reason": "length" if len(pieces) == max_tokens else "stop"}],
+                "usage": self._usage(prompt, len(pieces))}
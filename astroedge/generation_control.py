@@ -0,0 +1,346 @@
+"""
+ASTROEDGE ADAPTIVE GENERATION CONTROL
+-------------------------------------
+✅ Per mode + query kind answer-length budget learned from past answers (quantile × margin), replacing the
+   fixed max_tokens=350
+✅ Streams the answer and stops at structural end markers: the announced number of checklist steps
+   done, the list restarting at step 1, a closing line, per-mode stop sequences. Lists without an
+   announced count are never capped – emergency procedures run to their end
+✅ Detects degenerate loops (repeated lines, repeating n-grams) and trims them from the answer
+✅ Before/after report on the benchmark set:
+   python -m astroedge.generation_control --backend fake
+   python -m astroedge.generation_control --backend llama --model path/to/tinyllama.gguf
+"""
+
+import os, re, json, time, argparse, statistics, threading
+from collections import deque
+
+DEFAULT_MAX_TOKENS = 350
+# Chat-template leaks + trailing fluff that never carries mission content
+STOP_SEQUENCES = ["</s>", "<|user|>", "<|system|>", "\nUser:", "\nAstronaut:"]
+MODE_STOPS = {
+    "General Assistance": ["\n\nI hope this helps", "\n\nLet me know", "\n\nFeel free"],
+    "Repairs": ["\n\nNote:", "\n\nDisclaimer", "\n\nI hope this helps", "\n\nLet me know"],
+    "Navigation": ["\n\nNote:", "\n\nDisclaimer", "\n\nI hope this helps", "\n\nLet me know"],
+    "Stress Management": ["\n\nI hope this helps", "\n\nLet me know"],
+    "Mission Commander": ["\n\nAdditionally,", "\n\nI hope this helps", "\n\nLet me know", "\n\nFeel free"],
+    "Mentor Mode": ["\n\nLet me know", "\n\nFeel free"],
+}
+# Prior budgets (tokens) per query kind, used until enough history exists
+KIND_PRIORS = {"factual": 128, "explain": 256, "checklist": 350, "other": 256}
+CLOSERS = ("stay safe", "good luck", "i hope this helps", "remember to stay calm", "safe travels")
+
+_CHECKLIST = re.compile(r"\b(checklist|steps?|step-by-step|procedure|protocols?|instructions|how (do|can|should) i|how to|"
+                        r"what (to|should \w+|do \w+) do)\b")
+_FACTUAL = re.compile(r"^(what|who|when|where|which|is|are|does|do|define|how (many|much|long|far))\b")
+_EXPLAIN = re.compile(r"\b(explain|why|describe|difference)\b")
+_STEP = re.compile(r"^\s*(\d+)[.)]\s")
+_ITEM = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s")
+_SENTENCE_END = re.compile(r"[.!?)](?=\s|$)")
+_ANNOUNCED = re.compile(r"\b(\d+|two|three|four|five|six|seven|eight|nine|ten)\s+(?:\w+\s+)?(steps|things|ways|tips|checks|actions)\b")
+_NUMBERS = {"two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10}
+_WORD = re.compile(r"\S+")
+
+
+def classify_query(query):
+    """Coarse answer-shape class: checklist / explain / factual / other."""
+    q = query.lower().strip()
+    if _CHECKLIST.search(q):
+        return "checklist"
+    if _EXPLAIN.search(q):
+        return "explain"
+    if _FACTUAL.search(q):
+        return "factual"
+    return "other"
+
+
+def stop_sequences(mode):
+    return STOP_SEQUENCES + MODE_STOPS.get(mode, MODE_STOPS["General Assistance"])
+
+
+#######################################################
+# 🔹 Length budget learned from history
+#######################################################
+class LengthModel:
+    def __init__(self, path=os.path.join("logs", "answer_lengths.json"), quantile=0.9, margin=1.2,
+                 min_samples=5, floor=48, ceiling=DEFAULT_MAX_TOKENS, history=50):
+        self.path = path
+        self.quantile = quantile
+        self.margin = margin
+        self.min_samples = min_samples
+        self.floor = floor
+        self.ceiling = ceiling
+        self.lengths = {}  # "mode|kind" -> deque of natural answer lengths (tokens)
+        self._history = history
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.lengths = {k: deque(v, maxlen=history) for k, v in json.load(f).items()}
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Answer length history unreadable, starting fresh: {e}")
+
+    def budget(self, mode, kind):
+        with self._lock:
+            seen = list(self.lengths.get(f"{mode}|{kind}", ()))
+        if len(seen) < self.min_samples:
+            estimate = KIND_PRIORS.get(kind, DEFAULT_MAX_TOKENS)
+        else:
+            estimate = statistics.quantiles(seen, n=20, method="inclusive")[int(self.quantile * 20) - 1] * self.margin
+        return int(min(self.ceiling, max(self.floor, estimate)))
+
+    def observe(self, mode, kind, tokens, reason):
+        """reason 'length' means the budget cut the answer: its true length is longer, so nudge upward."""
+        value = min(self.ceiling, int(tokens * 1.5)) if reason == "length" else tokens
+        with self._lock:
+            self.lengths.setdefault(f"{mode}|{kind}", deque(maxlen=self._history)).append(value)
+            snapshot = {k: list(v) for k, v in self.lengths.items()}
+        if self.path:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp, self.path)  # a crash mid-write never leaves a truncated history
+
+
+#######################################################
+# 🔹 Structural end / loop detection on the stream
+#######################################################
+class EndDetector:
+    """Loops are whole lines or sentences seen before, or a word sequence repeating back to back.
+    Sentence memory resets at every list item, so steps that share a phrase never count as a loop."""
+
+    def __init__(self, mode="General Assistance", kind="other", max_period=20, min_repeats=3, min_loop_words=6):
+        self.mode, self.kind = mode, kind
+        self.max_period = max_period
+        self.min_repeats = min_repeats
+        self.min_loop_words = min_loop_words
+        self.text = ""
+        self.cut = None  # answer = text[:cut] once a reason fired
+        self.announced = None
+        self.steps = 0
+        self._line_start = 0
+        self._lines = set()
+        self._sentences = set()
+        self._checked = 0  # chars of the current line already split into sentences
+        self._item = False  # current line is a list item (its marker was seen)
+
+    def feed(self, piece):
+        """Add streamed text (any chunking); returns a stop reason ('checklist', 'closing', 'repetition') or None."""
+        self.text += piece
+        while "\n" in self.text[self._line_start:]:
+            end = self.text.index("\n", self._line_start)
+            reason = self._line(self.text[self._line_start:end], self._line_start, end)
+            self._line_start, self._checked, self._item = end + 1, 0, False
+            if reason:
+                return reason
+        return self._partial(self.text[self._line_start:])
+
+    def _partial(self, tail):
+        if not self._item and _ITEM.match(tail):
+            self._item = True
+            self._sentences.clear()
+        reason = self._new_sentences(tail, final=False)
+        if reason:
+            return reason
+        words = _WORD.findall(_ITEM.sub("", tail).lower())[:-1]  # the last word may still be streaming
+        if self._repeating_tail(words):
+            self.cut = len(self.text)  # trim_degenerate() removes the repeated tail
+            return "repetition"
+        return None
+
+    def _new_sentences(self, line, final):
+        ends = [m.end() for m in _SENTENCE_END.finditer(line, self._checked)]
+        if final and len(line) > self._checked:
+            ends.append(len(line))
+        for end in ends:
+            sentence = line[self._checked:end]
+            start = self._line_start + self._checked
+            self._checked = end
+            norm = " ".join(_WORD.findall(_ITEM.sub("", sentence).lower()))
+            if len(norm) <= 12:
+                continue
+            if norm in self._sentences:
+                self.cut = start
+                return "repetition"
+            self._sentences.add(norm)
+        return None
+
+    def _repeating_tail(self, words):
+        for period in range(1, min(self.max_period, len(words) // self.min_repeats) + 1):
+            reps = 1
+            while len(words) >= period * (reps + 1) and \
+                    words[-period * (reps + 1):-period * reps] == words[-period:]:
+                reps += 1
+            if reps >= self.min_repeats and reps * period >= self.min_loop_words:
+                return True
+        return False
+
+    def _line(self, line, start, end):
+        norm = " ".join(_WORD.findall(_STEP.sub("", line).lower()))
+        if self.announced is None and start < 300:
+            m = _ANNOUNCED.search(line.lower())
+            if m:
+                self.announced = int(m.group(1)) if m.group(1).isdigit() else _NUMBERS[m.group(1)]
+        step = _STEP.match(line)
+        if step:
+            number = int(step.group(1))
+            if self.announced and (number > self.announced or self.steps >= self.announced):
+                self.cut = start  # the announced list was complete before this step
+                return "checklist"
+            if number == 1 and self.steps >= 2:
+                self.cut = start  # numbering restarts: the list is being generated again
+                return "repetition"
+            self.steps += 1
+        if len(norm) > 12:
+            if norm in self._lines:
+                self.cut = start
+                return "repetition"
+            self._lines.add(norm)
+        if not self._item and _ITEM.match(line):
+            self._sentences.clear()
+        reason = self._new_sentences(line, final=True)
+        if reason:
+            return reason
+        if norm.startswith(CLOSERS):
+            self.cut = end
+            return "closing"
+        return None
+
+
+
+def trim_degenerate(text, truncated=False):
+    """Drop repeated lines and a repeating word loop at the tail; if the budget cut the answer
+    mid-thought, end it at the last complete line or sentence."""
+    seen, kept = set(), []
+    for line in text.split("\n"):
+        norm = " ".join(_STEP.sub("", line).lower().split())
+        if len(norm) > 12 and norm in seen:
+            continue
+        seen.add(norm)
+        kept.append(line)
+    text = "\n".join(kept)
+
+    words = text.split()
+    for period in range(2, 21):  # tail like "a b c a b c a b c" → keep one "a b c"
+        reps = 1
+        while len(words) >= period * (reps + 1) and \
+                words[-period * (reps + 1):-period * reps] == words[-period:]:
+            reps += 1
+        if reps >= 3:
+            tail = " ".join(words[-period * (reps - 1):])
+            text = text[:text.rfind(tail)].rstrip() if tail in text else text
+            break
+
+    if truncated:
+        last_line = text.rfind("\n")
+        last_sentence = max((m.end() for m in _SENTENCE_END.finditer(text)), default=-1)
+        cut = max(last_line, last_sentence)
+        if cut > len(text) // 2:
+            text = text[:cut]
+    return text.strip()
+
+
+#######################################################
+# 🔹 Streaming generation with early stop
+#######################################################
+def generate(llm, messages, max_tokens, detector=None, temperature=0.45, stop=None, stopping_criteria=None,
+             seed=None):
+    """Returns {"text", "tokens", "reason"}; reason is 'stop' (model/stop sequence), 'length' (budget),
+    or the detector's structural reason."""
+    kwargs = {"seed": seed} if seed is not None else {}
+    stream = llm.create_chat_completion(messages=messages, max_tokens=max_tokens, temperature=temperature,
+                                        stop=stop, stream=True, stopping_criteria=stopping_criteria, **kwargs)
+    text, tokens, reason, finish = "", 0, None, None
+    try:
+        for chunk in stream:
+            choice = chunk["choices"][0]
+            finish = choice.get("finish_reason") or finish
+            piece = choice.get("delta", {}).get("content")
+            if not piece:
+                continue
+            tokens += 1
+            text += piece
+            reason = detector.feed(piece) if detector else None
+            if reason:
+                break
+    finally:
+        if hasattr(stream, "close"):
+            stream.close()  # stops generation in llama.cpp if we broke out early
+    if reason:
+        text = text[:detector.cut] if detector.cut is not None else text
+    else:
+        reason = finish or ("length" if tokens >= max_tokens else "stop")
+    return {"text": trim_degenerate(text, truncated=reason == "length"), "tokens": tokens, "reason": reason}
+
+
+#######################################################
+# 🔹 Before / after on the benchmark set
+#######################################################
+def _run(llm, queries, mode, adaptive, lengths, temperature, seed):
+    from .bench_suite import BASE_PROMPT
+    rows = []
+    for query in queries:
+        kind = classify_query(query)
+        messages = [{"role": "system", "content": BASE_PROMPT}, {"role": "user", "content": query}]
+        budget = lengths.budget(mode, kind) if adaptive else DEFAULT_MAX_TOKENS
+        detector = EndDetector(mode, kind) if adaptive else None
+        start = time.perf_counter()
+        result = generate(llm, messages, budget, detector, temperature,
+                          stop_sequences(mode) if adaptive else None, seed=seed)
+        elapsed = time.perf_counter() - start
+        if adaptive:
+            lengths.observe(mode, kind, result["tokens"], result["reason"])
+        rows.append({"query": query, "kind": kind, "max_tokens": budget, "tokens": result["tokens"],
+                     "reason": result["reason"], "latency_s": round(elapsed, 3)})
+    return rows
+
+
+def main(argv=None):
+    from .bench_suite import BENCHMARK_QUERIES, load_backend
+
+    ap = argparse.ArgumentParser(description="Fixed max_tokens vs adaptive budget + early stop on the benchmark set.")
+    ap.add_argument("--backend", choices=["fake", "llama"], default="fake")
+    ap.add_argument("--model", help="GGUF path for --backend llama")
+    ap.add_argument("--mode", default="General Assistance")
+    ap.add_argument("--token-latency", type=float, default=0.01, help="fake backend seconds per token")
+    ap.add_argument("--learn-passes", type=int, default=1, help="adaptive passes before the measured one")
+    ap.add_argument("--temperature", type=float, default=0.4)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out", default=os.path.join("logs", "generation_control_bench.json"))
+    args = ap.parse_args(argv)
+    if args.backend == "llama" and not args.model:
+        ap.error("--backend llama needs --model")
+
+    llm = load_backend(args.backend, args.model, args.seed, args.token_latency, n_ctx=2048)
+    lengths = LengthModel(path=None)  # fresh history: the report shows what is learned from this set alone
+    before = _run(llm, BENCHMARK_QUERIES, args.mode, False, lengths, args.temperature, args.seed)
+    for _ in range(args.learn_passes):
+        _run(llm, BENCHMARK_QUERIES, args.mode, True, lengths, args.temperature, args.seed)
+    after = _run(llm, BENCHMARK_QUERIES, args.mode, True, lengths, args.temperature, args.seed)
+
+    print(f"{'query':<44} {'kind':<9} {'before':>12} {'after':>12}  budget  stop")
+    for b, a in zip(before, after):
+        print(f"{b['query'][:43]:<44} {a['kind']:<9} {b['tokens']:>4} {b['latency_s']:>6.2f}s "
+              f"{a['tokens']:>4} {a['latency_s']:>6.2f}s  {a['max_tokens']:>6}  {a['reason']}")
+    summary = {}
+    for name, rows in (("before", before), ("after", after)):
+        summary[name] = {"mean_tokens": round(statistics.fmean(r["tokens"] for r in rows), 1),
+                         "mean_latency_s": round(statistics.fmean(r["latency_s"] for r in rows), 3)}
+    b, a = summary["before"], summary["after"]
+    print(f"\nMean tokens:  {b['mean_tokens']} → {a['mean_tokens']} "
+          f"({(a['mean_tokens'] / b['mean_tokens'] - 1) * 100:+.0f}%)")
+    print(f"Mean latency: {b['mean_latency_s']}s → {a['mean_latency_s']}s "
+          f"({(a['mean_latency_s'] / b['mean_latency_s'] - 1) * 100:+.0f}%)")
+    if args.backend == "fake":
+        print("ℹ️ FakeLlama never ends an answer by itself, so these numbers only exercise the mechanism; "
+              "measure the benefit with --backend llama")
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"backend": args.backend, "model": args.model or "fake", "mode": args.mode,
+                   "summary": summary, "before": before, "after": after}, f, indent=4)
+    print(f"✅ Results saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -41,8 +41,10 @@ class HotwordListener:
 import threading
 import queue
 import json
+import time
 import sounddevice as sd
 from vosk import Model, KaldiRecognizer
+from .tracing import tracer
 
 class HotwordListener:
     def __init__(self, model_path, hotword="hello", callback=None):
@@ -94,7 +96,7 @@ class HotwordListener:
     def start(self):
         if not self.running:
             self.running = True
-            threading.Thread(target=self._listen, daemon=True).start()
+            threading.Thread(target=self._listen, name="hotword", daemon=True).start()
             print("[Hotword] Listener started (background thread).")
 
     def stop(self):
@@ -112,6 +114,7 @@ class HotwordListener:
                 callback=self._audio_callback,
             ):
                 print("[Hotword DEBUG] Microphone stream opened")  # ADD THIS
+                utterance_ns = None  # first partial of the current utterance: when the astronaut started talking
                 while self.running:
                     data = self.q.get()
                     print(f"[Hotword DEBUG] Pulled {len(data)} bytes from queue")  # ADD THIS
@@ -122,11 +125,19 @@ class HotwordListener:
                             print(f"[Listening] {text}")
                             if self.hotword in text:
                                 print("🔥 Hotword detected!")
+                                # A new interaction trace starts at the spoken hotword
+                                start_ns = utterance_ns or time.time_ns()
+                                root = tracer.begin("interaction", trigger="hotword")
+                                root.start_ns = min(root.start_ns, start_ns)
+                                tracer.start_span("hotword.detect", parent=root, start_ns=start_ns,
+                                                  text=text).end()
                                 if self.callback:
                                     self.callback()
+                        utterance_ns = None
                     else:
                         partial = json.loads(self.rec.PartialResult())
                         if partial.get("partial"):
+                            utterance_ns = utterance_ns or time.time_ns()
                             print(f"[Partial] {partial['partial']}")
         except Exception as e:
             print(f"[Hotword Critical Error] {e}")
@@ -0,0 +1,82 @@
+"""
+ASTROEDGE IMPORT-TIME BUDGET
+----------------------------
+✅ Runs `python -X importtime -c "import astroedge"` in fresh interpreters and parses the report
+✅ Fails (exit 1) if the cumulative import time exceeds the budget (median of several runs)
+✅ Fails if a heavy dependency (tkinter, llama_cpp, pyttsx3, matplotlib, …) is imported eagerly
+✅ Prints the slowest modules so regressions are easy to trace
+
+    python -m astroedge.import_budget --budget-ms 50
+"""
+
+import os, sys, argparse, subprocess
+
+HEAVY_MODULES = ("tkinter", "llama_cpp", "pyttsx3", "psutil", "matplotlib", "whisper", "numpy",
+                 "reportlab", "speech_recognition", "sounddevice", "vosk")
+
+
+def parse_importtime(stderr):
+    """-X importtime lines -> [(module, self_us, cumulative_us, depth)] in report order."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def subtree(rows, module):
+    """Rows imported on behalf of `module` (children are reported before their parent, one level deeper)."""
+    end = next(i for i, row in enumerate(rows) if row[0] == module)
+    start = end
+    while start > 0 and rows[start - 1][3] > rows[end][3]:
+        start -= 1
+    return rows[start:end + 1]
+
+
+def measure(module="astroedge", runs=5):
+    """Median cumulative import time in ms, plus the parsed report of the median run."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    samples = []
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              capture_output=True, text=True, env=env, cwd=root)
+        if proc.returncode:
+            raise ImportError(f"import {module} failed:\n{proc.stderr.splitlines()[-1]}")
+        rows = subtree(parse_importtime(proc.stderr), module)
+        samples.append((rows[-1][2] / 1000, rows))
+    samples.sort(key=lambda s: s[0])
+    return samples[len(samples) // 2]
+
+
+def check(module="astroedge", budget_ms=50.0, runs=5, top=8, allow_heavy=False):
+    total_ms, rows = measure(module, runs)
+    imported = {name for name, *_ in rows}
+    heavy = [] if allow_heavy else sorted(m for m in HEAVY_MODULES if m in imported)
+    ok = total_ms <= budget_ms and not heavy
+
+    print(f"{'✅' if total_ms <= budget_ms else '❌'} import {module}: {total_ms:.1f} ms (budget {budget_ms:.0f} ms, "
+          f"median of {runs})")
+    if heavy:
+        print(f"❌ Heavy dependencies imported eagerly: {', '.join(heavy)}")
+    print(f"Slowest of {len(rows)} modules imported (self time):")
+    for name, self_us, cum_us, _ in sorted(rows, key=lambda r: -r[1])[:top]:
+        print(f"   {self_us / 1000:7.2f} ms  (cum {cum_us / 1000:7.2f} ms)  {name}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enforce the astroedge import-time budget")
+    parser.add_argument("--module", default="astroedge")
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--allow-heavy", action="store_true", help="only enforce the time budget")
+    args = parser.parse_args(argv)
+    return 0 if check(args.module, args.budget_ms, args.runs, allow_heavy=args.allow_heavy) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+ASTROEDGE INTENT ROUTER
+-----------------------
+✅ Tiny TF-IDF classifier in front of CoreAI.ask – no model, no extra dependencies
+✅ Cheap intents (jokes, quotes, breathing exercises, health status, detection results)
+   are answered directly from StressRelief / SystemHealth / VisionModule in microseconds
+✅ Only open-ended questions go to TinyLlama – including requests to act on a routed noun
+   ("reduce disk usage", "why is the CPU so high?")
+✅ Threshold calibrated on held-out paraphrases: python -m astroedge.intent_router --calibrate
+✅ Every routing decision is logged with its latency and the LLM time it saved
+"""
+
+import os, re, json, math, time, datetime, argparse
+from collections import Counter
+
+INTENT_EXAMPLES = {
+    "joke": ["tell me a joke", "make me laugh", "say something funny", "space joke", "cheer me up with a joke"],
+    "quote": ["give me a quote", "inspirational quote", "motivate me", "say something inspiring", "motivation quote"],
+    "exercise": ["stress relief exercise", "breathing exercise", "help me relax", "calm down exercise",
+                 "relaxation technique"],
+    "health": ["system health", "system status", "computer status", "computer health", "cpu usage", "cpu load",
+               "memory usage", "ram usage", "disk usage", "disk space"],
+    "detection": ["what do you see", "run detection", "object detection results", "camera scan",
+                  "vision detection"],
+}
+# A route is only accepted if the query names one of these – "health status of the crew" is a crew question
+REQUIRED_TERMS = {
+    "health": {"system", "systems", "computer", "cpu", "processor", "ram", "memory", "disk", "storage"},
+}
+# Never routed: requests to act on or reason about the topic – "reduce disk usage" is a task, not a readout,
+# and "explain the joke" is a question about one
+ACTION_TERMS = {"reduce", "lower", "free", "clear", "clean", "delete", "remove", "fix", "repair", "optimize",
+                "optimise", "increase", "decrease", "limit", "improve", "speed", "cool", "stop", "kill",
+                "troubleshoot", "diagnose", "prevent", "avoid", "save", "restore", "recover", "allocate",
+                "why", "explain", "mean", "means", "meaning", "safe", "dangerous", "should"}
+# Paraphrases kept OUT of INTENT_EXAMPLES, for calibrating the threshold; None = must reach the LLM
+HELD_OUT = [
+    ("is the computer ok", "health"), ("storage status", "health"), ("cpu temperature", "health"),
+    ("check system status", "health"), ("memory usage now", "health"), ("show disk usage", "health"),
+    ("how's the system doing", "health"), ("how much ram is free", "health"),
+    ("I need a laugh", "joke"), ("tell me something funny", "joke"), ("got any jokes", "joke"),
+    ("share an inspiring quote", "quote"), ("words of motivation", "quote"), ("a quote to motivate me", "quote"),
+    ("guide me through a breathing exercise", "exercise"), ("i need to relax", "exercise"),
+    ("help me calm down", "exercise"),
+    ("scan the camera", "detection"), ("show detection results", "detection"), ("what objects are visible", "detection"),
+    ("reduce disk usage", None), ("free up memory", None), ("why is cpu usage so high", None),
+    ("lower the cpu load", None), ("clear disk space", None), ("optimize memory usage", None),
+    ("what is the crew health status", None), ("status of the airlock", None), ("disk of the docking port", None),
+    ("explain memory foam", None), ("explain the joke you told", None), ("what does the quote mean", None),
+    ("is breathing exercise safe during eva", None), ("emergency repair protocol", None),
+    ("how do i fix the oxygen valve", None), ("how is the mission going", None),
+    ("tell me about the solar system", None), ("memory of home", None), ("computer vision basics", None),
+    ("disk brakes on the rover", None), ("quote the mission rules", None), ("the crew is laughing", None),
+]
+DEFAULT_THRESHOLD = 0.52  # calibrate(): just above the best wrong match in HELD_OUT ("memory of home", 0.515)
+MAX_FAST_WORDS = 10  # longer queries are treated as open-ended
+STOPWORDS = {"a", "an", "the", "me", "my", "i", "you", "is", "are", "do", "did", "of", "to", "for", "and",
+             "on", "in", "what", "how", "please", "some", "give", "tell", "say", "with", "about", "can"}
+_WORD = re.compile(r"[a-z']+")
+
+
+def _tokens(text):
+    return [w for w in _WORD.findall(text.lower()) if w not in STOPWORDS]
+
+
+class IntentRouter:
+    def __init__(self, handlers, examples=INTENT_EXAMPLES, threshold=DEFAULT_THRESHOLD,
+                 log_path=os.path.join("logs", "intent_routing.jsonl")):
+        """handlers: {intent: callable(query) -> answer}; intents without a handler always go to the LLM."""
+        self.handlers = handlers
+        self.threshold = threshold
+        self.log_path = log_path
+        self.llm_latency = None  # EWMA of real LLM turns, used to estimate time saved
+        self.counts = Counter()
+        self.saved_s = 0.0
+
+        docs = [(intent, Counter(_tokens(text))) for intent, texts in examples.items()
+                if intent in handlers for text in texts]
+        df = Counter(word for _, tf in docs for word in tf)
+        self.idf = {word: math.log((1 + len(docs)) / (1 + n)) + 1 for word, n in df.items()}
+        self.unseen_idf = math.log(1 + len(docs)) + 1  # unknown words still dilute the match
+        self.examples = [(intent, self._vector(tf)) for intent, tf in docs]
+
+    def _vector(self, tf):
+        vec = {w: c * self.idf.get(w, self.unseen_idf) for w, c in tf.items()}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        return {w: v / norm for w, v in vec.items()}
+
+    def classify(self, query):
+        """Best (intent, cosine score); intent is None for open-ended queries."""
+        best, score = self._match(query)
+        return (best, score) if score >= self.threshold else (None, score)
+
+    def _match(self, query):
+        """Best (intent, cosine score) before the threshold; intent is None if the query is out of scope."""
+        words = _tokens(query)
+        if not words or len(words) > MAX_FAST_WORDS:
+            return None, 0.0
+        vec = self._vector(Counter(words))
+        best, score = None, 0.0
+        for intent, example in self.examples:
+            s = sum(v * example.get(w, 0.0) for w, v in vec.items())
+            if s > score:
+                best, score = intent, s
+        if best in REQUIRED_TERMS and not REQUIRED_TERMS[best] & set(words):
+            return None, score
+        if ACTION_TERMS & set(words):
+            return None, score
+        return best, score
+
+    def route(self, query):
+        """(intent, canned answer) for a cheap intent, or None if the query must go to the LLM."""
+        start = time.perf_counter()
+        intent, score = self.classify(query)
+        if intent is None:
+            return None
+        answer = self.handlers[intent](query)
+        elapsed = time.perf_counter() - start
+        saved = max(0.0, self.llm_latency - elapsed) if self.llm_latency else None
+        self.counts[intent] += 1
+        self.saved_s += saved or 0.0
+        self._log(query, intent, score, elapsed, saved)
+        return intent, answer
+
+    def record_llm(self, query, elapsed_s):
+        self.counts["llm"] += 1
+        self.llm_latency = elapsed_s if self.llm_latency is None else 0.8 * self.llm_latency + 0.2 * elapsed_s
+        self._log(query, "llm", None, elapsed_s, None)
+
+    def stats(self):
+        total = sum(self.counts.values())
+        fast = total - self.counts["llm"]
+        return {"total": total, "fast_path": fast, "llm": self.counts["llm"],
+                "fast_ratio": round(fast / total, 3) if total else 0.0,
+                "by_intent": dict(self.counts), "saved_s": round(self.saved_s, 2)}
+
+    def _log(self, query, route, score, latency_s, saved_s):
+        if not self.log_path:
+            return
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "timestamp": datetime.datetime.now().isoformat(), "query": query, "route": route,
+                "score": None if score is None else round(score, 3), "latency_s": round(latency_s, 6),
+                "saved_s": None if saved_s is None else round(saved_s, 3),
+            }) + "\n")
+
+
+def calibrate(router, held_out=HELD_OUT):
+    """Lowest threshold at which no held-out query gets a wrong canned answer. Returns (threshold, recall)."""
+    matches = [(router._match(query), want) for query, want in held_out if want is None or want in router.handlers]
+    wrong = [score for (best, score), want in matches if best is not None and best != want]
+    threshold = math.floor(max(wrong, default=0.0) * 100 + 1) / 100
+    positives = [(best, score, want) for (best, score), want in matches if want is not None]
+    hits = sum(best == want and score >= threshold for best, score, want in positives)
+    return threshold, round(hits / len(positives), 3) if positives else 0.0
+
+
+def default_handlers(relief=None, health=None, vision=None):
+    """Canned-answer handlers for whatever subsystems the app has."""
+    handlers = {}
+    if relief:
+        # Returned verbatim so the voice can play them from the TTS audio cache
+        handlers["joke"] = lambda q: relief.random_joke()
+        handlers["quote"] = lambda q: relief.random_quote()
+        handlers["exercise"] = lambda q: relief.random_exercise()
+    if health:
+        def _health(q):
+            s = health.get_stats()
+            temp = f" | Temp: {s['temp_C']}°C" if s.get("temp_C") is not None else ""
+            return f"📊 CPU: {s['cpu']}% | RAM: {s['memory']}% ({s['available_MB']} MB free) | Disk: {s['disk']}%{temp}"
+        handlers["health"] = _health
+    if vision:
+        def _detect(q):
+            d = vision.detect()
+            return f"👁 Detected: {d['object']} (confidence {d['confidence']})"
+        handlers["detection"] = _detect
+    return handlers
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Intent router demo / threshold calibration")
+    parser.add_argument("--calibrate", action="store_true", help="fit the threshold on HELD_OUT paraphrases")
+    args = parser.parse_args()
+    if args.calibrate:
+        threshold, recall = calibrate(IntentRouter({i: str for i in INTENT_EXAMPLES}, log_path=None))
+        print(f"🎯 threshold {threshold} (in use: {DEFAULT_THRESHOLD}) – held-out fast-path recall {recall:.0%}")
+        raise SystemExit(0)
+    from .extras import StressRelief
+    router = IntentRouter(default_handlers(relief=StressRelief()), log_path=None)
+    for q in ["Tell me a joke", "Stress relief exercise", "Give me an inspirational quote",
+              "Emergency repair protocol", "How do I recalibrate the oxygen valve after a pressure drop?"]:
+        intent, score = router.classify(q)
+        print(f"{q!r:70} -> {intent or 'llm'} ({score:.2f})")
+    start = time.perf_counter()
+    for _ in range(1000):
+        router.route("Tell me a joke")
+    print(f"⚡ Fast path: {(time.perf_counter() - start) * 1000:.1f} µs per query")
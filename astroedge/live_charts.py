@@ -0,0 +1,127 @@
+"""
+ASTROEDGE LIVE TELEMETRY CHARTS
+-------------------------------
+✅ CPU / RAM from the runtime's telemetry events (fed via on_telemetry on the Tk thread – the chart never
+   polls SystemHealth itself) + inference latency / tokens per sec (CoreAI.metrics_log)
+✅ Fixed-size NumPy windows – memory never grows with mission length
+✅ Blitting: only the data lines are redrawn each tick, axes are cached
+✅ Frame budget: if a redraw costs more than the budget, the next redraw is skipped
+"""
+
+import time
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+
+class RingSeries:
+    """Fixed-size window of the most recent values (NaN until filled)."""
+    def __init__(self, size):
+        self.values = np.full(size, np.nan)
+        self.pos = 0
+
+    def push(self, value):
+        self.values[self.pos] = value
+        self.pos = (self.pos + 1) % len(self.values)
+
+    def ordered(self):
+        return np.concatenate((self.values[self.pos:], self.values[:self.pos]))
+
+    def peak(self):
+        return np.nanmax(self.values) if np.any(~np.isnan(self.values)) else 0.0
+
+
+class LiveTelemetryPanel:
+    CHARTS = (
+        ("cpu", "CPU %", "orange", (0, 100)),
+        ("ram", "RAM %", "green", (0, 100)),
+        ("latency", "Inference s", "cyan", (0, 10)),
+        ("tps", "Tokens/s", "magenta", (0, 30)),
+    )
+
+    def __init__(self, parent, ai, window=120, interval_ms=1000, frame_budget_ms=8.0):
+        self.root = parent.winfo_toplevel()
+        self.ai = ai
+        self.interval_ms = interval_ms
+        self.frame_budget = frame_budget_ms / 1000.0
+        self.series = {key: RingSeries(window) for key, *_ in self.CHARTS}
+        self._seen_metrics = len(ai.metrics_log)
+        self._skip = 0
+        self.overruns = 0
+        self.last_frame_ms = 0.0
+
+        self.fig = Figure(figsize=(8, 1.8), dpi=80, facecolor="#111122")
+        self.axes, self.lines = {}, {}
+        x = np.arange(window)
+        for i, (key, label, color, ylim) in enumerate(self.CHARTS, start=1):
+            ax = self.fig.add_subplot(1, len(self.CHARTS), i, facecolor="#1C1C28")
+            ax.set_title(label, color="white", fontsize=9)
+            ax.set_xlim(0, window - 1)
+            ax.set_ylim(*ylim)
+            ax.tick_params(colors="gray", labelsize=7)
+            ax.set_xticks([])
+            (line,) = ax.plot(x, self.series[key].ordered(), color=color, lw=1.2, animated=True)
+            self.axes[key], self.lines[key] = ax, line
+        self.fig.tight_layout()
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        self.widget = self.canvas.get_tk_widget()
+        self._background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.root.after(self.interval_ms, self._tick)
+
+    def _on_draw(self, event=None):
+        """Full redraw happened (first show / resize): cache the static background."""
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._blit_lines()
+
+    def on_telemetry(self, stats):
+        """Runtime telemetry sample (SystemHealth.get_stats + rss_MB), delivered on the Tk thread."""
+        self.series["cpu"].push(stats["cpu"])
+        self.series["ram"].push(stats["memory"])
+
+    def _sample(self):
+        log = self.ai.metrics_log
+        for entry in log[self._seen_metrics:len(log)]:
+            elapsed = entry.get("inference_time") or 0
+            tokens = entry.get("tokens_generated") or 0
+            self.series["latency"].push(elapsed)
+            self.series["tps"].push(tokens / elapsed if elapsed else 0.0)
+        self._seen_metrics = len(log)
+
+    def _tick(self):
+        self._sample()
+        if self._skip:
+            self._skip -= 1
+        else:
+            start = time.perf_counter()
+            self._redraw()
+            cost = time.perf_counter() - start
+            self.last_frame_ms = cost * 1000
+            if cost > self.frame_budget:
+                # Too expensive this frame: give the chat UI the next tick back (one tick is already 1 s)
+                self.overruns += 1
+                self._skip = 1
+        self.root.after(self.interval_ms, self._tick)
+
+    def _redraw(self):
+        rescale = False
+        for key, *_ in self.CHARTS:
+            ax = self.axes[key]
+            peak = self.series[key].peak()
+            if peak > ax.get_ylim()[1]:
+                ax.set_ylim(0, peak * 1.25)
+                rescale = True
+            self.lines[key].set_ydata(self.series[key].ordered())
+        if rescale or self._background is None:
+            self.canvas.draw()  # triggers _on_draw -> new background + lines
+            return
+        self._blit_lines()
+
+    def _blit_lines(self):
+        if self._background is None:
+            return
+        self.canvas.restore_region(self._background)
+        for key, line in self.lines.items():
+            self.axes[key].draw_artist(line)
+        self.canvas.blit(self.fig.bbox)
@@ -0,0 +1,103 @@
+"""
+ASTROEDGE LLAMA STATE FILES
+---------------------------
+Compact, versioned on-disk format for llama.cpp session state (KV cache + token list).
+
+    [ "AEKV" | version u16 | header_len u32 | header JSON | pad to 64 ] [ input_ids int32[n] ] [ llama_state bytes ]
+
+✅ Logit rows are NOT stored: continuing from a state always evaluates at least one new
+   token, which recomputes them – this keeps files a few MB instead of hundreds
+✅ Header records model file + n_ctx so a state is never loaded into the wrong model
+✅ Only the first n_tokens ids are stored; on load they are padded back to a full n_ctx array,
+   because llama.cpp's eval writes the next tokens into input_ids[n_tokens:]
+✅ Loaded through mmap; writes are atomic (tmp file + rename)
+"""
+
+import os, json, mmap, struct
+import numpy as np
+
+MAGIC = b"AEKV"
+VERSION = 1
+_PREFIX = struct.Struct("<4sHI")
+_ALIGN = 64
+
+
+class StateFileError(Exception):
+    pass
+
+
+def model_signature(llm):
+    path = getattr(llm, "model_path", "")
+    return {
+        "model": os.path.basename(path),
+        "model_size": os.path.getsize(path) if path and os.path.exists(path) else None,
+        "n_ctx": llm.n_ctx(),
+    }
+
+
+def save_state_file(path, state, signature, extra=None):
+    """Write a llama_cpp LlamaState (from llm.save_state()) to `path`; state=None stores only `extra`."""
+    if state is None:
+        n_tokens, input_ids, blob, scores_shape = 0, np.zeros(0, dtype=np.int32), b"", [0, 0]
+    else:
+        n_tokens = int(state.n_tokens)
+        input_ids = np.ascontiguousarray(np.asarray(state.input_ids)[:n_tokens], dtype=np.int32)
+        blob = bytes(state.llama_state)[:int(state.llama_state_size)]
+        scores_shape = [min(n_tokens, len(state.scores)), int(state.scores.shape[1])]
+    header = json.dumps({
+        "n_tokens": n_tokens,
+        "llama_state_size": len(blob),
+        "scores_shape": scores_shape,
+        "seed": getattr(state, "seed", None),
+        "signature": signature,
+        "extra": extra or {},
+    }).encode("utf-8")
+    head_len = _PREFIX.size + len(header)
+    pad = (-head_len) % _ALIGN
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        f.write(b"\0" * pad)
+        f.write(input_ids.tobytes())
+        f.write(blob)
+    os.replace(tmp, path)
+    return path
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        magic, version, header_len = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != MAGIC:
+            raise StateFileError(f"{path} is not an AstroEdge state file")
+        if version != VERSION:
+            raise StateFileError(f"{path} has unsupported state version {version}")
+        return json.loads(f.read(header_len)), _PREFIX.size + header_len
+
+
+def load_state_file(path, signature=None):
+    """Read a state file back into a LlamaState sized for the model's n_ctx. Raises StateFileError on mismatch."""
+    from llama_cpp.llama import LlamaState
+    header, head_len = read_header(path)
+    if signature and header["signature"] != signature:
+        raise StateFileError(f"{path} was saved for {header['signature']}, not {signature}")
+    n_tokens, size = header["n_tokens"], header["llama_state_size"]
+    offset = head_len + (-head_len) % _ALIGN
+    # Llama.load_state keeps this array as-is and eval writes past n_tokens, so it must span the whole context
+    n_ctx = max(n_tokens, header["signature"].get("n_ctx") or 0)
+    input_ids = np.zeros(n_ctx, dtype=np.intc)
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        input_ids[:n_tokens] = np.frombuffer(mm, dtype=np.int32, count=n_tokens, offset=offset)
+        blob = mm[offset + 4 * n_tokens:offset + 4 * n_tokens + size]
+
+    scores = np.zeros(header["scores_shape"], dtype=np.single)  # zero pages, never touched
+    kwargs = dict(input_ids=input_ids, scores=scores, n_tokens=n_tokens,
+                  llama_state=blob, llama_state_size=size)
+    try:
+        state = LlamaState(seed=header.get("seed"), **kwargs)
+    except TypeError:  # older llama-cpp-python without the seed field
+        state = LlamaState(**kwargs)
+    return state, header.get("extra", {})
@@ -0,0 +1,225 @@
+"""
+ASTROEDGE MEMORY SENTINEL
+-------------------------
+✅ Periodic tracemalloc snapshots, diffed by allocation site (file:line) against the previous one
+✅ Size accounting for the known long-lived containers (metrics_log, chat_history, SystemHealth.history,
+   chat view index, trace ring…) – item count + deep size
+✅ RSS slope over a sliding window (least squares, MB/min); above the threshold it logs an alert with the
+   allocation sites (tracebacks) that grew the most over the window and the container sizes
+✅ Everything goes to logs/memory/sentinel.jsonl; on_alert lets the GUI surface it
+✅ Demo with an injected leak: python -m astroedge.memory_sentinel --demo
+"""
+
+import os, sys, json, time, datetime, threading, tracemalloc, statistics, argparse
+from collections import deque
+import psutil
+
+_IGNORE = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+           tracemalloc.Filter(False, "<unknown>"))
+
+
+def _items(o, retries=3):
+    """Snapshot a container's children; other threads may be appending to it while we walk."""
+    for _ in range(retries):
+        try:
+            return list(o.items()) if isinstance(o, dict) else list(o)
+        except RuntimeError:  # "deque/dict mutated during iteration" – try again
+            continue
+    return []
+
+
+def deep_size(obj, max_objects=200_000):
+    """Bytes held by a container tree: lists/tuples/sets/deques/dicts and their leaves (objects with a
+    __dict__ are counted shallowly, so a registered list never drags in the model or the GUI)."""
+    seen, stack, total = set(), [obj], 0
+    while stack and len(seen) < max_objects:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            for k, v in _items(o):
+                stack.append(k)
+                stack.append(v)
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            stack.extend(_items(o))
+    return total
+
+
+class MemorySentinel:
+    def __init__(self, interval_s=30.0, window=10, slope_mb_per_min=5.0, top=10, frames=5,
+                 log_path=os.path.join("logs", "memory", "sentinel.jsonl"), on_alert=None):
+        """window: RSS samples in the slope fit (window × interval = how long growth must persist)."""
+        self.interval_s = interval_s
+        self.window = window
+        self.slope_mb_per_min = slope_mb_per_min
+        self.top = top
+        self.frames = frames
+        self.log_path = log_path
+        self.on_alert = on_alert
+        self.structures = {}  # name -> container or callable() -> container
+        self.rss = deque(maxlen=window)  # (monotonic s, MB)
+        self.snapshots = deque(maxlen=window)  # snapshot per sample; [0] is the window baseline
+        self.last = None  # latest record
+        self.alerts = 0
+        self._quiet_until = 0  # samples to wait before the next alert
+        self._stop = threading.Event()
+        self._thread = None
+        self._owns_tracing = False  # only stop tracemalloc if start() turned it on
+        self._process = psutil.Process(os.getpid())
+
+    def track(self, name, container):
+        """Register a long-lived container (or a zero-arg callable returning one) for size accounting."""
+        self.structures[name] = container
+
+    def start(self):
+        if self._thread:
+            return self
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._owns_tracing = True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="memory-sentinel", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def _run(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"⚠️ Memory sentinel: {e}")
+            if self._stop.wait(self.interval_s):
+                return
+
+    #######################################################
+    # 🔹 One sample
+    #######################################################
+    def structure_sizes(self):
+        sizes = {}
+        for name, container in self.structures.items():
+            try:
+                obj = container() if callable(container) else container
+                sizes[name] = {"items": len(obj), "MB": round(deep_size(obj) / 2 ** 20, 3)}
+            except Exception as e:
+                sizes[name] = {"error": str(e)}
+        return sizes
+
+    def slope(self):
+        """RSS growth in MB/min over the window (None until the window is full)."""
+        if len(self.rss) < self.window:
+            return None
+        t0 = self.rss[0][0]
+        minutes = [(t - t0) / 60 for t, _ in self.rss]
+        return statistics.linear_regression(minutes, [mb for _, mb in self.rss]).slope
+
+    @staticmethod
+    def _sites(stats, top):
+        return [{"site": str(s.traceback[0]), "size_diff_KB": round(s.size_diff / 1024, 1),
+                 "count_diff": s.count_diff, "KB": round(s.size / 1024, 1)}
+                for s in stats[:top] if s.size_diff > 0]
+
+    def sample(self):
+        rss_mb = self._process.memory_info().rss / 2 ** 20
+        self.rss.append((time.monotonic(), rss_mb))
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORE) if tracemalloc.is_tracing() else None
+        record = {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "rss_MB": round(rss_mb, 2),
+            "traced_MB": round(tracemalloc.get_traced_memory()[0] / 2 ** 20, 2) if snapshot else None,
+            "slope_MB_per_min": None,
+            "structures": self.structure_sizes(),
+            "growth": [],
+        }
+        if snapshot and self.snapshots:
+            record["growth"] = self._sites(snapshot.compare_to(self.snapshots[-1], "lineno"), self.top)
+        if snapshot:
+            self.snapshots.append(snapshot)
+        slope = self.slope()
+        if slope is not None:
+            record["slope_MB_per_min"] = round(slope, 3)
+        self.last = record
+        self._write(record)
+
+        self._quiet_until = max(0, self._quiet_until - 1)
+        if slope is not None and slope > self.slope_mb_per_min and not self._quiet_until:
+            self._alert(record, snapshot)
+        return record
+
+    def _alert(self, record, snapshot):
+        # Who grew over the whole window, with call stacks – the per-sample diff above only shows the last step
+        culprits = []
+        if snapshot and len(self.snapshots) > 1:
+            for s in snapshot.compare_to(self.snapshots[0], "traceback")[:self.top]:
+                if s.size_diff > 0:
+                    culprits.append({"size_diff_KB": round(s.size_diff / 1024, 1), "count_diff": s.count_diff,
+                                     "traceback": [str(f) for f in s.traceback]})
+        span_min = (self.rss[-1][0] - self.rss[0][0]) / 60
+        alert = {"timestamp": record["timestamp"], "alert": "rss_growth",
+                 "slope_MB_per_min": record["slope_MB_per_min"], "window_min": round(span_min, 2),
+                 "rss_MB": record["rss_MB"], "structures": record["structures"], "culprits": culprits}
+        self.alerts += 1
+        self._quiet_until = self.window  # one alert per window of sustained growth
+        self._write(alert)
+        top = culprits[0]["traceback"][-1] if culprits else "no Python allocation site (native?)"
+        print(f"🚨 Memory growing {alert['slope_MB_per_min']} MB/min over {span_min:.1f} min "
+              f"(RSS {alert['rss_MB']} MB) – top site: {top}")
+        if self.on_alert:
+            self.on_alert(alert)
+
+    def _write(self, record):
+        if not self.log_path:
+            return
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def summary(self):
+        """One line for the GUI: RSS, slope and the biggest tracked containers."""
+        r = self.last
+        if not r:
+            return "memory sentinel: no samples yet"
+        sizes = sorted(((n, s) for n, s in r["structures"].items() if "MB" in s), key=lambda kv: -kv[1]["MB"])
+        parts = ", ".join(f"{n} {s['items']} items/{s['MB']:.1f} MB" for n, s in sizes[:4])
+        slope = "n/a" if r["slope_MB_per_min"] is None else f"{r['slope_MB_per_min']:+.2f} MB/min"
+        return f"RSS {r['rss_MB']} MB ({slope}); {parts}"
+
+
+#######################################################
+# 🔹 Demo: inject a leak and watch the sentinel catch it
+#######################################################
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Memory sentinel demo with an injected leak.")
+    ap.add_argument("--demo", action="store_true", help="run the leak demo (default)")
+    ap.add_argument("--seconds", type=float, default=12.0)
+    ap.add_argument("--interval", type=float, default=0.5)
+    ap.add_argument("--leak-mb-per-s", type=float, default=4.0)
+    ap.add_argument("--log", default=os.path.join("logs", "memory", "sentinel_demo.jsonl"))
+    args = ap.parse_args(argv)
+
+    history = []  # stands in for an unbounded chat_history / metrics_log
+    sentinel = MemorySentinel(interval_s=args.interval, window=8, slope_mb_per_min=10.0, log_path=args.log)
+    sentinel.track("history", history)
+    sentinel.start()
+    start = time.time()
+    while time.time() - start < args.seconds:
+        history.append({"role": "assistant", "content": "x" * int(args.leak_mb_per_s * 2 ** 20 / 10)})
+        time.sleep(0.1)
+    sentinel.stop()
+    print(f"\n{sentinel.summary()}")
+    print(f"{sentinel.alerts} alert(s) → {args.log}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+ASTROEDGE METRICS QUERY ENGINE
+------------------------------
+✅ Scans every metrics log (CSV / JSON / JSONL) in logs/ with one column schema
+✅ Filters by time range, mission mode and temperature while reading (predicate pushdown)
+✅ Group-by + aggregates (p50/p95/p99 latency, tokens/sec, RSS) computed with NumPy
+✅ Usable from the report scripts or from the command line
+
+    python -m astroedge.metrics_query logs --since 2025-07-27T00:00 --group-by temperature
+"""
+
+import os, sys, csv, json, re, argparse
+from datetime import datetime
+import numpy as np
+
+#######################################################
+# 🔹 Column schema (every script logs different names)
+#######################################################
+COLUMN_ALIASES = {
+    "timestamp": "timestamp",
+    "time": "timestamp",
+    "query": "query",
+    "response": "response",
+    "answer": "response",
+    "mode": "mode",
+    "mission_mode": "mode",
+    "temperature": "temperature",
+    "temperature_used": "temperature",
+    "latency_s": "latency_s",
+    "inference_time": "latency_s",
+    "inference_time_sec": "latency_s",
+    "tokens": "tokens",
+    "tokens_generated": "tokens",
+    "cpu_usage_%": "cpu_pct",
+    "cpu_usage_percent": "cpu_pct",
+    "memory_MB": "rss_MB",
+    "memory_usage_MB": "rss_MB",
+    "ram_usage_MB": "rss_MB",
+    "ram_usage_mb": "rss_MB",
+}
+NUMERIC_COLUMNS = ("timestamp", "temperature", "latency_s", "tokens", "cpu_pct", "rss_MB")
+TEXT_COLUMNS = ("mode", "query")
+METRIC_EXTENSIONS = (".csv", ".json", ".jsonl")
+
+# Files saved by the GUI / research scripts end in _YYYYmmdd_HHMMSS
+_FILE_STAMP = re.compile(r"_(\d{8}_\d{6})\.")
+
+
+def _to_epoch(value):
+    """ISO string / datetime / number -> epoch seconds (NaN if unknown)."""
+    if value is None or value == "":
+        return np.nan
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return np.nan
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _file_stamp(path):
+    match = _FILE_STAMP.search(os.path.basename(path))
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").timestamp()
+
+#######################################################
+# 🔹 Row readers
+#######################################################
+def _normalize(record):
+    return {COLUMN_ALIASES[k]: v for k, v in record.items() if k in COLUMN_ALIASES}
+
+
+def _iter_records(path):
+    """Yield normalized dict rows from one log file without loading it whole (CSV/JSONL)."""
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return
+            names = [COLUMN_ALIASES.get(h) for h in header]
+            for row in reader:
+                yield {n: v for n, v in zip(names, row) if n}
+    elif path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield _normalize(json.loads(line))
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = [data]
+        for record in data:
+            if isinstance(record, dict):
+                yield _normalize(record)
+
+
+def _safe_records(path):
+    try:
+        yield from _iter_records(path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Skipping unreadable metrics file {path}: {e}")
+
+#######################################################
+# 🔹 Columnar frame + aggregates
+#######################################################
+def _percentile(q):
+    def agg(cols, idx):
+        vals = cols["latency_s"][idx]
+        vals = vals[~np.isnan(vals)]
+        return float(np.percentile(vals, q)) if vals.size else np.nan
+    return agg
+
+
+def _nanmean(column):
+    def agg(cols, idx):
+        vals = cols[column][idx]
+        return float(np.nanmean(vals)) if np.any(~np.isnan(vals)) else np.nan
+    return agg
+
+
+def _nanmax(column):
+    def agg(cols, idx):
+        vals = cols[column][idx]
+        return float(np.nanmax(vals)) if np.any(~np.isnan(vals)) else np.nan
+    return agg
+
+
+def _tokens_per_sec(cols, idx):
+    tokens, latency = cols["tokens"][idx], cols["latency_s"][idx]
+    ok = ~np.isnan(tokens) & ~np.isnan(latency) & (latency > 0)
+    return float(tokens[ok].sum() / latency[ok].sum()) if np.any(ok) else np.nan
+
+
+AGGREGATES = {
+    "count": lambda cols, idx: int(idx.size),
+    "p50_latency": _percentile(50),
+    "p95_latency": _percentile(95),
+    "p99_latency": _percentile(99),
+    "mean_latency": _nanmean("latency_s"),
+    "tokens_per_sec": _tokens_per_sec,
+    "mean_rss": _nanmean("rss_MB"),
+    "max_rss": _nanmax("rss_MB"),
+    "mean_cpu": _nanmean("cpu_pct"),
+}
+DEFAULT_AGGS = ("count", "p50_latency", "p95_latency", "p99_latency", "tokens_per_sec", "mean_rss")
+
+
+class MetricsFrame:
+    """Column arrays for the rows that survived the scan filters."""
+    def __init__(self, columns):
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns["latency_s"])
+
+    def group_by(self, keys=(), aggs=DEFAULT_AGGS):
+        """Return one dict per group: the key values plus each requested aggregate."""
+        unknown = [a for a in aggs if a not in AGGREGATES] + [k for k in keys if k not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown aggregate/group column(s): {', '.join(unknown)}")
+        n = len(self)
+        if not keys:
+            groups = [((), np.arange(n))]
+        else:
+            # One integer code per key column, combined into a single group id
+            codes, uniques = [], []
+            for key in keys:
+                col = self.columns[key]
+                if col.dtype.kind == "f":
+                    col = np.where(np.isnan(col), np.inf, col)
+                u, inv = np.unique(col, return_inverse=True)
+                uniques.append(u)
+                codes.append(inv)
+            group_ids = np.ravel_multi_index(codes, [len(u) for u in uniques]) if n else np.array([], dtype=int)
+            order = np.argsort(group_ids, kind="stable")
+            sorted_ids = group_ids[order]
+            bounds = np.flatnonzero(np.diff(sorted_ids)) + 1
+            groups = []
+            for idx in np.split(order, bounds):
+                if not idx.size:
+                    continue
+                label = tuple(self._label(u[c[idx[0]]]) for u, c in zip(uniques, codes))
+                groups.append((label, idx))
+
+        rows = []
+        for label, idx in groups:
+            row = dict(zip(keys, label))
+            for name in aggs:
+                row[name] = AGGREGATES[name](self.columns, idx)
+            rows.append(row)
+        return rows
+
+    def summary(self, aggs=DEFAULT_AGGS):
+        return self.group_by((), aggs)[0]
+
+    @staticmethod
+    def _label(value):
+        if isinstance(value, np.floating):
+            return None if np.isinf(value) else float(value)
+        return value.item() if hasattr(value, "item") else value
+
+#######################################################
+# 🔹 Metrics store
+#######################################################
+class MetricsStore:
+    """Query layer over the metrics logs (or an in-memory metrics_log list)."""
+    def __init__(self, paths=("logs",)):
+        if isinstance(paths, str):
+            paths = [paths]
+        self.files = []
+        for path in paths:
+            if os.path.isdir(path):
+                self.files += sorted(os.path.join(path, f) for f in os.listdir(path)
+                                     if f.endswith(METRIC_EXTENSIONS))
+            elif os.path.exists(path):
+                self.files.append(path)
+        self._records = None
+
+    @classmethod
+    def from_records(cls, records):
+        store = cls(paths=[])
+        store._records = records
+        return store
+
+    def scan(self, since=None, until=None, mode=None, temperature=None):
+        """Read only the rows matching the filters into a MetricsFrame."""
+        since, until = _to_epoch(since), _to_epoch(until)
+        modes = {mode} if isinstance(mode, str) else set(mode or ())
+        temps = [temperature] if isinstance(temperature, (int, float)) else list(temperature or ())
+
+        def keep(row):
+            if modes and row.get("mode") not in modes:
+                return False
+            if temps:
+                t = _to_float(row.get("temperature"))
+                if not any(abs(t - want) < 1e-6 for want in temps):
+                    return False
+            if not (np.isnan(since) and np.isnan(until)):
+                ts = row["timestamp"]
+                if np.isnan(ts) or (not np.isnan(since) and ts < since) or (not np.isnan(until) and ts > until):
+                    return False
+            return True
+
+        columns = {name: [] for name in NUMERIC_COLUMNS + TEXT_COLUMNS}
+        for source, fallback_ts in self._sources(since):
+            for row in source:
+                row["timestamp"] = _to_epoch(row.get("timestamp"))
+                if np.isnan(row["timestamp"]) and fallback_ts is not None:
+                    row["timestamp"] = fallback_ts
+                if not keep(row):
+                    continue
+                if row.get("tokens") in (None, "") and row.get("response"):
+                    row["tokens"] = len(str(row["response"]).split())
+                for name in NUMERIC_COLUMNS:
+                    columns[name].append(row["timestamp"] if name == "timestamp" else _to_float(row.get(name)))
+                for name in TEXT_COLUMNS:
+                    columns[name].append(str(row.get(name) or ""))
+
+        arrays = {name: np.asarray(columns[name], dtype=np.float64) for name in NUMERIC_COLUMNS}
+        arrays.update({name: np.asarray(columns[name], dtype=str) for name in TEXT_COLUMNS})
+        return MetricsFrame(arrays)
+
+    def _sources(self, since):
+        if self._records is not None:
+            yield (_normalize(r) for r in self._records), None
+            return
+        for path in self.files:
+            stamp = _file_stamp(path)
+            # Logs are written at the end of a session, so a file stamped
+            # before `since` cannot contain anything newer – skip it unread.
+            if stamp is not None and not np.isnan(since) and stamp < since:
+                continue
+            yield _safe_records(path), stamp
+
+
+def query(paths=("logs",), since=None, until=None, mode=None, temperature=None,
+          group_by=(), aggs=DEFAULT_AGGS):
+    """One-call helper for reports: scan + group-by."""
+    return MetricsStore(paths).scan(since, until, mode, temperature).group_by(group_by, aggs)
+
+#######################################################
+# 🚀 CLI
+#######################################################
+def _format_table(rows):
+    if not rows:
+        return "(no matching rows)"
+    headers = list(rows[0].keys())
+    cells = [[("-" if v is None or (isinstance(v, float) and np.isnan(v)) else
+               f"{v:.3f}" if isinstance(v, float) else str(v)) for v in r.values()] for r in rows]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) for i, h in enumerate(headers)]
+    lines = ["  ".join(h.ljust(w) for h, w in zip(headers, widths))]
+    lines += ["  ".join(c.ljust(w) for c, w in zip(row, widths)) for row in cells]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query AstroEdge metrics logs.")
+    parser.add_argument("paths", nargs="*", default=["logs"], help="log files or directories")
+    parser.add_argument("--since", help="ISO timestamp lower bound")
+    parser.add_argument("--until", help="ISO timestamp upper bound")
+    parser.add_argument("--mode", action="append", help="mission mode (repeatable)")
+    parser.add_argument("--temperature", type=float, action="append", help="temperature (repeatable)")
+    parser.add_argument("--group-by", default="", help="comma separated: mode,temperature")
+    parser.add_argument("--agg", default=",".join(DEFAULT_AGGS),
+                        help=f"comma separated from: {', '.join(AGGREGATES)}")
+    parser.add_argument("--format", choices=["table", "json", "csv"], default="table")
+    args = parser.parse_args(argv)
+
+    keys = tuple(k for k in args.group_by.split(",") if k)
+    aggs = tuple(a for a in args.agg.split(",") if a)
+    rows = query(args.paths, args.since, args.until, args.mode, args.temperature, keys, aggs)
+
+    if args.format == "json":
+        clean = [{k: (None if isinstance(v, float) and np.isnan(v) else v) for k, v in r.items()} for r in rows]
+        print(json.dumps(clean, indent=2))
+    elif args.format == "csv":
+        if rows:
+            writer = csv.DictWriter(sys.stdout, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        print(_format_table(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+ASTROEDGE MISSION REPORT EXPORT
+-------------------------------
+✅ Parses + normalizes the logs ONCE into an intermediate representation (IR)
+✅ Renders PDF, DOCX, HTML and Markdown from that IR in parallel worker processes
+✅ Benchmark of total export time:  python -m astroedge.mission_report --bench
+"""
+
+import os, json, html, time, random, argparse, tempfile
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet
+from xml.sax.saxutils import escape
+from docx import Document
+
+#######################################################
+# 🔹 Intermediate representation
+#######################################################
+def normalize_log(log):
+    """One log dict -> IR record (plain strings only, safe to pickle/serialize)."""
+    return {
+        "query": str(log.get("query", "")),
+        "response": str(log.get("response", log.get("answer", ""))),
+        "objects": [str(o) for o in (log.get("objects") or [])],
+        "metrics": {str(k): str(v) for k, v in (log.get("metrics") or {}).items()},
+    }
+
+
+def write_ir(logs, path):
+    """Normalize every log once and stream the IR to a JSONL file the workers read."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for log in logs:
+            f.write(json.dumps(normalize_log(log), ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def read_ir(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+#######################################################
+# 🔹 Renderers (module level so worker processes can pickle them)
+#######################################################
+def render_pdf(ir_path, filename):
+    doc = SimpleDocTemplate(filename, pagesize=A4)
+    styles = getSampleStyleSheet()
+    story = []
+
+    story.append(Paragraph("<b>Mission Report</b>", styles["Title"]))
+    story.append(Spacer(1, 12))
+
+    for log in read_ir(ir_path):
+        story.append(Paragraph(f"<b>User:</b> {escape(log['query'])}", styles["Normal"]))
+        story.append(Paragraph(f"<b>Assistant:</b> {escape(log['response'])}", styles["Normal"]))
+        if log["objects"]:
+            story.append(Paragraph(f"<b>Detected Objects:</b> {escape(', '.join(log['objects']))}", styles["Normal"]))
+        if log["metrics"]:
+            metrics_str = ", ".join([f"{k}: {v}" for k, v in log["metrics"].items()])
+            story.append(Paragraph(f"<b>System Metrics:</b> {escape(metrics_str)}", styles["Normal"]))
+
+    doc.build(story)
+    return filename
+
+
+def render_docx(ir_path, filename):
+    doc = Document()
+    doc.add_heading("Mission Report", 0)
+
+    for log in read_ir(ir_path):
+        doc.add_heading("User Query", level=2)
+        doc.add_paragraph(log["query"])
+        doc.add_heading("Assistant Response", level=2)
+        doc.add_paragraph(log["response"])
+        if log["objects"]:
+            doc.add_heading("Detected Objects", level=2)
+            doc.add_paragraph(", ".join(log["objects"]))
+        if log["metrics"]:
+            doc.add_heading("System Metrics", level=2)
+            for k, v in log["metrics"].items():
+                doc.add_paragraph(f"{k}: {v}")
+
+    doc.save(filename)
+    return filename
+
+
+def render_html(ir_path, filename):
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("<!DOCTYPE html>\n<html><head><meta charset='utf-8'><title>Mission Report</title>"
+                "<style>body{font-family:sans-serif;max-width:900px;margin:auto}"
+                "section{border-bottom:1px solid #ccc;padding:8px 0}</style></head><body>\n"
+                "<h1>Mission Report</h1>\n")
+        for log in read_ir(ir_path):
+            f.write("<section>")
+            f.write(f"<p><b>User:</b> {html.escape(log['query'])}</p>")
+            f.write(f"<p><b>Assistant:</b> {html.escape(log['response'])}</p>")
+            if log["objects"]:
+                f.write(f"<p><b>Detected Objects:</b> {html.escape(', '.join(log['objects']))}</p>")
+            if log["metrics"]:
+                items = "".join(f"<li>{html.escape(k)}: {html.escape(v)}</li>" for k, v in log["metrics"].items())
+                f.write(f"<p><b>System Metrics:</b></p><ul>{items}</ul>")
+            f.write("</section>\n")
+        f.write("</body></html>\n")
+    return filename
+
+
+def render_markdown(ir_path, filename):
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("# Mission Report\n\n")
+        for log in read_ir(ir_path):
+            f.write(f"## User Query\n\n{log['query']}\n\n## Assistant Response\n\n{log['response']}\n\n")
+            if log["objects"]:
+                f.write(f"**Detected Objects:** {', '.join(log['objects'])}\n\n")
+            if log["metrics"]:
+                f.write("**System Metrics:**\n\n")
+                f.write("".join(f"- {k}: {v}\n" for k, v in log["metrics"].items()) + "\n")
+            f.write("---\n\n")
+    return filename
+
+
+RENDERERS = {
+    "pdf": render_pdf,
+    "docx": render_docx,
+    "html": render_html,
+    "md": render_markdown,
+}
+
+#######################################################
+# 🔹 Mission Report exporter
+#######################################################
+class MissionReport:
+    def __init__(self, save_dir="reports"):
+        self.save_dir = save_dir
+        os.makedirs(self.save_dir, exist_ok=True)
+
+    def _filename(self, ext, date_str=None):
+        date_str = date_str or datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        return os.path.join(self.save_dir, f"mission_report_{date_str}.{ext}")
+
+    def export(self, logs, formats=("pdf", "docx", "html", "md"), parallel=True):
+        """Export the logs to every requested format; returns {format: filename}."""
+        unknown = [f for f in formats if f not in RENDERERS]
+        if unknown:
+            raise ValueError(f"Unsupported report format(s): {', '.join(unknown)}")
+
+        date_str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        fd, ir_path = tempfile.mkstemp(prefix="mission_ir_", suffix=".jsonl", dir=self.save_dir)
+        os.close(fd)
+        try:
+            write_ir(logs, ir_path)
+            targets = {fmt: self._filename(fmt, date_str) for fmt in formats}
+            workers = min(len(formats), os.cpu_count() or 1)
+            if parallel and workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = {fmt: pool.submit(RENDERERS[fmt], ir_path, path) for fmt, path in targets.items()}
+                    return {fmt: fut.result() for fmt, fut in futures.items()}
+            return {fmt: RENDERERS[fmt](ir_path, path) for fmt, path in targets.items()}
+        finally:
+            os.remove(ir_path)
+
+    def export_pdf(self, logs):
+        return self.export(logs, ("pdf",))["pdf"]
+
+    def export_word(self, logs):
+        return self.export(logs, ("docx",))["docx"]
+
+#######################################################
+# 🔹 Export benchmark
+#######################################################
+def _synthetic_logs(n, seed=42):
+    rng = random.Random(seed)
+    objects = ["toolbox", "loose wire", "oxygen valve", "panel"]
+    for i in range(n):
+        yield {
+            "query": f"Stress test query #{i}: Describe step {i % 50} of spacewalk safety.",
+            "response": " ".join(rng.choice(["check", "valve", "pressure", "seal", "tether", "suit"])
+                                 for _ in range(rng.randint(40, 120))),
+            "objects": rng.sample(objects, rng.randint(0, 2)),
+            "metrics": {"inference_time": round(rng.uniform(5, 12), 2), "memory_MB": round(rng.uniform(900, 1400), 2)},
+        }
+
+
+def benchmark(sizes=(1000, 10000, 100000), formats=("pdf", "docx", "html", "md"), save_dir="reports/bench"):
+    reporter = MissionReport(save_dir)
+    results = []
+    for n in sizes:
+        logs = list(_synthetic_logs(n))
+        row = {"entries": n}
+        for label, parallel in (("serial_sec", False), ("parallel_sec", True)):
+            start = time.perf_counter()
+            files = reporter.export(logs, formats, parallel=parallel)
+            row[label] = round(time.perf_counter() - start, 3)
+            for path in files.values():
+                os.remove(path)
+        row["speedup"] = round(row["serial_sec"] / row["parallel_sec"], 2) if row["parallel_sec"] else None
+        print(f"📊 {n:>7} entries | serial {row['serial_sec']}s | parallel {row['parallel_sec']}s | x{row['speedup']}")
+        results.append(row)
+
+    os.makedirs("logs", exist_ok=True)
+    with open("logs/report_export_benchmark.json", "w", encoding="utf-8") as f:
+        json.dump({"formats": list(formats), "results": results}, f, indent=4)
+    print("✅ Benchmark saved to logs/report_export_benchmark.json")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mission report export / benchmark")
+    parser.add_argument("--bench", action="store_true", help="time export at several log sizes")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--formats", default="pdf,docx,html,md")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark(tuple(int(s) for s in args.sizes.split(",")), tuple(args.formats.split(",")))
+    else:
+        parser.print_help()
@@ -0,0 +1,222 @@
+"""
+ASTROEDGE QUANTIZATION LADDER
+-----------------------------
+✅ Discovers GGUF variants in models/ (Q2_K … Q8_0, plus larger models) and orders them into tiers
+✅ Picks a tier from available RAM (SystemHealth), the latency SLO and current CPU load
+✅ Drops to a lighter tier immediately under memory / thermal pressure, climbs back with hysteresis
+✅ Hot-swaps CoreAI's model without restarting the app – an upgrade loads beside the current model, so it
+   must fit next to it; a downgrade frees the current model first. Swaps never autotune
+✅ Quality-vs-latency benchmark per tier on the tcase query set:
+
+    python -m astroedge.model_ladder models/ [--fake]
+"""
+
+import os, re, json, time, argparse, threading
+
+QUANT_ORDER = ["Q2_K", "Q3_K_S", "Q3_K_M", "Q3_K_L", "Q4_0", "Q4_K_S", "Q4_K_M",
+               "Q5_0", "Q5_K_S", "Q5_K_M", "Q6_K", "Q8_0", "F16"]
+_QUANT = re.compile(r"(Q\d_K(?:_[SML])?|Q\d_\d|F16)", re.IGNORECASE)
+_PARAMS = re.compile(r"(\d+(?:\.\d+)?)b", re.IGNORECASE)
+TIER_BENCH_FILE = "logs/tier_benchmark.json"
+
+SEC_PER_GB = 12.0          # first guess of a 300-token turn per GB of weights, before measurements
+KV_MB_PER_CTX_PER_B = 0.04 # rough KV-cache MB per context token per billion parameters
+HEADROOM_MB = 512          # keep this much RAM free for the rest of the system
+HOT_CPU_PCT = 85           # above this, assume inference competes for cores
+HOT_TEMP_C = 80            # above this, treat the box as thermally constrained
+
+#######################################################
+# 🔹 Tiers
+#######################################################
+class ModelTier:
+    def __init__(self, path):
+        self.path = path
+        name = os.path.basename(path)
+        quant = _QUANT.search(name)
+        params = _PARAMS.search(name)
+        self.quant = quant.group(1).upper() if quant else "?"
+        self.params_b = float(params.group(1)) if params else 1.0
+        self.size_MB = os.path.getsize(path) / (1024 * 1024) if os.path.exists(path) else 0.0
+        self.est_turn_s = self.size_MB / 1024 * SEC_PER_GB
+        self.quality = None
+
+    @property
+    def rank(self):
+        q = QUANT_ORDER.index(self.quant) if self.quant in QUANT_ORDER else len(QUANT_ORDER) // 2
+        return (self.params_b, q)
+
+    def ram_needed_MB(self, n_ctx=2048):
+        return self.size_MB * 1.1 + n_ctx * self.params_b * KV_MB_PER_CTX_PER_B
+
+    def __repr__(self):
+        return f"<Tier {os.path.basename(self.path)} {self.size_MB:.0f}MB ~{self.est_turn_s:.1f}s>"
+
+
+def discover_tiers(models_dir):
+    paths = [os.path.join(models_dir, f) for f in os.listdir(models_dir) if f.lower().endswith(".gguf")]
+    tiers = sorted((ModelTier(p) for p in paths), key=lambda t: t.rank)
+    _apply_benchmarks(tiers)
+    return tiers
+
+
+def _apply_benchmarks(tiers, path=TIER_BENCH_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            measured = {r["model"]: r for r in json.load(f)["tiers"]}
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return
+    for tier in tiers:
+        row = measured.get(os.path.basename(tier.path))
+        if row:
+            tier.est_turn_s = row["p50_latency_s"]
+            tier.quality = row.get("quality_f1")
+
+#######################################################
+# 🔹 Tier manager
+#######################################################
+class TierManager:
+    """Chooses and hot-swaps the model tier behind a CoreAI instance."""
+    def __init__(self, tiers, loader, health=None, slo_s=10.0, n_ctx=2048, upgrade_after=3, swap_loader=None):
+        if not tiers:
+            raise ValueError("No GGUF tiers found for the model ladder.")
+        self.tiers = tiers
+        self.loader = loader            # loader(path) -> Llama
+        # Hot swaps must never autotune beside the live model (e.g. tuned_llama(..., tune=False))
+        self.swap_loader = swap_loader or loader
+        if health is None:
+            from .extras import SystemHealth  # extras pulls in reportlab – only load it when needed
+            health = SystemHealth()
+        self.health = health
+        self.slo_s = slo_s
+        self.n_ctx = n_ctx
+        self.upgrade_after = upgrade_after
+        self.current = None
+        self._upgrade_votes = 0
+        self._swapping = threading.Lock()
+
+    def choose(self, stats=None):
+        """Best tier for the current conditions (highest that fits RAM and meets the SLO)."""
+        stats = stats or self.health.get_stats()
+        free = stats.get("available_MB", 0) - HEADROOM_MB
+        held = self.current.ram_needed_MB(self.n_ctx) if self.current else 0.0
+
+        def fits(tier):
+            # Staying or downgrading frees the loaded tier first; an upgrade loads beside it
+            if self.current and tier.rank <= self.current.rank:
+                return tier.ram_needed_MB(self.n_ctx) - held <= free
+            return tier.ram_needed_MB(self.n_ctx) <= free
+
+        slowdown = 1.5 if stats.get("cpu", 0) > HOT_CPU_PCT else 1.0
+        candidates = [t for t in self.tiers if fits(t) and t.est_turn_s * slowdown <= self.slo_s]
+        if (stats.get("temp_C") or 0) > HOT_TEMP_C and self.current:
+            candidates = [t for t in candidates if t.rank < self.current.rank] or candidates[:1]
+        return candidates[-1] if candidates else self.tiers[0]
+
+    def initial(self):
+        self.current = self.choose()
+        print(f"🪜 Model tier: {self.current}")
+        return self.loader(self.current.path)
+
+    def observe(self, latency_s):
+        """Feed real turn latency back into the current tier's estimate (EWMA)."""
+        if self.current:
+            self.current.est_turn_s = 0.7 * self.current.est_turn_s + 0.3 * latency_s
+
+    def maybe_switch(self, ai):
+        """Called after each turn. Downgrades at once, upgrades after several agreeing checks."""
+        target = self.choose()
+        if target is self.current:
+            self._upgrade_votes = 0
+            return False
+        if target.rank > self.current.rank:
+            self._upgrade_votes += 1
+            if self._upgrade_votes < self.upgrade_after:
+                return False
+        self._upgrade_votes = 0
+        if not self._swapping.acquire(blocking=False):
+            return False
+        threading.Thread(target=self._swap, args=(ai, target), daemon=True).start()
+        return True
+
+    def _swap(self, ai, target):
+        try:
+            downgrade = target.rank < self.current.rank
+            if downgrade:
+                # Memory pressure: free the big model before loading the small one
+                with ai.llm_lock:
+                    ai.llm = None
+                    ai.llm = self.swap_loader(target.path)
+            else:
+                new_llm = self.swap_loader(target.path)  # load beside the old one, swap atomically
+                with ai.llm_lock:
+                    ai.llm = new_llm
+            print(f"🪜 Switched model tier {self.current} → {target}")
+            self.current = target
+        except Exception as e:
+            print(f"❌ Tier switch to {target} failed: {e}")
+            with ai.llm_lock:
+                if ai.llm is None:
+                    ai.llm = self.swap_loader(self.current.path)
+        finally:
+            self._swapping.release()
+
+#######################################################
+# 🔹 Quality vs latency benchmark
+#######################################################
+def _f1(answer, reference):
+    a, r = answer.lower().split(), reference.lower().split()
+    if not a or not r:
+        return 0.0
+    common = sum(min(a.count(w), r.count(w)) for w in set(a))
+    if not common:
+        return 0.0
+    precision, recall = common / len(a), common / len(r)
+    return 2 * precision * recall / (precision + recall)
+
+
+def benchmark_tiers(tiers, loader, queries=None, max_tokens=300):
+    """Latency per tier, and quality as unigram F1 against the largest tier's answers."""
+    from .bench_suite import BENCHMARK_QUERIES, BASE_PROMPT
+    queries = queries or BENCHMARK_QUERIES
+    answers, rows = {}, []
+    for tier in reversed(tiers):  # largest first: it is the quality reference
+        llm = loader(tier.path)
+        latencies, outs = [], []
+        for query in queries:
+            messages = [{"role": "system", "content": BASE_PROMPT}, {"role": "user", "content": query}]
+            start = time.perf_counter()
+            response = llm.create_chat_completion(messages=messages, max_tokens=max_tokens, temperature=0.0, seed=42)
+            latencies.append(time.perf_counter() - start)
+            outs.append(response["choices"][0]["message"]["content"])
+        del llm
+        answers[tier.path] = outs
+        reference = answers[tiers[-1].path]
+        latencies.sort()
+        rows.append({
+            "model": os.path.basename(tier.path), "quant": tier.quant, "size_MB": round(tier.size_MB, 1),
+            "p50_latency_s": round(latencies[len(latencies) // 2], 3),
+            "max_latency_s": round(latencies[-1], 3),
+            "quality_f1": round(sum(_f1(o, r) for o, r in zip(outs, reference)) / len(outs), 3),
+        })
+        print(f"🪜 {rows[-1]['model']:<45} p50 {rows[-1]['p50_latency_s']:>7}s | quality {rows[-1]['quality_f1']}")
+    rows.reverse()
+    os.makedirs(os.path.dirname(TIER_BENCH_FILE), exist_ok=True)
+    with open(TIER_BENCH_FILE, "w", encoding="utf-8") as f:
+        json.dump({"queries": len(queries), "tiers": rows}, f, indent=4)
+    print(f"✅ Tier benchmark saved to {TIER_BENCH_FILE}")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark quality vs latency per GGUF tier")
+    parser.add_argument("models_dir")
+    parser.add_argument("--fake", action="store_true", help="use FakeLlama (latency scaled by file size)")
+    args = parser.parse_args()
+
+    if args.fake:
+        from .fake_llama import FakeLlama
+        load = lambda path: FakeLlama(model_path=path, token_latency_s=0.0005 * max(1.0, os.path.getsize(path) / 2 ** 29))
+    else:
+        from .autotune import tuned_llama
+        load = lambda path: tuned_llama(path, n_ctx=2048)
+    benchmark_tiers(discover_tiers(args.models_dir), load)
@@ -0,0 +1,77 @@
+"""
+ASTROEDGE SYSTEM PROMPT STATE CACHE
+-----------------------------------
+✅ Evaluates each (mission mode, personality) system prompt once and snapshots the KV state
+✅ change_mode / change_personality restore the snapshot instead of re-evaluating the prompt
+✅ llama.cpp's prefix matching then reuses those tokens for the next query
+
+Build every snapshot at install time:
+    python -m astroedge.prompt_cache path/to/tinyllama.gguf
+"""
+
+import os, time, hashlib, argparse
+from .llm_state import save_state_file, load_state_file, model_signature, StateFileError
+
+MODES = ["General Assistance", "Repairs", "Navigation", "Stress Management", "Mission Commander", "Mentor Mode"]
+PERSONALITIES = ["Neutral", "Humorous", "Strict NASA Protocol", "Friendly"]
+BASE_PROMPT = (
+    "You are AstroEdge AI, an expert astronaut assistant. "
+    "Always provide clear, step-by-step instructions for space operations. "
+    "Use a calm, reassuring tone, and adapt style based on personality mode."
+)
+
+
+def build_system_prompt(base_prompt, mode, personality):
+    return f"{base_prompt} Current mission mode: {mode}. Personality: {personality}."
+
+
+class PromptStateCache:
+    def __init__(self, llm, base_prompt=BASE_PROMPT, cache_dir="models/prompt_cache"):
+        self.llm = llm
+        self.base_prompt = base_prompt
+        self.cache_dir = cache_dir
+        self.signature = model_signature(llm)
+
+    def path_for(self, mode, personality):
+        text = build_system_prompt(self.base_prompt, mode, personality)
+        key = hashlib.sha1(f"{self.signature}|{text}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"sys_{key}.aekv")
+
+    def build(self, mode, personality):
+        """Evaluate the system prompt (plus a 1-token turn) and snapshot it to disk."""
+        system = build_system_prompt(self.base_prompt, mode, personality)
+        self.llm.reset()
+        self.llm.create_chat_completion(messages=[{"role": "system", "content": system},
+                                                 {"role": "user", "content": "."}], max_tokens=1)
+        return save_state_file(self.path_for(mode, personality), self.llm.save_state(), self.signature,
+                               {"mode": mode, "personality": personality})
+
+    def build_all(self, modes=MODES, personalities=PERSONALITIES):
+        for mode in modes:
+            for personality in personalities:
+                start = time.perf_counter()
+                self.build(mode, personality)
+                print(f"🧊 {mode} / {personality}: {time.perf_counter() - start:.2f}s")
+
+    def restore(self, mode, personality):
+        """Load the snapshot for this mode/personality into the model; returns ms spent."""
+        path = self.path_for(mode, personality)
+        start = time.perf_counter()
+        try:
+            state, _ = load_state_file(path, self.signature)
+            self.llm.load_state(state)
+        except (FileNotFoundError, StateFileError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"⚠️ Rebuilding prompt snapshot: {e}")
+            self.build(mode, personality)  # first use of this combination: evaluate once, reuse afterwards
+        return round((time.perf_counter() - start) * 1000, 2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute system prompt KV snapshots")
+    parser.add_argument("model")
+    parser.add_argument("--cache-dir", default="models/prompt_cache")
+    args = parser.parse_args()
+    from .autotune import tuned_llama
+    PromptStateCache(tuned_llama(args.model, n_ctx=2048), cache_dir=args.cache_dir).build_all()
+    print("✅ Prompt snapshots ready.")
@@ -0,0 +1,180 @@
+"""
+ASTROEDGE ASYNC RUNTIME
+-----------------------
+✅ One asyncio event loop (own thread) owns all concurrency: LLM, STT, TTS, vision, telemetry
+✅ Blocking native calls run on small, sized executors (one llama.cpp worker, one audio worker…)
+✅ Structured cancellation: barge_in() stops generation at the next token and cuts off speech
+✅ Per-service timeouts and a graceful shutdown that cancels tasks and drains executors
+✅ GUIs are just clients: every call returns a concurrent.futures.Future, events go to listeners
+"""
+
+import asyncio, threading, functools, os, psutil
+from concurrent.futures import ThreadPoolExecutor
+from .tracing import tracer
+
+
+class AssistantRuntime:
+    def __init__(self, ai, voice=None, stt=None, vision=None, health=None,
+                 llm_timeout_s=180.0, stt_timeout_s=20.0, vision_timeout_s=10.0, telemetry_interval_s=1.0):
+        self.ai, self.voice, self.stt, self.vision, self.health = ai, voice, stt, vision, health
+        self.llm_timeout_s = llm_timeout_s
+        self.stt_timeout_s = stt_timeout_s
+        self.vision_timeout_s = vision_timeout_s
+        self.telemetry_interval_s = telemetry_interval_s
+        # llama.cpp already uses every core – one generation at a time; audio/vision get their own lanes
+        self.pools = {
+            "llm": ThreadPoolExecutor(1, thread_name_prefix="llm"),
+            "audio": ThreadPoolExecutor(1, thread_name_prefix="stt"),
+            "vision": ThreadPoolExecutor(1, thread_name_prefix="vision"),
+            "telemetry": ThreadPoolExecutor(1, thread_name_prefix="telemetry"),
+        }
+        self.listeners = {}
+        self.loop = None
+        self._thread = None
+        self._tasks = set()
+        self._generations = set()  # cancel events of in-flight LLM calls
+
+    #######################################################
+    # 🔹 Lifecycle
+    #######################################################
+    def start(self):
+        ready = threading.Event()
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self.loop.call_soon(ready.set)
+            if self.health:
+                self._spawn(self._telemetry())
+            self.loop.run_forever()
+            self.loop.close()
+
+        self._thread = threading.Thread(target=run, name="astroedge-runtime", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def shutdown(self, timeout=5.0):
+        """Cancel every task, stop generation and speech, then drain the executors."""
+        if not self.loop or not self.loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result(timeout)
+        except Exception as e:
+            print(f"⚠️ Runtime shutdown: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        for pool in self.pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _shutdown(self):
+        self._interrupt()
+        tasks = [t for t in self._tasks if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    #######################################################
+    # 🔹 Client API (thread-safe, returns concurrent Futures)
+    #######################################################
+    def on(self, event, callback):
+        """callback(payload) runs on the runtime thread – GUIs should hand it to their UI bus."""
+        self.listeners.setdefault(event, []).append(callback)
+
+    def ask(self, query, trace=None):
+        """trace: parent span for the work (defaults to the caller's current span / active interaction)."""
+        return self._submit(self._ask(query, trace or tracer.current()))
+
+    def listen(self, trace=None):
+        return self._submit(self._listen(trace or tracer.current()))
+
+    def detect(self):
+        return self._submit(self._detect())
+
+    def speak(self, text, cached=False):
+        if self.voice:
+            self.voice.speak(text, cached=cached)
+
+    def barge_in(self):
+        """User started talking: stop current generation and speech right away."""
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._interrupt)
+
+    #######################################################
+    # 🔹 Services
+    #######################################################
+    async def _ask(self, query, trace=None):
+        cancel = threading.Event()
+        self._generations.add(cancel)
+        try:
+            call = functools.partial(self._traced, trace, self.ai.ask, query, cancel=cancel)
+            answer, elapsed, mem = await asyncio.wait_for(self._offload("llm", call), self.llm_timeout_s)
+            if cancel.is_set():
+                raise asyncio.CancelledError()
+            self._emit("answer", {"query": query, "answer": answer, "elapsed": elapsed, "mem": mem})
+            return answer, elapsed, mem
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            cancel.set()  # the worker thread stops at the next token
+            raise
+        finally:
+            self._generations.discard(cancel)
+
+    async def _listen(self, trace=None):
+        call = functools.partial(self._traced, trace, self.stt.listen)
+        text = await asyncio.wait_for(self._offload("audio", call), self.stt_timeout_s)
+        self._emit("heard", text)
+        return text
+
+    async def _detect(self):
+        detection = await asyncio.wait_for(self._offload("vision", self.vision.detect), self.vision_timeout_s)
+        self._emit("detection", detection)
+        return detection
+
+    async def _telemetry(self):
+        process = psutil.Process(os.getpid())
+        while True:
+            stats = await self._offload("telemetry", self.health.get_stats)
+            stats["rss_MB"] = round(process.memory_info().rss / (1024 * 1024), 2)
+            self._emit("telemetry", stats)
+            await asyncio.sleep(self.telemetry_interval_s)
+
+    #######################################################
+    # 🔹 Internals
+    #######################################################
+    def _interrupt(self):
+        for cancel in list(self._generations):
+            cancel.set()
+        if self.voice:
+            self.voice.stop()
+        self._emit("interrupted", None)
+
+    def _offload(self, pool, fn, *args):
+        return self.loop.run_in_executor(self.pools[pool], fn, *args)
+
+    @staticmethod
+    def _traced(parent, fn, *args, **kwargs):
+        # Executor threads don't inherit the caller's span – re-attach it so the worker's spans nest under it
+        with tracer.attach(parent):
+            return fn(*args, **kwargs)
+
+    def _spawn(self, coro):
+        task = self.loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _submit(self, coro):
+        if not self.loop:
+            raise RuntimeError("AssistantRuntime.start() has not been called")
+
+        async def tracked():
+            return await self._spawn(coro)
+
+        return asyncio.run_coroutine_threadsafe(tracked(), self.loop)
+
+    def _emit(self, event, payload):
+        for callback in self.listeners.get(event, []):
+            try:
+                callback(payload)
+            except Exception as e:
+                print(f"⚠️ Runtime listener for {event} failed: {e}")
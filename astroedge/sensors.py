@@ -0,0 +1,291 @@
+"""
+ASTROEDGE SENSOR INGESTION
+--------------------------
+✅ IMU (gyro pitch/yaw/roll rates) and biometric (ECG, respiration, EDA) streams at 1 kHz per channel
+✅ Sources are simulated generators or replayed .npy/.csv recordings – both emit whole blocks of samples
+✅ One reader thread writes blocks into fixed-size NumPy ring buffers (no per-sample Python work)
+✅ Vectorized window features: mean, variance, jerk, spectral band power, heart/breathing rate
+✅ CoreAI gets a one-line summary instead of raw values
+✅ Load test: python -m astroedge.sensors --rate 1000 --seconds 10   (target < 5% of one core)
+"""
+
+import time, threading, argparse
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-size (capacity, channels) float32 ring; writes and window reads are slice copies."""
+
+    def __init__(self, channels, capacity):
+        self.data = np.zeros((capacity, channels), dtype=np.float32)
+        self.capacity = capacity
+        self.head = 0     # next write row
+        self.count = 0    # total samples ever written
+        self._lock = threading.Lock()
+
+    def extend(self, block):
+        block = block[-self.capacity:]
+        n = len(block)
+        with self._lock:
+            end = self.head + n
+            if end <= self.capacity:
+                self.data[self.head:end] = block
+            else:
+                split = self.capacity - self.head
+                self.data[self.head:] = block[:split]
+                self.data[:n - split] = block[split:]
+            self.head = end % self.capacity
+            self.count += n
+
+    def window(self, n):
+        """Copy of the newest n samples, oldest first."""
+        with self._lock:
+            n = min(n, self.count, self.capacity)
+            start = self.head - n
+            if start >= 0:
+                return self.data[start:self.head].copy()
+            return np.concatenate((self.data[start:], self.data[:self.head]))
+
+
+#######################################################
+# 🔹 Sources – read(n) returns an (n, channels) block
+#######################################################
+class SimulatedIMU:
+    """Gyroscope rates in °/s: slow body sway, sensor noise and the odd bump (a handrail grab)."""
+    name = "imu"
+    channels = ("pitch", "yaw", "roll")
+
+    def __init__(self, rate_hz=1000, seed=None):
+        self.rate_hz = rate_hz
+        self.rng = np.random.default_rng(seed)
+        self.t = 0
+
+    def read(self, n):
+        t = (self.t + np.arange(n)) / self.rate_hz
+        self.t += n
+        sway = np.stack([3 * np.sin(2 * np.pi * f * t + p) for f, p in ((0.2, 0), (0.13, 1), (0.31, 2))], axis=1)
+        block = sway + self.rng.normal(0, 0.4, (n, 3))
+        if self.rng.random() < n / self.rate_hz * 0.05:  # ~one bump every 20 s
+            at = self.rng.integers(n)
+            block[at:at + 50] += self.rng.normal(0, 25, 3)
+        return block
+
+
+class SimulatedBiometrics:
+    """ECG-like pulse train, respiration belt and electrodermal activity; `stress` raises HR, breathing and EDA."""
+    name = "bio"
+    channels = ("ecg", "resp", "eda")
+
+    def __init__(self, rate_hz=1000, seed=None, stress=0.0):
+        self.rate_hz = rate_hz
+        self.rng = np.random.default_rng(seed)
+        self.stress = stress
+        self.t = 0
+
+    def read(self, n):
+        t = (self.t + np.arange(n)) / self.rate_hz
+        self.t += n
+        hr_hz = (68 + 40 * self.stress) / 60
+        br_hz = (13 + 10 * self.stress) / 60
+        phase = (t * hr_hz) % 1.0
+        ecg = np.exp(-((phase - 0.5) / 0.012) ** 2) + 0.15 * np.exp(-((phase - 0.75) / 0.05) ** 2)
+        resp = np.sin(2 * np.pi * br_hz * t)
+        eda = 2 + 6 * self.stress + 0.05 * np.sin(2 * np.pi * 0.01 * t)
+        noise = self.rng.normal(0, 0.02, (n, 3))
+        return np.stack([ecg, resp, eda], axis=1) + noise
+
+
+class ReplaySource:
+    """Loops over a recorded (samples, channels) array from .npy or .csv (header row = channel names)."""
+
+    def __init__(self, path, name, rate_hz=1000, channels=None):
+        if str(path).endswith(".npy"):
+            self.samples = np.load(path).astype(np.float32)
+        else:
+            with open(path, encoding="utf-8") as f:
+                header = f.readline().strip().split(",")
+            self.samples = np.loadtxt(path, delimiter=",", skiprows=1, dtype=np.float32, ndmin=2)
+            channels = channels or tuple(header)
+        self.name = name
+        self.rate_hz = rate_hz
+        self.channels = tuple(channels or (f"ch{i}" for i in range(self.samples.shape[1])))
+        self.pos = 0
+
+    def read(self, n):
+        idx = (self.pos + np.arange(n)) % len(self.samples)
+        self.pos = (self.pos + n) % len(self.samples)
+        return self.samples[idx]
+
+
+#######################################################
+# 🔹 Window features (all vectorized over the window)
+#######################################################
+def band_power(x, rate_hz, bands):
+    """Mean power per channel in each (lo, hi) Hz band from one rFFT of the detrended window."""
+    spectrum = np.abs(np.fft.rfft(x - x.mean(axis=0), axis=0)) ** 2 / len(x)
+    freqs = np.fft.rfftfreq(len(x), 1 / rate_hz)
+    return {f"{lo:g}-{hi:g}Hz": spectrum[(freqs >= lo) & (freqs < hi)].mean(axis=0) for lo, hi in bands}
+
+
+def decimate(x, factor):
+    """Block-average by `factor` along time (cheap low-pass + downsample); drops the oldest remainder."""
+    n = len(x) // factor * factor
+    return x[len(x) - n:].reshape(-1, factor, *x.shape[1:]).mean(axis=1)
+
+
+def crossing_rate(x, rate_hz, level):
+    """Events per minute from upward crossings of `level`, timed first-to-last edge (beats, breaths)."""
+    above = x > level
+    edges = np.flatnonzero(~above[:-1] & above[1:])
+    if len(edges) < 2:
+        return 0.0
+    return (len(edges) - 1) / ((edges[-1] - edges[0]) / rate_hz) * 60
+
+
+def window_features(x, rate_hz, bands=((0, 1), (1, 5), (5, 20)), jerk_hz=25):
+    """mean / variance per channel, RMS jerk (d²/dt² of the signal band-limited to `jerk_hz`), band power."""
+    factor = max(1, int(rate_hz // jerk_hz))
+    smooth, fs = decimate(x, factor), rate_hz / factor
+    jerk = np.diff(smooth, n=2, axis=0) * fs ** 2 if len(smooth) > 2 else np.zeros((1, x.shape[1]))
+    return {
+        "mean": x.mean(axis=0),
+        "var": x.var(axis=0),
+        "jerk_rms": np.sqrt((jerk ** 2).mean(axis=0)),
+        "band_power": band_power(x, rate_hz, bands),
+    }
+
+
+#######################################################
+# 🔹 Hub – one reader thread, one ring per source
+#######################################################
+class SensorHub:
+    def __init__(self, sources, buffer_s=20.0, block_ms=20):
+        self.sources = {s.name: s for s in sources}
+        self.rings = {s.name: RingBuffer(len(s.channels), int(s.rate_hz * buffer_s)) for s in sources}
+        self.block_s = block_ms / 1000
+        self.running = False
+        self._thread = None
+        self.cpu_s = 0.0  # reader thread CPU time, for the load test
+
+    @classmethod
+    def simulated(cls, rate_hz=1000, stress=0.0, **kwargs):
+        return cls([SimulatedIMU(rate_hz), SimulatedBiometrics(rate_hz, stress=stress)], **kwargs)
+
+    def start(self):
+        if not self.running:
+            self.running = True
+            self._thread = threading.Thread(target=self._run, name="sensors", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self._thread:
+            self._thread.join(1.0)
+
+    def _run(self):
+        # Sample counts follow the wall clock, so a late wake-up reads a bigger block instead of drifting
+        started = time.perf_counter()
+        read = {name: 0 for name in self.sources}
+        cpu0 = time.thread_time()
+        while self.running:
+            elapsed = time.perf_counter() - started
+            for name, source in self.sources.items():
+                due = int(elapsed * source.rate_hz) - read[name]
+                if due > 0:
+                    self.rings[name].extend(source.read(due))
+                    read[name] += due
+            self.cpu_s = time.thread_time() - cpu0
+            time.sleep(self.block_s)
+
+    def features(self, name, window_s=2.0):
+        source = self.sources[name]
+        return window_features(self.rings[name].window(int(window_s * source.rate_hz)), source.rate_hz)
+
+    def gyroscope(self, window_s=0.5):
+        """Mean pitch/yaw/roll rate over the last window (what MockSensors.get_gyroscope returned)."""
+        mean = self.features("imu", window_s)["mean"]
+        return {c: round(float(v), 2) for c, v in zip(SimulatedIMU.channels, mean)}
+
+    def vitals(self, window_s=15.0):
+        """Heart rate, breathing rate and EDA level from the biometric ring."""
+        rate = self.sources["bio"].rate_hz
+        x = self.rings["bio"].window(int(window_s * rate))
+        if len(x) < rate * 4:
+            return None
+        ecg = x[:, 0]
+        resp = decimate(x[:, 1], max(1, int(rate // 50)))  # smooth so noise can't double-count a breath
+        # None until the window holds two full beats / breaths
+        return {
+            "hr_bpm": round(crossing_rate(ecg, rate, ecg.mean() + 0.5 * (ecg.max() - ecg.mean()))) or None,
+            "br_pm": round(crossing_rate(resp, rate / max(1, int(rate // 50)), resp.mean())) or None,
+            "eda_uS": round(float(x[:, 2].mean()), 1),
+        }
+
+    def emotion(self, vitals=None):
+        """calm / neutral / stressed from vitals (replaces MockSensors.detect_emotion)."""
+        v = vitals or self.vitals()
+        if not v:
+            return "unknown"
+        score = ((v["hr_bpm"] or 0) > 95) + ((v["br_pm"] or 0) > 20) + (v["eda_uS"] > 5)
+        return ("calm", "neutral", "stressed", "stressed")[score]
+
+    def snapshot(self):
+        """Current state as flat scalars (imu, motion, jerk, hr, br, eda, emo) – what ContextInjector diffs."""
+        snap = {}
+        if "imu" in self.rings and self.rings["imu"].count:
+            f = self.features("imu", 2.0)
+            motion = float(np.sqrt(f["var"].sum()))
+            snap["imu"] = "stable" if motion < 5 else "moving" if motion < 15 else "tumbling"
+            snap["motion"] = round(motion, 1)
+            snap["jerk"] = round(float(f["jerk_rms"].max()))
+        if "bio" in self.rings:
+            v = self.vitals()
+            if v:
+                snap.update(hr=v["hr_bpm"], br=v["br_pm"], eda=v["eda_uS"], emo=self.emotion(v))
+        return snap
+
+    def summary(self):
+        """Compact one-liner for the LLM prompt, e.g. 'IMU stable 0.6°/s, jerk 410; HR 71 BR 13 EDA 2.0 → calm'."""
+        s = self.snapshot()
+        parts = []
+        if "imu" in s:
+            parts.append(f"IMU {s['imu']} {s['motion']:.1f}°/s, jerk {s['jerk']}")
+        if "hr" in s:
+            parts.append(f"HR {s['hr'] or '–'} BR {s['br'] or '–'} EDA {s['eda']} → {s['emo']}")
+        return "; ".join(parts) or "sensors warming up"
+
+
+#######################################################
+# 🔹 Load test
+#######################################################
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Sensor ingestion load test (simulated IMU + biometrics).")
+    ap.add_argument("--rate", type=int, default=1000, help="samples/s per channel")
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--stress", type=float, default=0.0, help="0 = calm … 1 = stressed biometrics")
+    ap.add_argument("--summary-hz", type=float, default=1.0, help="how often to compute the prompt summary")
+    ap.add_argument("--budget-pct", type=float, default=5.0, help="fail above this %% of one core")
+    args = ap.parse_args(argv)
+
+    hub = SensorHub.simulated(args.rate, stress=args.stress).start()
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    while time.perf_counter() - wall0 < args.seconds:
+        time.sleep(1 / args.summary_hz)
+        print(f"  {hub.summary()}")
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+    hub.stop()
+
+    pct = cpu / wall * 100
+    print()
+    for name, source in hub.sources.items():
+        print(f"{name}: {hub.rings[name].count / wall:,.0f} samples/s on each of {', '.join(source.channels)}")
+    print(f"Reader thread {hub.cpu_s / wall * 100:.2f}% · whole process {pct:.2f}% of one core "
+          f"(budget {args.budget_pct:g}%)")
+    if pct > args.budget_pct:
+        raise SystemExit("❌ over budget")
+    print("✅ within budget")
+
+
+if __name__ == "__main__":
+    main()
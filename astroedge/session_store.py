@@ -0,0 +1,77 @@
+"""
+ASTROEDGE SESSION CHECKPOINTS
+-----------------------------
+✅ After every turn the llama.cpp session (KV cache + token list) is snapshotted in memory
+   and written to disk on a background thread – the chat never waits on the disk
+✅ Only the newest pending snapshot is written; older ones are dropped if the disk is slow
+✅ On startup the context is mapped back in and the chat history restored, so the next
+   query reuses the whole conversation prefix instead of re-evaluating it
+✅ Uses the versioned llm_state format; KV state from another model / n_ctx (e.g. after a tier
+   switch) is discarded but the chat history is kept
+✅ Backends without save_state/load_state (FakeLlama) checkpoint the chat history only
+"""
+
+import os, threading
+from .llm_state import save_state_file, load_state_file, read_header, model_signature, StateFileError
+
+DEFAULT_PATH = os.path.join("logs", "session", "last_session.aekv")
+
+
+class SessionCheckpointer:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._pending = None
+        self._cond = threading.Condition()
+        self._io = threading.Lock()
+        self._writer = threading.Thread(target=self._run, name="session-writer", daemon=True)
+        self._writer.start()
+
+    def checkpoint(self, llm, extra):
+        """Snapshot llm state now (caller holds the llm lock) and queue it for writing."""
+        state = llm.save_state() if hasattr(llm, "save_state") else None
+        snapshot = (state, model_signature(llm), extra)
+        with self._cond:
+            self._pending = snapshot
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                state, signature, extra = self._pending
+                self._pending = None
+            with self._io:
+                try:
+                    save_state_file(self.path, state, signature, extra)
+                except OSError as e:
+                    print(f"⚠️ Session checkpoint failed: {e}")
+
+    def resume(self, llm):
+        """Load the last checkpoint into llm. Returns its extra dict, or None if unusable.
+
+        A checkpoint written by another model keeps its extra dict (chat history); only the KV state is
+        dropped, so the next turn re-evaluates the conversation on the current model."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            header, _ = read_header(self.path)
+            signature = model_signature(llm)
+            if header["signature"] != signature:
+                print(f"⚠️ Session KV state is from {header['signature'].get('model')}; keeping the chat history only")
+                return header.get("extra", {})
+            if not header["n_tokens"] or not hasattr(llm, "load_state"):
+                return header.get("extra", {})
+            state, extra = load_state_file(self.path, signature)
+            llm.load_state(state)
+            return extra
+        except (StateFileError, OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Ignoring session checkpoint: {e}")
+            return None
+
+    def clear(self):
+        with self._cond:
+            self._pending = None
+        with self._io:  # wait out an in-flight write so it cannot recreate the file
+            if os.path.exists(self.path):
+                os.remove(self.path)
@@ -0,0 +1,164 @@
+"""
+ASTROEDGE SPECULATIVE DECODING
+------------------------------
+✅ Prompt-lookup decoding: draft tokens copied from n-gram matches in the prompt
+   (system prompt + chat history) and optional reference manuals
+✅ Small draft model: a tiny GGUF proposes tokens, TinyLlama verifies them in one batch
+✅ Acceptance rate + tokens/sec uplift on the benchmark queries:
+
+    python -m astroedge.speculative path/to/tinyllama.gguf                       # prompt lookup
+    python -m astroedge.speculative path/to/tinyllama.gguf --draft path/to/draft.gguf
+"""
+
+import os, json, time, argparse
+import numpy as np
+
+#######################################################
+# 🔹 Draft sources
+# Plain classes registered as LlamaDraftModel subclasses in make_draft(): core imports this
+# module, and llama_cpp must only load once a model does
+#######################################################
+class ManualLookupDecoding:
+    """Prompt-lookup decoding that also searches reference texts (repair manuals, checklists)."""
+    def __init__(self, max_ngram_size=3, num_pred_tokens=10, reference_tokens=None):
+        self.max_ngram_size = max_ngram_size
+        self.num_pred_tokens = num_pred_tokens
+        self.reference = np.asarray([] if reference_tokens is None else reference_tokens, dtype=np.intc)
+
+    def add_reference(self, tokens):
+        self.reference = np.concatenate((self.reference, np.asarray(tokens, dtype=np.intc)))
+
+    @staticmethod
+    def _lookup(haystack, ngram, num_pred_tokens, exclude_tail):
+        size = len(ngram)
+        limit = len(haystack) - size - exclude_tail
+        if limit <= 0:
+            return None
+        windows = np.lib.stride_tricks.sliding_window_view(haystack[:limit + size], size)[:limit]
+        hits = np.flatnonzero(np.all(windows == ngram, axis=1))
+        if not hits.size:
+            return None
+        start = hits[-1] + size  # most recent match predicts best
+        return haystack[start:start + num_pred_tokens]
+
+    def __call__(self, input_ids, /, **kwargs):
+        input_ids = np.asarray(input_ids, dtype=np.intc)
+        for size in range(min(self.max_ngram_size, len(input_ids)), 0, -1):
+            ngram = input_ids[-size:]
+            found = self._lookup(input_ids, ngram, self.num_pred_tokens, exclude_tail=1)
+            if found is None and self.reference.size:
+                found = self._lookup(self.reference, ngram, self.num_pred_tokens, exclude_tail=0)
+            if found is not None and len(found):
+                return found.astype(np.intc)
+        return np.array([], dtype=np.intc)
+
+
+class SmallModelDraft:
+    """Greedy proposals from a tiny draft GGUF (shares TinyLlama's tokenizer/vocab)."""
+    def __init__(self, draft_llm, num_pred_tokens=6):
+        self.draft = draft_llm
+        self.num_pred_tokens = num_pred_tokens
+
+    def __call__(self, input_ids, /, **kwargs):
+        proposed = []
+        # generate() reuses the draft's KV cache for the shared prefix
+        for token in self.draft.generate(list(input_ids), temp=0.0, reset=True):
+            proposed.append(token)
+            if len(proposed) >= self.num_pred_tokens:
+                break
+        return np.asarray(proposed, dtype=np.intc)
+
+
+class CountingDraft:
+    """Wraps a draft source and counts verification steps / proposed tokens."""
+    def __init__(self, inner):
+        self.inner = inner
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.steps = 0
+        self.proposed = 0
+
+    def __call__(self, input_ids, /, **kwargs):
+        out = self.inner(input_ids, **kwargs)
+        self.steps += 1
+        self.proposed += len(out)
+        return out
+
+    def acceptance_rate(self, generated_tokens):
+        """Each verify step yields its accepted drafts + one sampled token."""
+        accepted = max(0, generated_tokens - self.steps)
+        return accepted / self.proposed if self.proposed else 0.0
+
+
+def make_draft(mode="prompt_lookup", draft_model_path=None, num_pred_tokens=10, reference_tokens=None):
+    """Draft model for Llama(draft_model=...); None when speculative decoding is off."""
+    if not mode:
+        return None
+    from llama_cpp.llama_speculative import LlamaDraftModel
+    for cls in (ManualLookupDecoding, SmallModelDraft, CountingDraft):
+        LlamaDraftModel.register(cls)
+    if mode == "prompt_lookup":
+        return CountingDraft(ManualLookupDecoding(num_pred_tokens=num_pred_tokens, reference_tokens=reference_tokens))
+    if mode == "draft":
+        if not draft_model_path:
+            raise ValueError("Speculative mode 'draft' needs a draft model path.")
+        from llama_cpp import Llama
+        draft_llm = Llama(model_path=draft_model_path, n_ctx=2048, verbose=False)
+        return CountingDraft(SmallModelDraft(draft_llm, num_pred_tokens=min(num_pred_tokens, 8)))
+    raise ValueError(f"Unknown speculative mode: {mode}")
+
+#######################################################
+# 🔹 Benchmark
+#######################################################
+def _run(llm, queries, draft=None, max_tokens=350):
+    from .bench_suite import BASE_PROMPT
+    tokens, seconds = 0, 0.0
+    if draft:
+        draft.reset_stats()
+    for query in queries:
+        messages = [{"role": "system", "content": BASE_PROMPT}, {"role": "user", "content": query}]
+        llm.reset()
+        start = time.perf_counter()
+        response = llm.create_chat_completion(messages=messages, max_tokens=max_tokens, temperature=0.0, seed=42)
+        seconds += time.perf_counter() - start
+        tokens += response["usage"]["completion_tokens"]
+    result = {"tokens": tokens, "seconds": round(seconds, 3), "tokens_per_sec": round(tokens / seconds, 2)}
+    if draft:
+        result["acceptance_rate"] = round(draft.acceptance_rate(tokens), 3)
+        result["verify_steps"] = draft.steps
+    return result
+
+
+def benchmark(model_path, mode="prompt_lookup", draft_model_path=None, max_tokens=350):
+    from llama_cpp import Llama
+    from .bench_suite import BENCHMARK_QUERIES
+    from .autotune import load_tuning, DEFAULT_CONFIG
+    config = load_tuning(model_path) or DEFAULT_CONFIG
+
+    base = Llama(model_path=model_path, n_ctx=2048, verbose=False, **config)
+    baseline = _run(base, BENCHMARK_QUERIES, max_tokens=max_tokens)
+    del base
+    print(f"🐢 Baseline: {baseline['tokens_per_sec']} tokens/s")
+
+    draft = make_draft(mode, draft_model_path)
+    spec = Llama(model_path=model_path, n_ctx=2048, verbose=False, draft_model=draft, **config)
+    speculative = _run(spec, BENCHMARK_QUERIES, draft, max_tokens)
+    uplift = speculative["tokens_per_sec"] / baseline["tokens_per_sec"] - 1
+    print(f"🚀 Speculative ({mode}): {speculative['tokens_per_sec']} tokens/s | "
+          f"acceptance {speculative['acceptance_rate']:.1%} | uplift {uplift:+.1%}")
+
+    os.makedirs("logs", exist_ok=True)
+    with open("logs/speculative_benchmark.json", "w", encoding="utf-8") as f:
+        json.dump({"mode": mode, "draft_model": draft_model_path, "baseline": baseline,
+                   "speculative": speculative, "uplift_pct": round(uplift * 100, 2)}, f, indent=4)
+    print("✅ Results saved to logs/speculative_benchmark.json")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark speculative decoding on the benchmark queries")
+    parser.add_argument("model")
+    parser.add_argument("--draft", help="small draft GGUF (default: prompt-lookup decoding)")
+    parser.add_argument("--max-tokens", type=int, default=350)
+    args = parser.parse_args()
+    benchmark(args.model, "draft" if args.draft else "prompt_lookup", args.draft, args.max_tokens)
@@ -0,0 +1,211 @@
+"""
+ASTROEDGE PARAMETER SWEEP RUNNER
+--------------------------------
+✅ Grid over temperature, max_tokens, n_threads, n_batch, n_ctx and GGUF file (quantization)
+✅ Grid sharded across worker processes, each pinned to its own CPU cores
+✅ Every run starts from a clean chat (no shared chat_history pollution)
+✅ Results checkpointed as they finish – an interrupted sweep resumes where it stopped
+✅ One comparable CSV table at the end (readable by metrics_query)
+
+    python -m astroedge.sweep_runner --backend fake --temperature 0.2,0.4,0.7 --n-threads 2,4 --workers 2
+    python -m astroedge.sweep_runner --model models/tinyllama.Q4_K_M.gguf,models/tinyllama.Q8_0.gguf --n-batch 256,512
+"""
+
+import os, re, csv, json, time, argparse, itertools
+import multiprocessing as mp
+from datetime import datetime
+import psutil
+from .bench_suite import BENCHMARK_QUERIES, BASE_PROMPT
+
+LOAD_KEYS = ("model", "n_ctx", "n_threads", "n_batch")   # changing these needs a model reload
+RUN_KEYS = ("temperature", "max_tokens")
+TABLE_FIELDS = ["run_id", "model", "quant", "n_ctx", "n_threads", "n_batch", "temperature", "max_tokens",
+                "query_idx", "query", "inference_time_sec", "prompt_tokens", "tokens_generated",
+                "tokens_per_sec", "ram_usage_MB", "worker", "timestamp", "error"]
+_QUANT = re.compile(r"(I?Q\d(?:_[A-Z0-9]+)*|F16|F32)", re.IGNORECASE)
+
+#######################################################
+# 🔹 Grid
+#######################################################
+def build_grid(grid):
+    """{param: [values]} -> list of config dicts, ordered so equal load keys are adjacent."""
+    names = list(LOAD_KEYS + RUN_KEYS)
+    configs = [dict(zip(names, combo)) for combo in itertools.product(*(grid[n] for n in names))]
+    return sorted(configs, key=lambda c: tuple(str(c[k]) for k in LOAD_KEYS))
+
+
+def run_id(config, query_idx):
+    return "|".join(f"{k}={config[k]}" for k in LOAD_KEYS + RUN_KEYS) + f"|q={query_idx}"
+
+
+def quant_of(model_path):
+    match = _QUANT.search(os.path.basename(model_path))
+    return match.group(1).upper() if match else "?"
+
+#######################################################
+# 🔹 Worker process
+#######################################################
+_worker = {"llm": None, "load_key": None, "name": None}
+
+
+def _init_worker(core_queue, backend, token_latency):
+    cores = core_queue.get()
+    _worker.update(backend=backend, token_latency=token_latency, name=mp.current_process().name)
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cores)
+        else:
+            psutil.Process().cpu_affinity(list(cores))
+        _worker["name"] += f"@cpu{min(cores)}-{max(cores)}"
+    except (AttributeError, OSError, psutil.Error) as e:
+        print(f"⚠️ CPU pinning unavailable: {e}")
+
+
+def _load(config):
+    key = tuple(config[k] for k in LOAD_KEYS)
+    if _worker["load_key"] != key:
+        _worker["llm"] = None  # free the previous model before loading the next
+        kwargs = {"n_ctx": config["n_ctx"], "n_threads": config["n_threads"], "n_batch": config["n_batch"]}
+        if _worker["backend"] == "fake":
+            from .fake_llama import FakeLlama
+            _worker["llm"] = FakeLlama(model_path=config["model"], token_latency_s=_worker["token_latency"], **kwargs)
+        else:
+            from llama_cpp import Llama
+            _worker["llm"] = Llama(model_path=config["model"], verbose=False, **kwargs)
+        _worker["load_key"] = key
+    return _worker["llm"]
+
+
+def _run_unit(unit):
+    """One config x its pending queries. Returns table rows."""
+    config, pending = unit
+    rows = []
+    try:
+        llm = _load(config)
+    except Exception as e:
+        return [{**_row_base(config, idx, query), "error": f"load failed: {e}"} for idx, query in pending]
+    process = psutil.Process()
+    for idx, query in pending:
+        row = _row_base(config, idx, query)
+        messages = [{"role": "system", "content": BASE_PROMPT}, {"role": "user", "content": query}]
+        try:
+            start = time.perf_counter()
+            response = llm.create_chat_completion(messages=messages, max_tokens=config["max_tokens"],
+                                                  temperature=config["temperature"], seed=42)
+            elapsed = time.perf_counter() - start
+            usage = response.get("usage", {})
+            row.update(inference_time_sec=round(elapsed, 4),
+                       prompt_tokens=usage.get("prompt_tokens"),
+                       tokens_generated=usage.get("completion_tokens"),
+                       tokens_per_sec=round(usage.get("completion_tokens", 0) / elapsed, 2) if elapsed else None,
+                       ram_usage_MB=round(process.memory_info().rss / (1024 * 1024), 2))
+        except Exception as e:
+            row["error"] = str(e)
+        rows.append(row)
+    return rows
+
+
+def _row_base(config, idx, query):
+    return {"run_id": run_id(config, idx), "quant": quant_of(config["model"]), "query_idx": idx,
+            "query": query, "worker": _worker.get("name"), "timestamp": datetime.now().isoformat(),
+            "error": "", **config}
+
+#######################################################
+# 🔹 Sweep driver
+#######################################################
+def _core_sets(workers):
+    cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    per = max(1, len(cores) // workers)
+    return [cores[(i * per) % len(cores):(i * per) % len(cores) + per] for i in range(workers)]
+
+
+def load_checkpoint(path):
+    done = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line from an interrupted run
+                if not row.get("error"):
+                    done[row["run_id"]] = row
+    return done
+
+
+def run_sweep(grid, queries=BENCHMARK_QUERIES, workers=2, backend="llama", token_latency=0.02,
+              out_dir="logs/sweep"):
+    os.makedirs(out_dir, exist_ok=True)
+    checkpoint = os.path.join(out_dir, "checkpoint.jsonl")
+    done = load_checkpoint(checkpoint)
+
+    units = []
+    for config in build_grid(grid):
+        pending = [(i, q) for i, q in enumerate(queries) if run_id(config, i) not in done]
+        if pending:
+            units.append((config, pending))
+    total = sum(len(p) for _, p in units)
+    goal = len(done) + total
+    print(f"🚀 Sweep: {len(build_grid(grid))} configs x {len(queries)} queries | "
+          f"{len(done)} done, {total} to run on {workers} workers")
+
+    if units:
+        ctx = mp.get_context("spawn")
+        core_queue = ctx.Queue()
+        for cores in _core_sets(workers):
+            core_queue.put(cores)
+        with open(checkpoint, "a", encoding="utf-8") as ckpt, \
+                ctx.Pool(workers, initializer=_init_worker, initargs=(core_queue, backend, token_latency)) as pool:
+            for rows in pool.imap_unordered(_run_unit, units):
+                for row in rows:
+                    ckpt.write(json.dumps(row) + "\n")
+                    if not row["error"]:
+                        done[row["run_id"]] = row
+                    else:
+                        print(f"⚠️ {row['run_id']}: {row['error']}")
+                ckpt.flush()
+                os.fsync(ckpt.fileno())
+                print(f"🛰 {len(done)}/{goal} runs complete", end="\r")
+
+    table = os.path.join(out_dir, "sweep_results.csv")
+    with open(table, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=TABLE_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(sorted(done.values(), key=lambda r: (r["run_id"].rsplit("|q=", 1)[0], r["query_idx"])))
+    print(f"\n✅ Sweep table saved to {table}")
+    return table
+
+
+def _list(text, cast):
+    return [cast(v) for v in text.split(",") if v]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AstroEdge parameter sweep")
+    parser.add_argument("--backend", choices=["llama", "fake"], default="llama")
+    parser.add_argument("--model", default=r"C:\Hema\Contest\astro_edge_ai\tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf",
+                        help="comma separated GGUF files (one per quantization)")
+    parser.add_argument("--temperature", default="0.2,0.4,0.7")
+    parser.add_argument("--max-tokens", default="300")
+    parser.add_argument("--n-threads", default="6")
+    parser.add_argument("--n-batch", default="512")
+    parser.add_argument("--n-ctx", default="2048")
+    parser.add_argument("--queries", help="text file, one query per line (default: benchmark set)")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 4))
+    parser.add_argument("--token-latency", type=float, default=0.02, help="fake backend seconds per token")
+    parser.add_argument("--out-dir", default="logs/sweep")
+    args = parser.parse_args()
+
+    grid = {
+        "model": _list(args.model, str),
+        "n_ctx": _list(args.n_ctx, int),
+        "n_threads": _list(args.n_threads, int),
+        "n_batch": _list(args.n_batch, int),
+        "temperature": _list(args.temperature, float),
+        "max_tokens": _list(args.max_tokens, int),
+    }
+    queries = BENCHMARK_QUERIES
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+    run_sweep(grid, queries, args.workers, args.backend, args.token_latency, args.out_dir)
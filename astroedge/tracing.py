@@ -0,0 +1,319 @@
+"""
+ASTROEDGE LATENCY TRACING
+-------------------------
+✅ Span-based tracing of one interaction: hotword → STT → LLM → TTS → Tk render
+✅ One trace ID per interaction; spans on other threads attach to it (explicit parent, or the active one)
+✅ Finished spans go to an in-memory ring buffer and, per trace, to an OTLP/JSON file
+   (logs/traces/spans.otlp.jsonl – the OpenTelemetry Collector file format, one ExportTraceServiceRequest per line)
+✅ Waterfall HTML report: python -m astroedge.tracing logs/traces/spans.otlp.jsonl -o logs/traces/waterfall.html
+"""
+
+import os, json, time, html, threading, argparse, contextvars, statistics
+from collections import deque
+from contextlib import contextmanager
+
+OTLP_PATH = os.path.join("logs", "traces", "spans.otlp.jsonl")
+_current = contextvars.ContextVar("astroedge_span", default=None)
+
+
+class Span:
+    __slots__ = ("tracer", "trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns", "attrs", "thread")
+
+    def __init__(self, tracer, trace_id, parent_id, name, start_ns, attrs):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = start_ns
+        self.end_ns = None
+        self.attrs = attrs
+        self.thread = threading.current_thread().name
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+        return self
+
+    def end(self, end_ns=None):
+        if self.end_ns is None:
+            self.end_ns = end_ns or time.time_ns()
+            self.tracer._finished(self)
+
+    @property
+    def duration_ms(self):
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+
+class Tracer:
+    def __init__(self, capacity=4096, otlp_path=OTLP_PATH, service="astroedge", max_open_traces=64):
+        self.spans = deque(maxlen=capacity)  # ring buffer of finished spans, newest last
+        self.otlp_path = otlp_path
+        self.service = service
+        self.max_open_traces = max_open_traces
+        self.active = None  # root span of the current interaction
+        self._traces = {}   # trace_id -> {"root", "spans", "open", "closing"}
+        self._lock = threading.Lock()
+
+    #######################################################
+    # 🔹 Interactions
+    #######################################################
+    def begin(self, name="interaction", **attrs):
+        """Start a new interaction trace; the previous one is finished (it exports once its spans end)."""
+        if self.active:
+            self.finish(self.active)
+        root = self.start_span(name, parent=False, **attrs)
+        self.active = root
+        return root
+
+    def finish(self, root=None):
+        """No more stages will start for this interaction – end the root as soon as its children have ended."""
+        root = root or self.active
+        if root is None:
+            return
+        with self._lock:
+            trace = self._traces.get(root.trace_id)
+            if trace is None:
+                return
+            trace["closing"] = True
+            idle = trace["open"] == 1
+        if self.active is root:
+            self.active = None
+        if idle:
+            root.end()
+
+    #######################################################
+    # 🔹 Spans
+    #######################################################
+    def start_span(self, name, parent=None, start_ns=None, **attrs):
+        """parent: a Span, None (current span on this thread, else the active interaction) or False (new trace)."""
+        if parent is None:
+            parent = _current.get() or self.active
+        with self._lock:
+            trace = self._traces.get(parent.trace_id) if parent else None
+            if trace is None:
+                trace_id, parent_id = os.urandom(16).hex(), None
+            else:
+                trace_id, parent_id = parent.trace_id, parent.span_id
+            span = Span(self, trace_id, parent_id, name, start_ns or time.time_ns(), attrs)
+            if trace is None:
+                trace = self._traces[trace_id] = {"root": span, "spans": [], "open": 0, "closing": False}
+                self._evict()
+            trace["open"] += 1
+        return span
+
+    @contextmanager
+    def span(self, name, parent=None, **attrs):
+        s = self.start_span(name, parent, **attrs)
+        token = _current.set(s)
+        try:
+            yield s
+        except BaseException as e:
+            s.set(error=type(e).__name__)
+            raise
+        finally:
+            _current.reset(token)
+            s.end()
+
+    @contextmanager
+    def attach(self, span):
+        """Make `span` the parent for spans started on this thread (hand-off across executors)."""
+        token = _current.set(span)
+        try:
+            yield span
+        finally:
+            _current.reset(token)
+
+    def current(self):
+        return _current.get() or self.active
+
+    def _finished(self, span):
+        export = end_root = None
+        with self._lock:
+            self.spans.append(span)
+            trace = self._traces.get(span.trace_id)
+            if trace is None:
+                return
+            trace["spans"].append(span)
+            trace["open"] -= 1
+            if trace["open"] == 0:
+                export = self._traces.pop(span.trace_id)["spans"]
+            elif trace["open"] == 1 and trace["closing"] and trace["root"].end_ns is None:
+                end_root = trace["root"]  # last stage of a finished interaction ended
+        if export:
+            self._export(export)
+        if end_root:
+            end_root.end()
+
+    def _evict(self):
+        # An interaction whose stages never ended (crash, dropped callback) must not pin memory forever
+        while len(self._traces) > self.max_open_traces:
+            trace_id = next(iter(self._traces))
+            self._traces.pop(trace_id)
+
+    #######################################################
+    # 🔹 OTLP/JSON file exporter
+    #######################################################
+    def _export(self, spans):
+        if not self.otlp_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.otlp_path) or ".", exist_ok=True)
+            with open(self.otlp_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(to_otlp(spans, self.service)) + "\n")
+        except OSError as e:
+            print(f"⚠️ Trace export failed: {e}")
+
+    def traces(self, last=None):
+        """Finished spans from the ring buffer grouped by trace, oldest first."""
+        with self._lock:
+            spans = list(self.spans)
+        return group_traces([span_dict(s) for s in spans], last)
+
+    def write_report(self, path=os.path.join("logs", "traces", "waterfall.html"), last=20):
+        return write_waterfall(self.traces(last), path)
+
+
+def _otlp_value(v):
+    if isinstance(v, bool):
+        return {"boolValue": v}
+    if isinstance(v, int):
+        return {"intValue": str(v)}
+    if isinstance(v, float):
+        return {"doubleValue": v}
+    return {"stringValue": str(v)}
+
+
+def to_otlp(spans, service="astroedge"):
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service}}]},
+        "scopeSpans": [{
+            "scope": {"name": "astroedge.tracing"},
+            "spans": [{
+                "traceId": s.trace_id, "spanId": s.span_id, "parentSpanId": s.parent_id or "",
+                "name": s.name, "kind": 1,
+                "startTimeUnixNano": str(s.start_ns), "endTimeUnixNano": str(s.end_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)}
+                               for k, v in {**s.attrs, "thread.name": s.thread}.items()],
+                "status": {"code": 2 if "error" in s.attrs else 0},
+            } for s in spans],
+        }],
+    }]}
+
+
+def span_dict(s):
+    return {"trace_id": s.trace_id, "span_id": s.span_id, "parent_id": s.parent_id, "name": s.name,
+            "start_ns": s.start_ns, "end_ns": s.end_ns, "attrs": {**s.attrs, "thread.name": s.thread}}
+
+
+def load_otlp(path):
+    """Spans (as dicts) from an OTLP/JSON lines file."""
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            for rs in json.loads(line).get("resourceSpans", []):
+                for ss in rs.get("scopeSpans", []):
+                    for s in ss.get("spans", []):
+                        attrs = {a["key"]: next(iter(a["value"].values())) for a in s.get("attributes", [])}
+                        spans.append({"trace_id": s["traceId"], "span_id": s["spanId"],
+                                      "parent_id": s.get("parentSpanId") or None, "name": s["name"],
+                                      "start_ns": int(s["startTimeUnixNano"]), "end_ns": int(s["endTimeUnixNano"]),
+                                      "attrs": attrs})
+    return spans
+
+
+def group_traces(spans, last=None):
+    traces = {}
+    for s in spans:
+        traces.setdefault(s["trace_id"], []).append(s)
+    ordered = sorted(traces.values(), key=lambda t: min(s["start_ns"] for s in t))
+    return ordered[-last:] if last else ordered
+
+
+#######################################################
+# 🔹 Waterfall report
+#######################################################
+STAGE_COLORS = {"interaction": "#555", "hotword": "#c586c0", "stt": "#4fc1ff", "router": "#b5cea8",
+                "llm": "#ffb000", "tts": "#6a9955", "ui": "#f44747"}
+
+
+def _depths(trace):
+    by_id = {s["span_id"]: s for s in trace}
+    depth = {}
+
+    def d(s):
+        if s["span_id"] not in depth:
+            parent = by_id.get(s["parent_id"])
+            depth[s["span_id"]] = d(parent) + 1 if parent else 0
+        return depth[s["span_id"]]
+
+    for s in trace:
+        d(s)
+    return depth
+
+
+def write_waterfall(traces, path):
+    """One waterfall per trace (newest first) plus a per-stage latency table."""
+    rows_by_name = {}
+    sections = []
+    for trace in reversed(traces):
+        t0 = min(s["start_ns"] for s in trace)
+        total = max(max(s["end_ns"] for s in trace) - t0, 1)
+        depth = _depths(trace)
+        root = min(trace, key=lambda s: (depth[s["span_id"]], s["start_ns"]))
+        rows = []
+        for s in sorted(trace, key=lambda s: (s["start_ns"], depth[s["span_id"]])):
+            ms = (s["end_ns"] - s["start_ns"]) / 1e6
+            rows_by_name.setdefault(s["name"], []).append(ms)
+            left = (s["start_ns"] - t0) / total * 100
+            width = max((s["end_ns"] - s["start_ns"]) / total * 100, 0.3)
+            color = STAGE_COLORS.get(s["name"].split(".")[0], "#9cdcfe")
+            attrs = html.escape(", ".join(f"{k}={v}" for k, v in s["attrs"].items()))
+            rows.append(
+                f'<tr><td style="padding-left:{depth[s["span_id"]] * 14}px">{html.escape(s["name"])}</td>'
+                f'<td class="ms">{ms:,.1f}</td><td class="bar"><div title="{attrs}" '
+                f'style="margin-left:{left:.2f}%;width:{width:.2f}%;background:{color}"></div></td></tr>')
+        trigger = html.escape(str(root["attrs"].get("trigger", "")))
+        started = time.strftime("%H:%M:%S", time.localtime(t0 / 1e9))
+        sections.append(f'<h2>{started} · {trigger} · {total / 1e6:,.0f} ms '
+                        f'<small>{root["trace_id"]}</small></h2><table>{"".join(rows)}</table>')
+
+    stats = "".join(
+        f"<tr><td>{html.escape(name)}</td><td class='ms'>{len(v)}</td>"
+        f"<td class='ms'>{statistics.median(v):,.1f}</td><td class='ms'>{max(v):,.1f}</td></tr>"
+        for name, v in sorted(rows_by_name.items(), key=lambda kv: -statistics.median(kv[1])))
+    doc = f"""<!doctype html><meta charset="utf-8"><title>AstroEdge latency traces</title>
+<style>
+body {{ background:#0B0B15; color:#ddd; font:13px Consolas, monospace; margin:20px }}
+h1 {{ color:cyan }} h2 {{ font-size:14px; color:#9cdcfe; margin-top:24px }} small {{ color:#666 }}
+table {{ border-collapse:collapse; width:100% }} td {{ padding:2px 6px; white-space:nowrap }}
+td.ms {{ text-align:right; width:80px }} td.bar {{ width:70% }} td.bar div {{ height:12px; border-radius:2px }}
+tr:hover {{ background:#1C1C28 }}
+</style>
+<h1>🚀 AstroEdge latency traces</h1>
+<h2>Per stage (ms)</h2>
+<table style="width:auto"><tr><td>span</td><td class="ms">count</td><td class="ms">median</td><td class="ms">max</td></tr>{stats}</table>
+{"".join(sections) or "<p>No traces recorded yet.</p>"}
+"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(doc)
+    return path
+
+
+tracer = Tracer()  # process-wide tracer used by the instrumented modules
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render a waterfall HTML report from an OTLP/JSON span file.")
+    ap.add_argument("path", nargs="?", default=OTLP_PATH)
+    ap.add_argument("-o", "--out", default=os.path.join("logs", "traces", "waterfall.html"))
+    ap.add_argument("--last", type=int, default=20, help="newest N traces")
+    args = ap.parse_args(argv)
+    traces = group_traces(load_otlp(args.path), args.last)
+    print(f"✅ {len(traces)} traces → {write_waterfall(traces, args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+ASTROEDGE TTS AUDIO CACHE
+-------------------------
+✅ Fixed phrases (greeting, status lines, jokes, quotes) are synthesized to WAV once
+   with pyttsx3.save_to_file and played back from disk afterwards
+✅ Content-addressed: file name = SHA-256 of voice + rate + text
+✅ Size-bounded LRU eviction (least recently played WAVs go first)
+✅ Playback needs no synthesis CPU – winsound on Windows, sounddevice elsewhere
+"""
+
+import os, wave, hashlib
+
+TTS_CACHE_VERSION = 1
+
+
+class TTSCache:
+    def __init__(self, engine, cache_dir="logs/tts_cache", max_bytes=64 * 1024 * 1024):
+        self.engine = engine
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def cache_path(self, text):
+        voice = f"{self.engine.getProperty('voice')}|{self.engine.getProperty('rate')}"
+        payload = f"{TTS_CACHE_VERSION}|{voice}|{text}"
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(payload.encode('utf-8')).hexdigest()}.wav")
+
+    def get(self, text):
+        """Path of the cached WAV for text, or None. Marks it recently used."""
+        path = self.cache_path(text)
+        if os.path.exists(path):
+            os.utime(path)
+            self.hits += 1
+            return path
+        return None
+
+    def render(self, text):
+        """Synthesize text to the cache (must run on the thread that owns the engine)."""
+        path = self.cache_path(text)
+        if os.path.exists(path):
+            return path
+        tmp = f"{path[:-4]}.tmp.wav"  # engines pick the audio format from the extension
+        self.engine.save_to_file(text, tmp)
+        self.engine.runAndWait()
+        if not os.path.exists(tmp) or os.path.getsize(tmp) == 0:
+            return None  # engine could not write audio; caller falls back to live speech
+        os.replace(tmp, path)
+        self.misses += 1
+        self._evict(keep=path)
+        return path
+
+    def play(self, path):
+        """Blocking playback of a cached WAV."""
+        try:
+            import winsound
+            # NODEFAULT: a missing or corrupt file raises instead of playing the system beep
+            winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_NODEFAULT)
+            return
+        except ImportError:
+            pass
+        import numpy as np
+        import sounddevice as sd
+        with wave.open(path, "rb") as w:
+            width, channels, rate = w.getsampwidth(), w.getnchannels(), w.getframerate()
+            frames = w.readframes(w.getnframes())
+        dtype = {1: np.uint8, 2: np.int16, 4: np.int32}[width]
+        sd.play(np.frombuffer(frames, dtype=dtype).reshape(-1, channels), rate)
+        sd.wait()
+
+    def discard(self, path):
+        """Drop a cached WAV that failed to play; the next use renders it again."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def stop(self):
+        """Cut off playback started by play() on another thread."""
+        try:
+            import winsound
+            winsound.PlaySound(None, 0)
+            return
+        except ImportError:
+            pass
+        try:
+            import sounddevice as sd
+        except (ImportError, OSError):  # no sounddevice / PortAudio: play() never started anything
+            return
+        sd.stop()
+
+    def _evict(self, keep=None):
+        files = [os.path.join(self.cache_dir, f) for f in os.listdir(self.cache_dir) if not f.endswith(".tmp.wav")]
+        total = sum(os.path.getsize(f) for f in files)
+        if total <= self.max_bytes:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            total -= os.path.getsize(path)
+            os.remove(path)
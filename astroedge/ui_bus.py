@@ -0,0 +1,213 @@
+"""
+ASTROEDGE UI EVENT BUS
+----------------------
+✅ Worker threads never touch Tk widgets – they post typed events into a thread-safe queue
+✅ The Tk thread drains the queue on a fixed `after` tick
+✅ Events with a coalesce key (status lines, telemetry) collapse to the latest one per tick
+✅ Each tick has a time budget; whatever is left over is carried to the next tick in order
+✅ Stress test: python -m astroedge.ui_bus --threads 16 --rate 500 --seconds 5
+"""
+
+import time, queue, threading, argparse
+from collections import namedtuple, Counter
+
+UIEvent = namedtuple("UIEvent", "kind payload key")
+
+
+class UIBus:
+    def __init__(self, root, tick_ms=16, budget_ms=8, clock=time.perf_counter):
+        self.root = root
+        self.clock = clock
+        self.tick_ms = tick_ms
+        self.budget_s = budget_ms / 1000
+        self.handlers = {}
+        self._queue = queue.SimpleQueue()
+        self._backlog = []
+        self.stats = Counter()
+        self.tick_times_ms = []
+        self.root.after(self.tick_ms, self._tick)
+
+    def on(self, kind, handler):
+        """Register handler(payload) for an event kind; runs on the Tk thread."""
+        self.handlers[kind] = handler
+
+    def post(self, kind, payload=None, key=None):
+        """Thread-safe. Events sharing a non-None key coalesce to the newest within a tick."""
+        self._queue.put(UIEvent(kind, payload, key))
+
+    def call(self, fn, *args):
+        """Run fn(*args) on the Tk thread."""
+        self.post("call", (fn, args))
+
+    def _tick(self):
+        start = self.clock()
+        events = self._backlog
+        carried = len(events)
+        try:
+            while True:
+                events.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        self.stats["received"] += len(events) - carried
+
+        if events:
+            latest = {}
+            for i, event in enumerate(events):
+                if event.key is not None:
+                    latest[(event.kind, event.key)] = i
+            batch = [e for i, e in enumerate(events) if e.key is None or latest[(e.kind, e.key)] == i]
+            self.stats["coalesced"] += len(events) - len(batch)
+
+            deadline = start + self.budget_s
+            done = 0
+            for event in batch:
+                self._dispatch(event)
+                done += 1
+                if self.clock() > deadline:
+                    break
+            self._backlog = batch[done:]
+            self.stats["dispatched"] += done
+            if self._backlog:
+                self.stats["over_budget_ticks"] += 1
+        else:
+            self._backlog = []
+
+        self.tick_times_ms.append((self.clock() - start) * 1000)
+        if len(self.tick_times_ms) > 10000:
+            del self.tick_times_ms[:5000]
+        self.root.after(self.tick_ms, self._tick)
+
+    def _dispatch(self, event):
+        try:
+            if event.kind == "call":
+                fn, args = event.payload
+                fn(*args)
+            else:
+                self.handlers[event.kind](event.payload)
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"⚠️ UI event {event.kind} failed: {e}")
+
+
+#######################################################
+# 🔹 Stress test
+#######################################################
+def stress(threads=16, rate=500, seconds=5.0, headless=False, work_us=0):
+    """Many workers post chat lines (must all arrive, in order) and status updates (coalesced).
+
+    Returns a dict of results: events_per_s, lost, out_of_order, tick and post→dispatch latency percentiles, ok."""
+    if headless:
+        root = _HeadlessRoot()
+        show_chat = show_status = lambda payload: None
+    else:
+        import tkinter as tk
+        root = tk.Tk()
+        status = tk.Label(root, text="")
+        status.pack()
+        log = tk.Text(root, height=20, width=80)
+        log.pack()
+
+        def show_chat(payload):
+            log.insert(tk.END, f"{payload}\n")
+            if int(log.index("end-1c").split(".")[0]) > 500:
+                log.delete("1.0", "100.0")
+
+        def show_status(payload):
+            status.config(text=payload)
+
+    bus = UIBus(root)
+    received = {}
+    latencies = []
+
+    def on_chat(payload):
+        worker, seq, posted = payload
+        latencies.append(time.perf_counter() - posted)
+        if received.get(worker, -1) != seq - 1:
+            bus.stats["out_of_order"] += 1
+        received[worker] = seq
+        show_chat((worker, seq))
+        spin_until = time.perf_counter() + work_us / 1e6  # simulated widget cost
+        while time.perf_counter() < spin_until:
+            pass
+
+    bus.on("chat", on_chat)
+    bus.on("status", show_status)
+
+    def worker(n):
+        interval, seq = 1.0 / rate, 0
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            bus.post("chat", (n, seq, time.perf_counter()))
+            bus.post("status", f"worker {n} at {seq}", key="status")
+            seq += 1
+            time.sleep(interval)
+        sent[n] = seq
+
+    sent = {}
+    workers = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(threads)]
+    for w in workers:
+        w.start()
+
+    def finish():
+        if any(w.is_alive() for w in workers) or bus._backlog or not bus._queue.empty():
+            root.after(50, finish)
+            return
+        root.quit()
+
+    start = time.perf_counter()
+    root.after(50, finish)
+    root.mainloop()
+    wall = time.perf_counter() - start
+
+    ticks = sorted(bus.tick_times_ms)
+    latencies.sort()
+    lost = sum(sent[n] - (received.get(n, -1) + 1) for n in sent)
+    result = {
+        "events": bus.stats["received"], "wall_s": wall, "events_per_s": bus.stats["received"] / wall,
+        "lost": lost, "out_of_order": bus.stats["out_of_order"], "errors": bus.stats["errors"],
+        "tick_p50_ms": ticks[len(ticks) // 2], "tick_p99_ms": ticks[int(len(ticks) * 0.99)],
+        "tick_max_ms": ticks[-1], "over_budget_ticks": bus.stats["over_budget_ticks"],
+        "latency_p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "latency_p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+    }
+    result["ok"] = lost == 0 and result["out_of_order"] == 0
+    print(f"📨 Posted {result['events']} events in {wall:.1f}s ({result['events_per_s']:.0f}/s) "
+          f"from {threads} threads")
+    print(f"✅ Dispatched {bus.stats['dispatched']} | coalesced {bus.stats['coalesced']} | "
+          f"lost {lost} | out of order {result['out_of_order']} | errors {result['errors']}")
+    print(f"⏱ Tick p50 {result['tick_p50_ms']:.2f} ms | p99 {result['tick_p99_ms']:.2f} ms | "
+          f"max {result['tick_max_ms']:.2f} ms | over-budget ticks {result['over_budget_ticks']}")
+    print(f"📬 Post → dispatch p50 {result['latency_p50_ms']:.1f} ms | p99 {result['latency_p99_ms']:.1f} ms")
+    return result
+
+
+class _HeadlessRoot:
+    """Minimal after()/mainloop() scheduler so the stress test also runs without a display."""
+
+    def __init__(self):
+        self._timers, self._running = [], False
+
+    def after(self, ms, fn):
+        self._timers.append((time.perf_counter() + ms / 1000, fn))
+
+    def quit(self):
+        self._running = False
+
+    def mainloop(self):
+        self._running = True
+        while self._running:
+            self._timers.sort(key=lambda t: t[0])
+            due, fn = self._timers.pop(0)
+            time.sleep(max(0.0, due - time.perf_counter()))
+            fn()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI event bus stress test")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--rate", type=int, default=500, help="events per second per thread")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--work-us", type=int, default=0, help="simulated handler cost per chat event")
+    parser.add_argument("--headless", action="store_true", help="run without a Tk display")
+    args = parser.parse_args()
+    raise SystemExit(0 if stress(args.threads, args.rate, args.seconds, args.headless, args.work_us)["ok"] else 1)
@@ -0,0 +1,13 @@
+import random
+
+
+#######################################################
+# 🔹 YOLOv8 Vision Stub
+#######################################################
+class VisionModule:
+    """Simulated YOLOv8 object detection for demo purposes."""
+    def detect(self):
+        objects = ["toolbox", "loose wire", "oxygen valve", "panel"]
+        detection = random.choice(objects)
+        confidence = round(random.uniform(0.75, 0.99), 2)
+        return {"object": detection, "confidence": confidence}
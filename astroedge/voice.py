@@ -0,0 +1,128 @@
+"""
+ASTROEDGE VOICE
+---------------
+✅ VoiceSystem: one speech thread, TTS audio cache for fixed phrases, barge-in stop()
+✅ A cached WAV that fails to play (missing, corrupt, device error) is dropped and the phrase spoken live
+✅ VoiceInput: microphone capture + Google speech recognition
+"""
+
+import threading, queue, time
+from .tts_cache import TTSCache
+from .tracing import tracer
+
+#######################################################
+# 🔹 Voice System
+#######################################################
+GREETING = "NextGen system ready. Awaiting mission input."
+
+
+class VoiceSystem:
+    def __init__(self, idle=lambda: True):
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        self.engine.setProperty('rate', 160)
+        self.voice_enabled = True
+        self.queue = queue.Queue()
+        # Fixed phrases are played from pre-rendered WAVs; the engine is only touched on the voice thread
+        self.cache = TTSCache(self.engine)
+        # stop() only raises this flag; the engine is stopped from its own word callback on the voice thread
+        self._interrupt = threading.Event()
+        self.engine.connect("started-word", self._on_word)
+        self.idle = idle  # pre-rendering waits while this returns False (e.g. LLM busy)
+        self.prewarm_queue = []
+        threading.Thread(target=self._run, name="tts", daemon=True).start()
+
+    def speak(self, text, cached=False, trace=None):
+        """Queue text for speech; cached=True for fixed phrases that repeat. trace: parent span (interaction)."""
+        if self.voice_enabled:
+            # The span opens at enqueue, so time spent waiting behind earlier speech is part of the trace
+            span = tracer.start_span("tts.speak", parent=trace, chars=len(text), cached=cached)
+            self.queue.put((text, cached, span))
+
+    def stop(self):
+        """Barge-in: drop queued speech and cut off whatever is playing now."""
+        try:
+            while True:
+                _, _, span = self.queue.get_nowait()
+                span.set(cancelled=True).end()
+                self.queue.task_done()
+        except queue.Empty:
+            pass
+        self._interrupt.set()
+        self.cache.stop()
+
+    def _on_word(self, name, location, length):
+        if self._interrupt.is_set():
+            self.engine.stop()  # voice thread, inside runAndWait
+
+    def prewarm(self, phrases):
+        """Render fixed phrases to the audio cache in the background when idle."""
+        self.prewarm_queue.extend(p for p in phrases if not self.cache.get(p))
+
+    def toggle(self):
+        self.voice_enabled = not self.voice_enabled
+        return self.voice_enabled
+    
+    def _run(self):
+        while True:
+            try:
+                text, cached, span = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                if self.prewarm_queue and self.idle():
+                    self.cache.render(self.prewarm_queue.pop(0))
+                continue
+            span.set(queued_ms=round((time.time_ns() - span.start_ns) / 1e6, 1))
+            self._interrupt.clear()  # queued after the last stop(): speak it
+            try:
+                path = (self.cache.get(text) or self.cache.render(text)) if cached else None
+                span.set(from_cache=bool(path))
+                if path:
+                    try:
+                        self.cache.play(path)
+                    except Exception as e:
+                        span.set(from_cache=False, cache_error=type(e).__name__)
+                        print(f"⚠️ Cached speech failed, speaking live: {e}")
+                        self.cache.discard(path)
+                        path = None
+                if not path and text:
+                    self.engine.say(text)
+                    self.engine.runAndWait()
+            except Exception as e:
+                span.set(error=type(e).__name__)
+                print(f"⚠️ Speech error: {e}")
+            span.end()
+            self.queue.task_done()
+
+
+
+class VoiceInput:
+    def __init__(self):
+        import speech_recognition as sr
+        self.sr = sr
+        self.recognizer = sr.Recognizer()
+        self.microphone = sr.Microphone()
+
+    def listen(self):
+        sr = self.sr
+        with tracer.span("stt.listen") as span, self.microphone as source:
+            try:
+                print("🎙 Adjusting for background noise...")
+                with tracer.span("stt.calibrate"):
+                    self.recognizer.adjust_for_ambient_noise(source, duration=1)
+
+                print("🎙 Listening... Speak now")
+                with tracer.span("stt.capture"):
+                    audio = self.recognizer.listen(source, timeout=10, phrase_time_limit=10)
+
+                print("🎙 Processing speech...")
+                with tracer.span("stt.recognize"):
+                    text = self.recognizer.recognize_google(audio)
+                span.set(chars=len(text))
+                return text
+
+            except sr.WaitTimeoutError:
+                return "⚠️ No speech detected (timeout)."
+            except sr.UnknownValueError:
+                return "❌ Could not understand audio."
+            except sr.RequestError as e:
+                return f"❌ Speech recognition service unavailable: {e}"
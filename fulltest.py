@@ -1,8 +1,10 @@
-import os, time, csv, json, random, psutil, statistics
+import os, sys, time, csv, json, random, psutil
 from datetime import datetime
-import matplotlib.pyplot as plt
 from fpdf import FPDF
-from llama_cpp import Llama
+from astroedge.autotune import tuned_llama
+from astroedge.metrics_query import MetricsStore
+from astroedge.chart_service import ChartService
+from astroedge.fake_llama import FakeLlama
 
 #######################################################
 # 🔹 YOLOv8 Vision Stub (Simulated for Research)
@@ -18,9 +20,9 @@ class VisionModule:
 # 🔹 Core AI Engine – TinyLLaMA with Safe Context Handling
 #######################################################
 class CoreAI:
-    def __init__(self, model_path):
+    def __init__(self, model_path, llm=None):
         print("🚀 Loading TinyLLaMA model for research...")
-        self.llm = Llama(model_path=model_path, n_ctx=2048, n_threads=6)
+        self.llm = llm or tuned_llama(model_path, n_ctx=2048)
         print("✅ TinyLLaMA loaded successfully.")
         self.base_prompt = "You are AstroEdge AI, a futuristic astronaut mission assistant."
         self.chat_history = []
@@ -29,7 +31,7 @@ class CoreAI:
         self.peak_ram = 0
 
     def ask(self, user_query: str, temperature=0.4):
-        start = time.time()
+        start = time.perf_counter()
         # ✅ Reset history if context gets too long
         if len(self.chat_history) > 50:
             self.chat_history = []
@@ -44,7 +46,7 @@ class CoreAI:
         )
         answer = response["choices"][0]["message"]["content"].strip()
 
-        elapsed = round(time.time() - start, 2)
+        elapsed = round(time.perf_counter() - start, 2)
         cpu = psutil.cpu_percent()
         mem = round(psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024), 2)
 
@@ -117,43 +119,35 @@ def run_full_research(ai: CoreAI):
 # 🔹 Graph Generation for Paper
 #######################################################
 def create_graphs(metrics_log):
-    times = [m["inference_time_sec"] for m in metrics_log]
-    cpu = [m["cpu_usage_%"] for m in metrics_log]
-    ram = [m["ram_usage_MB"] for m in metrics_log]
-
-    plt.figure(figsize=(12, 8))
-
-    plt.subplot(3, 1, 1)
-    plt.plot(times, label="Inference Time (s)", color="blue")
-    plt.legend()
-    plt.grid(True)
-
-    plt.subplot(3, 1, 2)
-    plt.plot(cpu, label="CPU Usage (%)", color="red")
-    plt.legend()
-    plt.grid(True)
-
-    plt.subplot(3, 1, 3)
-    plt.plot(ram, label="RAM Usage (MB)", color="green")
-    plt.legend()
-    plt.grid(True)
-
-    plt.tight_layout()
-    plt.savefig("logs/research_metrics_graphs.png")
-    plt.close()
+    frame = MetricsStore.from_records(metrics_log).scan()
+    times = frame.columns["latency_s"]
+    cpu = frame.columns["cpu_pct"]
+    ram = frame.columns["rss_MB"]
+
+    ChartService().render({
+        "kind": "panels",
+        "figsize": (12, 8),
+        "panels": [
+            {"label": "Inference Time (s)", "values": times, "color": "blue"},
+            {"label": "CPU Usage (%)", "values": cpu, "color": "red"},
+            {"label": "RAM Usage (MB)", "values": ram, "color": "green"},
+        ],
+    }, "logs/research_metrics_graphs.png")
     print("📊 Saved research graphs as logs/research_metrics_graphs.png")
 
 #######################################################
 # 🔹 PDF REPORT GENERATION FOR PAPER
 #######################################################
 def export_pdf_report(metrics_log, csv_file):
-    times = [m["inference_time_sec"] for m in metrics_log]
-    cpu = [m["cpu_usage_%"] for m in metrics_log]
-    ram = [m["ram_usage_MB"] for m in metrics_log]
+    frame = MetricsStore.from_records(metrics_log).scan()
+    summary = frame.summary(("p50_latency", "p95_latency", "p99_latency", "mean_latency",
+                             "mean_cpu", "mean_rss", "max_rss"))
+    per_temp = frame.group_by(("temperature",), ("count", "p50_latency", "p95_latency", "tokens_per_sec"))
+    cpu = frame.columns["cpu_pct"]
 
-    mean_time = statistics.mean(times)
-    mean_cpu = statistics.mean(cpu)
-    mean_ram = statistics.mean(ram)
+    mean_time = summary["mean_latency"]
+    mean_cpu = summary["mean_cpu"]
+    mean_ram = summary["mean_rss"]
 
     pdf = FPDF()
     pdf.add_page()
@@ -168,7 +162,17 @@ def export_pdf_report(metrics_log, csv_file):
                              f"Average CPU Usage: {mean_cpu:.2f}%\n"
                              f"Average RAM Usage: {mean_ram:.2f}MB\n"
                              f"Peak CPU Usage: {max(cpu)}%\n"
-                             f"Peak RAM Usage: {max(ram)}MB")
+                             f"Peak RAM Usage: {summary['max_rss']}MB\n"
+                             f"Latency p50/p95/p99: {summary['p50_latency']:.2f}s / "
+                             f"{summary['p95_latency']:.2f}s / {summary['p99_latency']:.2f}s")
+
+    pdf.ln(5)
+    pdf.set_font("Arial", "B", 12)
+    pdf.cell(0, 10, "Latency by Temperature", ln=True)
+    pdf.set_font("Arial", size=11)
+    for row in per_temp:
+        pdf.cell(0, 8, f"T={row['temperature']}: {row['count']} queries | p50 {row['p50_latency']:.2f}s | "
+                       f"p95 {row['p95_latency']:.2f}s | {row['tokens_per_sec']:.1f} tokens/s", ln=True)
 
     pdf.ln(10)
     pdf.image("logs/research_metrics_graphs.png", x=10, w=180)
@@ -185,5 +189,6 @@ def export_pdf_report(metrics_log, csv_file):
 #######################################################
 if __name__ == "__main__":
     MODEL_PATH = r"C:\\Hema\\Contest\\astro_edge_ai\\tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf"
-    ai = CoreAI(MODEL_PATH)
+    # --fake: deterministic stand-in backend, no GGUF needed
+    ai = CoreAI(MODEL_PATH, llm=FakeLlama() if "--fake" in sys.argv else None)
     run_full_research(ai)
@@ -1,18 +1,9 @@
 import tkinter as tk
 from tkinter import scrolledtext, ttk, messagebox
-from llama_cpp import Llama
-import pyttsx3, threading, time, datetime, json, csv, os, random, psutil
-
-#######################################################
-# 🔹 YOLOv8 Vision Stub
-#######################################################
-class VisionModule:
-    """Simulated YOLOv8 object detection for demo purposes."""
-    def detect(self):
-        objects = ["toolbox", "loose wire", "oxygen valve", "control panel"]
-        detection = random.choice(objects)
-        confidence = round(random.uniform(0.75, 0.99), 2)
-        return {"object": detection, "confidence": confidence}
+from astroedge.autotune import tuned_llama
+from astroedge.vision import VisionModule
+from astroedge.voice import VoiceSystem
+import threading, time, datetime, json, csv, os, psutil
 
 #######################################################
 # 🔹 Core AI Engine – TinyLlama w/ metrics
@@ -20,7 +11,7 @@ class VisionModule:
 class CoreAI:
     def __init__(self, model_path):
         print("🚀 Loading TinyLlama model...")
-        self.llm = Llama(model_path=model_path, n_ctx=2048, n_threads=6)
+        self.llm = tuned_llama(model_path, n_ctx=2048)
         print("✅ TinyLlama loaded successfully.")
         self.base_prompt = "You are AstroEdge AI, a futuristic astronaut mission assistant."
         self.chat_history = []
@@ -77,24 +68,6 @@ class CoreAI:
             json.dump(self.metrics_log, f, indent=4)
         print(f"✅ JSON log saved to {filename}")
 
-#######################################################
-# 🔹 Voice System
-#######################################################
-class VoiceSystem:
-    def __init__(self):
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 160)
-        self.voice_enabled = True
-
-    def speak(self, text):
-        if self.voice_enabled:
-            self.engine.say(text)
-            self.engine.runAndWait()
-
-    def toggle(self):
-        self.voice_enabled = not self.voice_enabled
-        return self.voice_enabled
-
 #######################################################
 # 🔹 GUI APP – AstroEdge Research Edition
 #######################################################
@@ -8,19 +8,21 @@ ASTROEDGE AI - FULL RESEARCH TESTING SCRIPT
 ✅ Exports PDF report with all metrics and charts
 """
 
-import os, time, csv, json, psutil, random
-import matplotlib.pyplot as plt
+import os, sys, time, csv, json, psutil, random
+from astroedge.chart_service import ChartService
+from astroedge.bench_suite import BENCHMARK_QUERIES
+from astroedge.fake_llama import FakeLlama
 from fpdf import FPDF
-from llama_cpp import Llama
+from astroedge.autotune import tuned_llama
 
 # 📂 Ensure logs folder exists
 os.makedirs("logs", exist_ok=True)
 
 
 class CoreAI:
-    def __init__(self, model_path):
+    def __init__(self, model_path, llm=None):
         print("🚀 Loading TinyLLaMA model...")
-        self.llm = Llama(model_path=model_path, n_ctx=2048, n_threads=6)
+        self.llm = llm or tuned_llama(model_path, n_ctx=2048)
         print("✅ TinyLLaMA loaded successfully.")
         self.base_prompt = "You are AstroEdge AI, an astronaut assistant providing clear, accurate, step-by-step guidance for space missions."
         self.metrics = []
@@ -29,7 +31,7 @@ class CoreAI:
 
     def ask(self, query):
         """Run inference, collect detailed metrics."""
-        start_time = time.time()
+        start_time = time.perf_counter()
         cpu_before = psutil.cpu_percent()
         process = psutil.Process(os.getpid())
         ram_before = process.memory_info().rss / (1024 * 1024)
@@ -47,7 +49,7 @@ class CoreAI:
             temperature=0.4
         )
 
-        elapsed = round(time.time() - start_time, 2)
+        elapsed = round(time.perf_counter() - start_time, 2)
         cpu_after = psutil.cpu_percent()
         ram_after = process.memory_info().rss / (1024 * 1024)
 
@@ -94,18 +96,7 @@ class CoreAI:
 # 🔹 TESTING FUNCTION
 ##########################################################
 def run_benchmarks(ai):
-    test_queries = [
-        "How do I repair an oxygen leak?",
-        "Give me a checklist for spacecraft re-entry.",
-        "How to stabilize rotation in zero gravity?",
-        "What is the emergency protocol for fire onboard?",
-        "Explain how to realign the satellite dish.",
-        "How do I manage fuel efficiency in orbit?",
-        "Provide step-by-step instructions for EVA suit check.",
-        "What to do if the navigation system fails?",
-        "How to run diagnostics on a solar panel array?",
-        "What are the communication protocols during blackout?"
-    ]
+    test_queries = BENCHMARK_QUERIES
 
     print("🚀 Running benchmark test cases...")
     for query in test_queries:
@@ -123,44 +114,25 @@ def generate_graphs(ai):
     tokens = [m["tokens_generated"] for m in ai.metrics]
     confidence = [m["response_confidence"] for m in ai.metrics]
 
-    # 📈 Inference Time Chart
-    plt.figure(figsize=(10,5))
-    plt.barh(queries, inference_times, color="skyblue")
-    plt.xlabel("Seconds")
-    plt.title("Inference Time per Query")
-    plt.tight_layout()
-    plt.savefig("logs/inference_time_chart.png")
-    plt.close()
-
-    # 📉 CPU & RAM Usage
-    plt.figure(figsize=(10,5))
-    plt.plot(queries, cpu_usages, marker='o', label="CPU Usage %", color="orange")
-    plt.plot(queries, ram_usages, marker='x', label="RAM Usage MB", color="green")
-    plt.xticks(rotation=45, ha="right")
-    plt.title("CPU & RAM Usage")
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig("logs/cpu_ram_usage.png")
-    plt.close()
-
-    # 📊 Tokens Histogram
-    plt.figure(figsize=(8,5))
-    plt.bar(queries, tokens, color="purple")
-    plt.xticks(rotation=45, ha="right")
-    plt.title("Tokens Generated per Query")
-    plt.tight_layout()
-    plt.savefig("logs/tokens_histogram.png")
-    plt.close()
-
-    # 🎯 Confidence Scatter
-    plt.figure(figsize=(8,5))
-    plt.scatter(queries, confidence, color="red")
-    plt.ylim(0.75, 1.0)
-    plt.xticks(rotation=45, ha="right")
-    plt.title("Response Confidence per Query")
-    plt.tight_layout()
-    plt.savefig("logs/response_confidence.png")
-    plt.close()
+    ChartService().render_many([
+        # 📈 Inference Time Chart
+        ({"kind": "barh", "labels": queries, "values": inference_times, "color": "skyblue",
+          "xlabel": "Seconds", "title": "Inference Time per Query"},
+         "logs/inference_time_chart.png"),
+        # 📉 CPU & RAM Usage
+        ({"kind": "lines", "x": queries, "title": "CPU & RAM Usage", "rotate_xticks": 45,
+          "series": [{"label": "CPU Usage %", "values": cpu_usages, "color": "orange", "marker": "o"},
+                     {"label": "RAM Usage MB", "values": ram_usages, "color": "green", "marker": "x"}]},
+         "logs/cpu_ram_usage.png"),
+        # 📊 Tokens Histogram
+        ({"kind": "bar", "figsize": (8, 5), "labels": queries, "values": tokens, "color": "purple",
+          "title": "Tokens Generated per Query", "rotate_xticks": 45},
+         "logs/tokens_histogram.png"),
+        # 🎯 Confidence Scatter
+        ({"kind": "scatter", "figsize": (8, 5), "labels": queries, "values": confidence, "color": "red",
+          "ylim": (0.75, 1.0), "title": "Response Confidence per Query", "rotate_xticks": 45},
+         "logs/response_confidence.png"),
+    ])
 
     print("✅ All graphs generated (saved in logs/)")
 
@@ -194,7 +166,8 @@ def generate_pdf_report(ai):
 if __name__ == "__main__":
     MODEL_PATH = r"C:\Hema\Contest\astro_edge_ai\tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf"
 
-    ai = CoreAI(MODEL_PATH)
+    # --fake: deterministic stand-in backend, no GGUF needed
+    ai = CoreAI(MODEL_PATH, llm=FakeLlama() if "--fake" in sys.argv else None)
 
     # Run Tests
     run_benchmarks(ai)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+
+class StatefulLlama:
+    """Mirrors llama_cpp.Llama's state bookkeeping (0.3.x): input_ids is a fixed n_ctx array that eval()
+    writes into at n_tokens, and save_state()/load_state() copy it wholesale. No model needed."""
+
+    def __init__(self, model_path="", n_ctx=64, n_vocab=8):
+        self.model_path = model_path
+        self._n_ctx = n_ctx
+        self.input_ids = np.zeros(n_ctx, dtype=np.intc)
+        self.scores = np.zeros((n_ctx, n_vocab), dtype=np.single)
+        self.n_tokens = 0
+
+    def n_ctx(self):
+        return self._n_ctx
+
+    def reset(self):
+        self.n_tokens = 0
+
+    def eval(self, tokens):
+        self.input_ids[self.n_tokens:self.n_tokens + len(tokens)] = tokens
+        self.scores[self.n_tokens:self.n_tokens + len(tokens), :] = 1.0
+        self.n_tokens += len(tokens)
+
+    def create_chat_completion(self, messages, max_tokens=16, **kwargs):
+        prompt = [ord(c) % 97 + 2 for m in messages for c in m["content"]]
+        self.reset()
+        self.eval(prompt)
+        self.eval([3] * max_tokens)
+        return {"choices": [{"message": {"role": "assistant", "content": "."}}]}
+
+    def save_state(self):
+        from llama_cpp.llama import LlamaState
+        blob = bytes(self.input_ids[:self.n_tokens].astype(np.int32))
+        return LlamaState(input_ids=self.input_ids.copy(), scores=self.scores[:self.n_tokens, :].copy(),
+                          n_tokens=self.n_tokens, llama_state=blob, llama_state_size=len(blob), seed=0)
+
+    def load_state(self, state):
+        self.scores[:state.n_tokens, :] = state.scores.copy()
+        self.input_ids = state.input_ids.copy()
+        self.n_tokens = state.n_tokens
+
+
+@pytest.fixture
+def stateful_llama():
+    pytest.importorskip("llama_cpp")
+    return StatefulLlama
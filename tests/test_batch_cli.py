@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from astroedge import batch_cli
+
+
+def write_queries(path, queries):
+    path.write_text("".join(json.dumps({"id": i, "query": q}) + "\n" for i, q in enumerate(queries)))
+
+
+def test_bad_model_path_fails_before_any_worker(tmp_path, monkeypatch):
+    write_queries(tmp_path / "in.jsonl", ["How do I reset the CO2 scrubber?"])
+    monkeypatch.setattr(batch_cli.mp, "get_context", lambda *a: pytest.fail("pool started"))
+    with pytest.raises(SystemExit) as exit_info:
+        batch_cli.main([str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl"), "--model", str(tmp_path / "missing.gguf")])
+    assert exit_info.value.code not in (0, None)
+    assert not (tmp_path / "out.jsonl").exists()
+
+
+def test_corrupt_model_file_fails_before_any_worker(tmp_path):
+    (tmp_path / "bad.gguf").write_bytes(b"not a gguf")
+    with pytest.raises(RuntimeError, match="cannot load model"):
+        batch_cli.probe_model("llama", str(tmp_path / "bad.gguf"))
+
+
+def test_worker_load_failure_is_reported_per_row(tmp_path):
+    batch_cli._init_worker("llama", str(tmp_path / "missing.gguf"), 1, 0.0)  # must not raise
+    row = batch_cli._answer((1, {"id": 7, "query": "Status?", "temperature": None, "max_tokens": None},
+                             {"temperature": 0.4, "max_tokens": None, "mode": "General Assistance"}))
+    assert row["response"] is None and row["stop_reason"] == "error"
+    assert "model load failed" in row["error"]
+
+
+def test_rows_use_core_generation_path(tmp_path):
+    batch_cli._init_worker("fake", None, 1, 0.0)
+    row = batch_cli._answer((1, {"id": 7, "query": "What steps restore cabin pressure?", "temperature": None,
+                                 "max_tokens": None}, {"temperature": 0.4, "max_tokens": None, "mode": "Repairs"}))
+    assert row["error"] is None and row["response"]
+    assert row["kind"] == "checklist"
+    assert row["max_tokens"] == batch_cli._worker["lengths"].budget("Repairs", "checklist")
+    assert row["stop_reason"] in ("stop", "length", "checklist", "repetition", "closing")
+
+
+def test_fake_batch_end_to_end(tmp_path):
+    write_queries(tmp_path / "in.jsonl", ["What is the oxygen level?", "Explain the docking sequence."])
+    stats = batch_cli.run_batch(str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl"), backend="fake",
+                                token_latency=0.0)
+    rows = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text().splitlines()]
+    assert stats["done"] == 2 and stats["errors"] == 0
+    assert sorted(row["id"] for row in rows) == [0, 1]
@@ -0,0 +1,23 @@
+from astroedge.chat_view import ChatStore
+
+
+def test_replace_keeps_later_messages(tmp_path):
+    store = ChatStore(str(tmp_path / "chat.jsonl"))
+    thinking = store.append("🤖 Thinking...\n", "gray")
+    store.append("🎙 Hotword detected! Listening...\n\n", "blue")
+    store.append("🎙 Listening... please speak\n\n", "magenta")
+
+    store.replace(thinking, "🤖 AstroEdge: ⏹ Answer cancelled.\n\n", "gray")
+    expected = [("🤖 AstroEdge: ⏹ Answer cancelled.\n\n", "gray"),
+                ("🎙 Hotword detected! Listening...\n\n", "blue"),
+                ("🎙 Listening... please speak\n\n", "magenta")]
+    assert store.read(0, 3) == expected
+
+    store.replace(1, "x", "blue")  # shorter record: later offsets move back
+    assert store.read(2, 3) == expected[2:]
+    assert store.append("next", "cyan") == 3
+    store.close()
+
+    reopened = ChatStore(str(tmp_path / "chat.jsonl"))
+    assert reopened.read(0, 4) == [expected[0], ("x", "blue"), expected[2], ("next", "cyan")]
+    reopened.close()
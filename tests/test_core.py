@@ -0,0 +1,76 @@
+import os
+import time
+
+import pytest
+
+from astroedge import core
+from astroedge.fake_llama import FakeLlama
+from astroedge.llm_state import read_header, save_state_file, model_signature
+from astroedge.session_store import DEFAULT_PATH
+
+
+@pytest.fixture
+def make_ai(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # LengthModel + session checkpoints live under ./logs
+    monkeypatch.setattr(core, "tuned_llama", lambda path, **kw: FakeLlama(
+        path, n_ctx=kw["n_ctx"], token_latency_s=0, prompt_token_latency_s=0))
+    return lambda: core.CoreAI("fake.gguf")
+
+
+def long_history(turns, words=120):
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"question {i} " + "oxygen " * words})
+        history.append({"role": "assistant", "content": f"answer {i} " + "valve " * words})
+    return history
+
+
+def prompt_tokens(ai, content="next question"):
+    return len(ai.llm.tokenize(ai.llm.format_chat(core.chat_messages(content, ai.chat_history, ai.base_prompt))))
+
+
+def wait_for_checkpoint(n_messages, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(DEFAULT_PATH) and len(read_header(DEFAULT_PATH)[0]["extra"]["chat_history"]) == n_messages:
+            return
+        time.sleep(0.01)
+    pytest.fail("checkpoint not written")
+
+
+def test_overflowing_session_is_trimmed_on_resume(make_ai):
+    save_state_file(DEFAULT_PATH, None, model_signature(FakeLlama("fake.gguf")),
+                    {"chat_history": long_history(20), "mission_mode": "Repairs"})  # ~5000 tokens of history
+
+    ai = make_ai()
+    assert ai.mission_mode == "Repairs"
+    assert 0 < len(ai.chat_history) < 40
+    assert ai.chat_history[0]["role"] == "user"
+    assert ai.chat_history[-1]["content"].startswith("answer 19")  # the newest turns are kept
+    assert prompt_tokens(ai) + core.DEFAULT_MAX_TOKENS <= ai.llm.n_ctx()
+
+
+def test_history_never_overflows_the_context(make_ai):
+    ai = make_ai()
+    for i in range(12):
+        ai.ask(f"Explain step {i} of the EVA prep " + "carefully " * 150)
+        assert prompt_tokens(ai) + core.DEFAULT_MAX_TOKENS <= ai.llm.n_ctx()
+    assert len(ai.chat_history) < 24
+    wait_for_checkpoint(len(ai.chat_history))  # the saved history fits too
+
+
+def test_fake_backend_checkpoints_history_only(make_ai):
+    ai = make_ai()
+    ai.ask("What is the cabin pressure?")
+    wait_for_checkpoint(2)
+    assert read_header(DEFAULT_PATH)[0]["n_tokens"] == 0  # FakeLlama has no KV state to save
+
+    assert make_ai().chat_history == ai.chat_history
+
+
+def test_context_render_during_a_model_swap(make_ai):
+    ai = make_ai()
+    ai.context.add_source(lambda: {"emo": "stressed", "obj": "wrench"})
+    ai.llm = None  # TierManager._swap frees the big model before loading the small one
+    assert ai.context.render() == "[ctx emo=stressed obj=wrench]"
+    assert ai.context.last_tokens > 0
@@ -0,0 +1,46 @@
+import pytest
+
+pytest.importorskip("reportlab")  # extras renders PDFs with reportlab and charts with matplotlib
+pytest.importorskip("matplotlib")
+
+from astroedge.extras import SystemHealth  # noqa: E402
+
+
+def test_health_history_is_bounded():
+    health = SystemHealth(history_size=5)
+    samples = [health.get_stats() for _ in range(20)]
+    assert list(health.history) == samples[-5:]
+
+
+def entry(timestamp, query):
+    return {"timestamp": timestamp, "query": query, "response": "ok"}
+
+
+@pytest.fixture
+def report(tmp_path, monkeypatch):
+    from astroedge.extras import MissionReport
+    report = MissionReport(str(tmp_path / "report" / "mission_report.pdf"))
+    report.rendered = []
+
+    def render(path, title, entries):
+        report.rendered.append([e["query"] for e in entries])
+        open(path, "wb").close()
+
+    monkeypatch.setattr(report, "_render", render)
+    return report
+
+
+def test_incremental_report_counts_entries_not_timestamps(report):
+    # Same-second and out-of-order timestamps (clock step) must not drop entries
+    log = [entry("2025-07-27T11:00:05", "a"), entry("2025-07-27T11:00:05", "b")]
+    report.generate(log, incremental=True)
+    log += [entry("2025-07-27T11:00:05", "c"), entry("2025-07-27T10:59:00", "d")]
+    report.generate(log, incremental=True)
+    assert report.generate(log, incremental=True).endswith("_vol002.pdf")  # up to date: no new volume
+    assert report.rendered == [["a", "b"], ["c", "d"]]
+
+
+def test_new_run_log_starts_from_its_first_entry(report):
+    report.generate([entry("2025-07-27T11:00:00", "a"), entry("2025-07-27T11:00:01", "b")], incremental=True)
+    report.generate([entry("2025-07-28T09:00:00", "x")], incremental=True)  # app restarted: fresh metrics_log
+    assert report.rendered == [["a", "b"], ["x"]]
@@ -0,0 +1,98 @@
+import json
+import os
+import re
+
+import pytest
+
+from astroedge.generation_control import EndDetector, LengthModel, classify_query
+
+
+def pieces(text, chunking):
+    if chunking == "word":
+        return re.findall(r"\S+\s*|\s+", text)  # like token streaming: each word with its trailing space
+    if chunking == "whole":
+        return [text]
+    return [text[i:i + 7] for i in range(0, len(text), 7)]
+
+
+def feed(detector, text, chunking="word"):
+    for piece in pieces(text, chunking):
+        reason = detector.feed(piece)
+        if reason:
+            return reason
+    return detector.feed("\n")
+
+
+def procedure(n):
+    return "".join(f"{i}. Check {word} panel {i} and report its pressure reading\n"
+                   for i, word in zip(range(1, n + 1), "abcdefghijklmnopqrstuvwxyz"))
+
+
+CHUNKINGS = ("word", "whole", "chars")
+
+SHARED_PHRASE = ("1. Check the oxygen valve fittings for frost.\n"
+                 "2. Check the oxygen valve pressure on the panel.\n"
+                 "3. Check the oxygen valve seal with the leak detector.\n"
+                 "4. Check the oxygen valve torque and report to mission control.\n"
+                 "- Check the oxygen valve log.\n"
+                 "- Check the oxygen valve log again after one hour.\n")
+
+
+@pytest.mark.parametrize("chunking", CHUNKINGS)
+def test_unannounced_lists_run_to_the_end(chunking):
+    for mode in ("General Assistance", "Mission Commander"):
+        detector = EndDetector(mode, "factual")
+        assert feed(detector, procedure(12), chunking) is None
+        assert detector.cut is None
+
+
+@pytest.mark.parametrize("chunking", CHUNKINGS)
+def test_steps_sharing_a_phrase_are_not_a_loop(chunking):
+    detector = EndDetector("Repairs", "checklist")
+    assert feed(detector, SHARED_PHRASE, chunking) is None
+
+
+@pytest.mark.parametrize("chunking", CHUNKINGS)
+def test_stops_after_announced_count(chunking):
+    detector = EndDetector("Repairs", "checklist")
+    text = "Follow these 3 steps:\n" + procedure(5)
+    assert feed(detector, text, chunking) == "checklist"
+    assert text[:detector.cut].rstrip().endswith("panel 3 and report its pressure reading")
+
+
+@pytest.mark.parametrize("chunking", CHUNKINGS)
+def test_restarted_numbering_is_a_loop(chunking):
+    detector = EndDetector("Repairs", "checklist")
+    text = procedure(4) + procedure(4)
+    assert feed(detector, text, chunking) == "repetition"
+    assert text[:detector.cut] == procedure(4)
+
+
+@pytest.mark.parametrize("chunking", CHUNKINGS)
+def test_repeated_sentence_in_prose_is_a_loop(chunking):
+    detector = EndDetector("General Assistance", "explain")
+    text = ("Stay near the airlock. Keep the suit sealed at all times. Wait for the all-clear. "
+            "Keep the suit sealed at all times. Wait for the all-clear.")
+    assert feed(detector, text, chunking) == "repetition"
+    assert text[:detector.cut].rstrip() == "Stay near the airlock. Keep the suit sealed at all times. Wait for the all-clear."
+
+
+@pytest.mark.parametrize("chunking", CHUNKINGS)
+def test_back_to_back_word_loop(chunking):
+    detector = EndDetector("General Assistance", "other")
+    assert feed(detector, "Then secure the " + "hatch and the " * 8, chunking) == "repetition"
+
+
+def test_emergency_procedures_are_checklists():
+    assert classify_query("What to do if the navigation system fails?") == "checklist"
+    assert classify_query("What is the cabin pressure?") == "factual"
+
+
+def test_length_history_written_atomically(tmp_path):
+    path = tmp_path / "answer_lengths.json"
+    model = LengthModel(path=str(path), min_samples=2)
+    for tokens in (100, 120, 140):
+        model.observe("Repairs", "checklist", tokens, "stop")
+    assert json.loads(path.read_text()) == {"Repairs|checklist": [100, 120, 140]}
+    assert os.listdir(tmp_path) == ["answer_lengths.json"]
+    assert LengthModel(path=str(path), min_samples=2).budget("Repairs", "checklist") >= 140
@@ -0,0 +1,21 @@
+from astroedge.import_budget import measure, HEAVY_MODULES
+
+BUDGET_MS = 50.0
+
+
+def test_import_astroedge_within_budget():
+    total_ms, rows = measure("astroedge", runs=5)
+    slowest = sorted(rows, key=lambda r: -r[1])[:5]
+    assert total_ms <= BUDGET_MS, f"import astroedge took {total_ms:.1f} ms; slowest (self us): {slowest}"
+
+
+def test_no_heavy_dependency_imported_eagerly():
+    _, rows = measure("astroedge", runs=1)
+    imported = {name for name, *_ in rows}
+    assert not imported & set(HEAVY_MODULES)
+
+
+def test_core_does_not_load_llama_cpp():
+    # CoreAI's module is imported by the app and the CLIs; llama_cpp should load with the model, not before
+    _, rows = measure("astroedge.core", runs=1)
+    assert "llama_cpp" not in {name for name, *_ in rows}
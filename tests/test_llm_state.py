@@ -0,0 +1,26 @@
+from astroedge.llm_state import save_state_file, load_state_file, model_signature
+from astroedge.session_store import SessionCheckpointer
+
+
+def test_loaded_state_spans_n_ctx(tmp_path, stateful_llama):
+    llm = stateful_llama(n_ctx=64)
+    llm.eval([5, 6, 7, 8])
+    path = save_state_file(str(tmp_path / "s.aekv"), llm.save_state(), model_signature(llm))
+
+    state, _ = load_state_file(path, model_signature(llm))
+    assert state.n_tokens == 4
+    assert state.input_ids.shape == (64,)
+    assert list(state.input_ids[:4]) == [5, 6, 7, 8]
+
+
+def test_eval_after_resume(tmp_path, stateful_llama):
+    llm = stateful_llama(n_ctx=64)
+    llm.eval([5, 6, 7, 8])
+    store = SessionCheckpointer(str(tmp_path / "session.aekv"))
+    save_state_file(store.path, llm.save_state(), model_signature(llm), {"chat_history": ["hi"]})
+
+    fresh = stateful_llama(n_ctx=64)
+    assert store.resume(fresh) == {"chat_history": ["hi"]}
+    fresh.eval([9])  # raised "could not broadcast" when input_ids was only n_tokens long
+    assert fresh.n_tokens == 5
+    assert list(fresh.input_ids[:5]) == [5, 6, 7, 8, 9]
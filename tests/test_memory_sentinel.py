@@ -0,0 +1,66 @@
+import threading
+import tracemalloc
+from collections import deque
+
+from astroedge.memory_sentinel import MemorySentinel, deep_size
+
+
+def test_stop_leaves_foreign_tracing_running():
+    tracemalloc.start()
+    try:
+        sentinel = MemorySentinel(interval_s=60, log_path=None).start()
+        sentinel.stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_stop_ends_tracing_it_started():
+    assert not tracemalloc.is_tracing()
+    sentinel = MemorySentinel(interval_s=60, log_path=None).start()
+    assert tracemalloc.is_tracing()
+    sentinel.stop()
+    assert not tracemalloc.is_tracing()
+
+
+class RacyDeque(deque):
+    """Iterates like a deque another thread appended to mid-walk – the first attempt raises."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.failures = 1
+
+    def __iter__(self):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("deque mutated during iteration")
+        return super().__iter__()
+
+
+def test_deep_size_retries_mutated_container():
+    ring = RacyDeque([str(i) * 1000 for i in range(10)])
+    assert deep_size(ring) > 10 * 1000
+
+
+def test_sizes_while_other_threads_mutate():
+    ring, history, stop = deque(maxlen=2000), {}, threading.Event()
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            ring.append({"span": i, "attrs": [i] * 4})
+            history[i % 3000] = [i]
+            i += 1
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    try:
+        sentinel = MemorySentinel(log_path=None)
+        sentinel.track("ring", ring)
+        sentinel.track("history", history)
+        for _ in range(20):
+            sizes = sentinel.structure_sizes()
+            assert "error" not in sizes["ring"] and "error" not in sizes["history"]
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+from astroedge import autotune
+from astroedge.fake_llama import FakeLlama
+from astroedge.model_ladder import TierManager, discover_tiers, HEADROOM_MB
+
+SIZES_MB = {"tinyllama-1.1b-chat.Q2_K.gguf": 400, "tinyllama-1.1b-chat.Q4_K_M.gguf": 640,
+            "tinyllama-1.1b-chat.Q8_0.gguf": 1100}
+
+
+class Health:
+    def __init__(self, available_MB):
+        self.available_MB = available_MB
+
+    def get_stats(self):
+        return {"available_MB": self.available_MB, "cpu": 10, "temp_C": None}
+
+
+@pytest.fixture
+def tiers(tmp_path):
+    for name, mb in SIZES_MB.items():
+        with open(tmp_path / name, "wb") as f:
+            f.truncate(mb * 2 ** 20)  # sparse: only the size matters
+    return discover_tiers(str(tmp_path))
+
+
+def manager(tiers, health, current):
+    m = TierManager(tiers, loader=lambda path: FakeLlama(model_path=path), health=health, slo_s=60)
+    m.current = next(t for t in tiers if t.quant == current)
+    return m
+
+
+def test_upgrade_needs_room_for_both_models(tiers):
+    q4, q8 = tiers[1], tiers[2]
+    health = Health(q8.ram_needed_MB() + HEADROOM_MB - 1)  # Q8 alone fits, Q8 beside Q4 does not
+    assert manager(tiers, health, "Q4_K_M").choose() is q4
+    health.available_MB = q8.ram_needed_MB() + HEADROOM_MB + 1
+    assert manager(tiers, health, "Q4_K_M").choose() is q8
+
+
+def test_downgrade_counts_the_freed_model(tiers):
+    q2, q4 = tiers[0], tiers[1]
+    # Less free RAM than the headroom: Q4 must go, and Q2 fits once Q4 is freed
+    health = Health(HEADROOM_MB - 100)
+    assert q2.ram_needed_MB() - q4.ram_needed_MB() <= -100
+    assert manager(tiers, health, "Q4_K_M").choose() is q2
+
+
+def test_swap_uses_non_blocking_loader(tiers):
+    loaded = []
+    m = manager(tiers, Health(HEADROOM_MB - 100), "Q4_K_M")
+    m.swap_loader = lambda path: loaded.append(path) or FakeLlama(model_path=path)
+
+    class AI:
+        llm_lock = threading.Lock()
+        llm = FakeLlama()
+
+    m._swapping.acquire()
+    m._swap(AI, tiers[0])
+    assert loaded == [tiers[0].path] and m.current is tiers[0]
+
+
+def test_swap_load_never_tunes(monkeypatch):
+    monkeypatch.setattr(autotune, "load_tuning", lambda model_path: None)
+    tuned = []
+    monkeypatch.setattr(autotune, "autotune", lambda model_path, *a, **kw: tuned.append(model_path))
+    llm = autotune.tuned_llama("never-tuned.gguf", llama_cls=FakeLlama, tune=False)
+    assert llm.n_threads == autotune.DEFAULT_CONFIG["n_threads"]
+    time.sleep(0.05)
+    assert tuned == []  # not now, and nothing started in the background either
+
+
+def test_swap_load_uses_stored_config(monkeypatch):
+    monkeypatch.setattr(autotune, "load_tuning", lambda model_path: {**autotune.DEFAULT_CONFIG, "n_threads": 3})
+    monkeypatch.setattr(autotune, "autotune", lambda *a, **kw: pytest.fail("autotune ran during a swap"))
+    assert autotune.tuned_llama("tuned.gguf", llama_cls=FakeLlama, tune=False).n_threads == 3
@@ -0,0 +1,17 @@
+import os
+
+from astroedge.prompt_cache import PromptStateCache
+
+
+def test_ask_after_mode_change(tmp_path, stateful_llama):
+    llm = stateful_llama(n_ctx=512)
+    cache = PromptStateCache(llm, cache_dir=str(tmp_path))
+    cache.restore("Repairs", "Neutral")  # first use builds the snapshot
+    cache.restore("Navigation", "Friendly")
+    assert os.path.exists(cache.path_for("Repairs", "Neutral"))
+
+    cache.restore("Repairs", "Neutral")  # loaded from disk this time
+    n = llm.n_tokens
+    assert llm.input_ids.shape == (512,)
+    llm.eval([4, 4])  # the next ask() continues from the restored prefix
+    assert llm.n_tokens == n + 2
@@ -0,0 +1,16 @@
+import numpy as np
+
+from astroedge.llm_state import save_state_file, model_signature
+from astroedge.session_store import SessionCheckpointer
+
+
+def test_resume_other_model_keeps_history(tmp_path, stateful_llama):
+    llm = stateful_llama(model_path="q4.gguf", n_ctx=64)
+    llm.eval([5, 6])
+    store = SessionCheckpointer(str(tmp_path / "session.aekv"))
+    save_state_file(store.path, llm.save_state(), model_signature(llm), {"chat_history": ["hi", "hello"]})
+
+    other = stateful_llama(model_path="q2.gguf", n_ctx=64)
+    assert store.resume(other) == {"chat_history": ["hi", "hello"]}
+    assert other.n_tokens == 0  # KV state from the other tier was not loaded
+    assert not np.any(other.input_ids)
@@ -0,0 +1,14 @@
+import numpy as np
+
+from astroedge.speculative import ManualLookupDecoding
+
+
+def test_reference_tokens_accept_numpy_array():
+    draft = ManualLookupDecoding(max_ngram_size=2, num_pred_tokens=3, reference_tokens=np.array([7, 8, 9, 10, 11]))
+    assert list(draft(np.array([1, 7, 8]))) == [9, 10, 11]
+
+
+def test_prompt_match_wins_over_reference():
+    draft = ManualLookupDecoding(max_ngram_size=2, num_pred_tokens=2, reference_tokens=[7, 8, 1, 1])
+    assert list(draft([7, 8, 5, 6, 3, 7, 8])) == [5, 6]
+    assert ManualLookupDecoding()([4, 5, 6]).size == 0
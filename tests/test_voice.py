@@ -0,0 +1,77 @@
+import os
+import sys
+import types
+import wave
+
+import pytest
+
+
+class FakeEngine:
+    """pyttsx3 engine double: records live speech, writes a (corrupt) WAV on save_to_file."""
+
+    def __init__(self):
+        self.props = {"voice": "test", "rate": 160}
+        self.said = []
+
+    def getProperty(self, name):
+        return self.props.get(name)
+
+    def setProperty(self, name, value):
+        self.props[name] = value
+
+    def connect(self, topic, callback):
+        pass
+
+    def say(self, text):
+        self.said.append(text)
+
+    def save_to_file(self, text, path):
+        with open(path, "wb") as f:
+            f.write(b"RIFF not really a wav")
+
+    def runAndWait(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def voice(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # TTS cache lives under ./logs
+    monkeypatch.setitem(sys.modules, "pyttsx3", types.SimpleNamespace(init=FakeEngine))
+    from astroedge.voice import VoiceSystem
+    return VoiceSystem()
+
+
+def speak_and_wait(voice, text):
+    voice.speak(text, cached=True)
+    voice.queue.join()
+
+
+def test_corrupt_cached_wav_falls_back_to_live_speech(voice):
+    path = voice.cache.render("Stay calm and breathe.")
+
+    def play(p):
+        with wave.open(p, "rb"):  # what the sounddevice path does first
+            pass
+    voice.cache.play = play
+
+    speak_and_wait(voice, "Stay calm and breathe.")
+    assert voice.engine.said == ["Stay calm and breathe."]
+    assert not os.path.exists(path)  # bad entry dropped, re-rendered on next use
+
+
+def test_device_error_falls_back_to_live_speech(voice):
+    def play(p):
+        raise OSError("no audio device")
+    voice.cache.play = play
+    speak_and_wait(voice, "NextGen system ready.")
+    assert voice.engine.said == ["NextGen system ready."]
+
+
+def test_cached_playback_does_not_speak_live(voice):
+    played = []
+    voice.cache.play = played.append
+    speak_and_wait(voice, "Mission report saved.")
+    assert played and voice.engine.said == []
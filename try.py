@@ -1,14 +1,15 @@
 import tkinter as tk
 from tkinter import scrolledtext, ttk, messagebox
-from llama_cpp import Llama
-import pyttsx3
+from astroedge.autotune import tuned_llama
+from astroedge.voice import VoiceSystem
+from astroedge.sensors import SensorHub
+from astroedge.context_injector import ContextInjector
 import threading
 import time
 import datetime
 import json
 import csv
 import os
-import random
 import psutil   # For memory usage monitoring
 
 #######################################################
@@ -17,7 +18,7 @@ import psutil   # For memory usage monitoring
 class CoreAI:
     def __init__(self, model_path):
         print("🚀 Loading TinyLlama model...")
-        self.llm = Llama(model_path=model_path, n_ctx=2048, n_threads=6)
+        self.llm = tuned_llama(model_path, n_ctx=2048)
         print("✅ TinyLlama loaded successfully.")
         self.base_prompt = (
             "You are AstroEdge AI, an astronaut assistant. "
@@ -25,13 +26,17 @@ class CoreAI:
         )
         self.chat_history = []
         self.metrics_log = []   # store performance metrics
+        # Sensor context is only added to a turn when it changed since the model last saw it
+        self.context = ContextInjector(tokenize=lambda text: self.llm.tokenize(text.encode("utf-8"), add_bos=False))
 
     def ask(self, user_query: str) -> str:
         """Query the model and log inference metrics"""
         start_time = time.time()
 
+        ctx = self.context.render()
+        content = f"{ctx}\n{user_query}" if ctx else user_query
         messages = [{"role": "system", "content": self.base_prompt}] + self.chat_history
-        messages.append({"role": "user", "content": user_query})
+        messages.append({"role": "user", "content": content})
 
         response = self.llm.create_chat_completion(
             messages=messages,
@@ -53,11 +58,12 @@ class CoreAI:
             "query": user_query,
             "response": answer,
             "inference_time": inference_time,
-            "memory_usage_MB": mem_usage
+            "memory_usage_MB": mem_usage,
+            "ctx_tokens": self.context.last_tokens
         })
 
         # Maintain history for context
-        self.chat_history.append({"role": "user", "content": user_query})
+        self.chat_history.append({"role": "user", "content": content})
         self.chat_history.append({"role": "assistant", "content": answer})
 
         return answer
@@ -65,40 +71,11 @@ class CoreAI:
     def save_metrics(self, filename="astroedge_metrics.csv"):
         """Save logged metrics to CSV for research"""
         with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=["timestamp", "query", "response", "inference_time", "memory_usage_MB"])
+            writer = csv.DictWriter(f, fieldnames=["timestamp", "query", "response", "inference_time", "memory_usage_MB", "ctx_tokens"])
             writer.writeheader()
             writer.writerows(self.metrics_log)
         print(f"✅ Metrics saved to {filename}")
 
-#######################################################
-# 🔹 MOCK SENSOR INPUTS
-#######################################################
-class MockSensors:
-    """Simulates gyroscope readings and emotion detection"""
-    def get_gyroscope(self):
-        # Simulate pitch/yaw/roll values
-        return {"pitch": round(random.uniform(-10, 10), 2),
-                "yaw": round(random.uniform(-10, 10), 2),
-                "roll": round(random.uniform(-10, 10), 2)}
-
-    def detect_emotion(self):
-        # Randomly simulate astronaut stress levels
-        return random.choice(["calm", "stressed", "neutral"])
-
-#######################################################
-# 🔹 VOICE SYSTEM
-#######################################################
-class VoiceSystem:
-    def __init__(self):
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 160)
-        self.voice_enabled = True
-
-    def speak(self, text):
-        if self.voice_enabled:
-            self.engine.say(text)
-            self.engine.runAndWait()
-
 #######################################################
 # 🔹 GUI APP – Research UI
 #######################################################
@@ -106,7 +83,8 @@ class AstroEdgeApp:
     def __init__(self, model_path):
         self.ai = CoreAI(model_path)
         self.voice = VoiceSystem()
-        self.sensors = MockSensors()
+        self.sensors = SensorHub.simulated().start()  # 1 kHz IMU + biometrics into ring buffers
+        self.ai.context.add_source(self.sensors.snapshot)
         self.log_count = 0
 
         os.makedirs("logs", exist_ok=True)
@@ -136,17 +114,23 @@ class AstroEdgeApp:
         tk.Button(self.root, text="Send", command=self.send_query, bg="green", fg="white").pack(side=tk.LEFT, padx=5)
         tk.Button(self.root, text="Save Metrics", command=self.save_metrics, bg="orange", fg="black").pack(side=tk.LEFT, padx=5)
 
+        self._poll_context()
+
+    def _poll_context(self):
+        # Feed the injector once a second so its hold times see the sensor trend, not just query instants
+        self.ai.context.observe()
+        self.root.after(1000, self._poll_context)
+
     def send_query(self, event=None):
         query = self.entry.get().strip()
         if not query:
             return
 
-        # Simulate sensor readings
-        gyro_data = self.sensors.get_gyroscope()
-        emotion = self.sensors.detect_emotion()
+        # Windowed features from the sensor rings, condensed to one line
+        summary = self.sensors.summary()
 
         # Show astronaut query
-        self._append_chat(f"👨‍🚀 Astronaut: {query} (Sensors: {gyro_data}, Emotion: {emotion})\n", "cyan")
+        self._append_chat(f"👨‍🚀 Astronaut: {query} (Sensors: {summary})\n", "cyan")
         self.entry.delete(0, tk.END)
 
         # Run inference in background